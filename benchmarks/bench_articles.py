@@ -0,0 +1,72 @@
+"""Time rendering sentences, and filling formatters directly, with tens of
+thousands of indefinite articles, each waiting for the word after it, to
+show that the time taken per article stays the same however many there are.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_articles
+"""
+
+import timeit
+from pathlib import Path
+
+from twaddle.interpreter.formatter import Formatter
+from twaddle.interpreter.interpreter import Interpreter
+from twaddle.lookup.lookup_manager import LookupManager
+from twaddle.parser.parsing import parse_sentence
+
+DICTIONARIES = Path(__file__).parent.parent / "twaddle" / "tests" / "resources"
+TEMPLATES = {
+    "repeated": lambda count: f"[rep:{count}]{{\\a <adj> }}",
+    "written out": lambda count: "\\a <adj> " * count,
+    "case": lambda count: f"[case:title][rep:{count}]{{\\a [rep:2]{{ }}egg }}",
+}
+COUNTS = [2500, 10000, 40000]
+REPEATS = 3
+
+
+def formatter_with_articles(count: int) -> Formatter:
+    # articles appended straight to a formatter, in pairs waiting for the same
+    # word
+    formatter = Formatter()
+    for _ in range(count // 2):
+        formatter.add_indefinite_article()
+        formatter.append(" ")
+        formatter.add_indefinite_article(default_upper=True)
+        formatter.append(" egg ")
+    return formatter
+
+
+def main():
+    lookup_manager = LookupManager()
+    lookup_manager.add_dictionaries_from_folder(DICTIONARIES / "valid_dicts")
+    interpreter = Interpreter(lookup_manager)
+
+    print("microseconds per article")
+    print(f"{'template':>12}" + "".join(f"{count:>10}" for count in COUNTS))
+    for name, template in TEMPLATES.items():
+        row = f"{name:>12}"
+        for count in COUNTS:
+            tree = parse_sentence(template(count))
+            elapsed = min(
+                timeit.repeat(
+                    lambda: interpreter.run(tree).resolve(), number=1, repeat=REPEATS
+                )
+            )
+            row += f"{elapsed / count * 1e6:>10.1f}"
+        print(row)
+    row = f"{'formatter':>12}"
+    for count in COUNTS:
+        elapsed = min(
+            timeit.repeat(
+                lambda: formatter_with_articles(count).resolve(),
+                number=1,
+                repeat=REPEATS,
+            )
+        )
+        row += f"{elapsed / count * 1e6:>10.1f}"
+    print(row)
+
+
+if __name__ == "__main__":
+    main()
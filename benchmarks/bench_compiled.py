@@ -0,0 +1,60 @@
+"""Compare running a template through the interpreter, which dispatches on
+every node, against running it as compiled Python code.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_compiled
+"""
+
+import timeit
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from twaddle.interpreter.interpreter import Interpreter
+from twaddle.runner import TwaddleRunner
+
+DICTIONARIES = Path(__file__).parent.parent / "twaddle" / "tests" / "resources"
+FRAGMENT = (
+    "The <noun> {went|ran|walked} to the [rep:3][sep:, ]"
+    "{shop|market|\\a <adj> place} and [if:[eq:1;1];met;missed] <noun::!=a>. "
+)
+
+
+def main():
+    runner = TwaddleRunner(DICTIONARIES / "valid_dicts")
+    interpreter = runner.interpreter
+    print(
+        f"{'length':>7} {'interpreted (us)':>17} {'compiled (us)':>14} "
+        f"{'compile (ms)':>13} {'from cache (ms)':>16}"
+    )
+    for repeats in (1, 10, 50):
+        sentence = FRAGMENT * repeats
+        tree = interpreter.parse(sentence)
+        program = interpreter.compile(tree)
+        with interpreter.seeded(0):
+            expected = interpreter.interpret_tree(tree)
+        with interpreter.seeded(0):
+            assert interpreter.interpret_program(program) == expected
+        number = max(1, 200 // repeats)
+        interpreted = timeit.timeit(
+            lambda: interpreter.interpret_tree(tree), number=number
+        )
+        compiled = timeit.timeit(
+            lambda: interpreter.interpret_program(program), number=number
+        )
+        compile_time = timeit.timeit(lambda: interpreter.compile(tree), number=5) / 5
+        with TemporaryDirectory() as cache_dir:
+            cached = Interpreter(
+                interpreter.context.lookup_manager, code_cache_dir=cache_dir
+            )
+            cached.compile(tree)
+            cached_time = timeit.timeit(lambda: cached.compile(tree), number=5) / 5
+        print(
+            f"{len(sentence):>7} {interpreted / number * 1e6:>17.1f} "
+            f"{compiled / number * 1e6:>14.1f} {compile_time * 1e3:>13.2f} "
+            f"{cached_time * 1e3:>16.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Time resolving a formatter's output into text under each formatting
+strategy, for outputs from a quarter of a megabyte up to four megabytes, to
+show that the time taken grows linearly with the length of the output.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_formatting
+"""
+
+import timeit
+
+from twaddle.interpreter.formatter import Formatter
+from twaddle.interpreter.formatting_object import FormattingStrategy
+
+PIECES = ["The cat sat on the mat. ", "i think ", "so! ", "Well, ", "WHY? ", "\n"]
+PIECES_LENGTH = sum(len(piece) for piece in PIECES)
+MEGABYTE = 1 << 20
+SIZES = [0.25, 0.5, 1, 2, 4]
+REPEATS = 3
+
+
+def filled(strategy: FormattingStrategy, size: float) -> Formatter:
+    formatter = Formatter()
+    formatter.set_strategy(strategy)
+    for _ in range(int(size * MEGABYTE / PIECES_LENGTH)):
+        for piece in PIECES:
+            formatter.append(piece)
+    return formatter
+
+
+def resolve_time(strategy: FormattingStrategy, size: float) -> float:
+    # each resolve empties the formatter, so each repeat fills a new one
+    return min(
+        timeit.repeat(
+            "formatter.resolve()",
+            setup="formatter = filled(strategy, size)",
+            number=1,
+            repeat=REPEATS,
+            globals={"filled": filled, "strategy": strategy, "size": size},
+        )
+    )
+
+
+def main():
+    print("milliseconds to resolve, and per megabyte")
+    print(f"{'strategy':>10}" + "".join(f"{f'{size} MB':>16}" for size in SIZES))
+    for strategy in FormattingStrategy:
+        row = f"{strategy.name:>10}"
+        for size in SIZES:
+            elapsed = resolve_time(strategy, size) * 1e3
+            row += f"{elapsed:>8.0f}{f'({elapsed / size:.0f})':>8}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare parsing a sentence in one pass, with nodes built as the parser
+reduces each rule, against building a Lark parse tree and transforming it.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_fused_parsing
+"""
+
+import timeit
+import tracemalloc
+
+from twaddle.parser.parsing import (
+    get_parser,
+    get_transformer,
+    get_tree_parser,
+    parse_sentence,
+)
+
+FRAGMENT = (
+    "The <noun-person::=a> {went|ran|walked} to the [rep:3][sep:, ]"
+    "{shop|market|\\a <adj> place} and [if:[eq:1;1];met;missed] <noun::!=a>. "
+)
+
+
+def two_pass(sentence: str):
+    return get_transformer().transform(get_tree_parser().parse(sentence))
+
+
+def one_pass(sentence: str):
+    return get_parser().parse(sentence)
+
+
+def peak_memory(parse, sentence: str) -> int:
+    tracemalloc.start()
+    parse(sentence)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def intermediate_nodes(sentence: str) -> int:
+    """Number of Lark trees and their children built by the two-pass parse
+    and then thrown away, none of which exist in the fused parse."""
+    tree = get_tree_parser().parse(sentence)
+    subtrees = list(tree.iter_subtrees())
+    return len(subtrees) + sum(len(subtree.children) for subtree in subtrees)
+
+
+def main():
+    # build both parsers up front so that only parsing is measured
+    assert parse_sentence(FRAGMENT, fused=True) == parse_sentence(FRAGMENT, fused=False)
+    print(
+        f"{'length':>8} {'mode':>9} {'time (ms)':>10} {'peak (KiB)':>11} "
+        f"{'Lark objects':>13}"
+    )
+    for repeats in (1, 10, 100):
+        sentence = FRAGMENT * repeats
+        number = max(1, 200 // repeats)
+        lark_objects = {"two-pass": intermediate_nodes(sentence), "fused": 0}
+        for label, parse in (("two-pass", two_pass), ("fused", one_pass)):
+            elapsed = timeit.timeit(lambda: parse(sentence), number=number) / number
+            peak = peak_memory(parse, sentence)
+            print(
+                f"{len(sentence):>8} {label:>9} {elapsed * 1000:>10.3f} "
+                f"{peak / 1024:>11.1f} {lark_objects[label]:>13}"
+            )
+
+
+if __name__ == "__main__":
+    main()
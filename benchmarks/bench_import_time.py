@@ -0,0 +1,64 @@
+"""Measure how long `import twaddle.runner` takes in a fresh interpreter, and
+how long the first sentence takes once the parser has to be built.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_import_time
+"""
+
+import statistics
+import subprocess
+import sys
+
+RUNS = 20
+
+IMPORT_ONLY = """
+import sys, time
+start = time.perf_counter()
+import twaddle.runner
+elapsed = time.perf_counter() - start
+assert "twaddle.parser.twaddle_parser" not in sys.modules, "parser imported eagerly"
+print(elapsed)
+"""
+
+FIRST_SENTENCE = """
+import time
+from twaddle.interpreter.interpreter import Interpreter
+from twaddle.lookup.lookup_manager import LookupManager
+interpreter = Interpreter(LookupManager())
+start = time.perf_counter()
+interpreter.interpret_external("{a|b}")
+print(time.perf_counter() - start)
+"""
+
+
+def measure(code: str) -> list[float]:
+    # run once first so that bytecode is cached and doesn't skew the numbers
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+    return [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", code],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(RUNS)
+    ]
+
+
+def report(label: str, timings: list[float]):
+    print(
+        f"{label:<28} median {statistics.median(timings) * 1000:7.2f} ms, "
+        f"min {min(timings) * 1000:7.2f} ms over {len(timings)} runs"
+    )
+
+
+def main():
+    report("import twaddle.runner", measure(IMPORT_ONLY))
+    report("first sentence (lazy parser)", measure(FIRST_SENTENCE))
+
+
+if __name__ == "__main__":
+    main()
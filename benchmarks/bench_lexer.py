@@ -0,0 +1,41 @@
+"""Compare parsing with the TwaddleLexer against the Lark lexer generated
+along with the parser.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_lexer
+"""
+
+import timeit
+
+from twaddle.parser.parsing import parse_with_lark
+
+CASES = {
+    "markup": (
+        "The <noun-person::=a> {went|ran|walked} to the [rep:3][sep:, ]"
+        "{shop|market|\\a <adj> place} and [if:[eq:1;1];met;missed] <noun::!=a>. "
+    )
+    * 10,
+    "regex": "[//[aeiou]//i:<noun> and <noun>;[match][match]] " * 10,
+    "separators": "lorem; ipsum | dolor / sit; amet " * 20,
+}
+
+
+def main():
+    print(f"{'case':>11} {'length':>7} {'Lark (us)':>10} {'Twaddle (us)':>13}")
+    for label, sentence in CASES.items():
+        assert parse_with_lark(sentence) == parse_with_lark(sentence, lark_lexer=True)
+        number = 100
+        timings = [
+            timeit.timeit(
+                lambda: parse_with_lark(sentence, lark_lexer=lark_lexer), number=number
+            )
+            / number
+            * 1e6
+            for lark_lexer in (True, False)
+        ]
+        print(f"{label:>11} {len(sentence):>7} {timings[0]:>10.1f} {timings[1]:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
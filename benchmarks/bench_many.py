@@ -0,0 +1,52 @@
+"""Compare generating many variants of one template with a loop over
+`run_sentence` against `run_sentence_many`, which parses and compiles the
+template once.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_many
+"""
+
+import timeit
+from pathlib import Path
+
+from twaddle.runner import TwaddleRunner
+
+DICTIONARIES = Path(__file__).parent.parent / "twaddle" / "tests" / "resources"
+TEMPLATE = (
+    "The <noun> {went|ran|walked} to the [rep:3][sep:, ]"
+    "{shop|market|\\a <adj> place} and [if:[eq:1;1];met;missed] <noun::!=a>. "
+)
+COUNT = 2000
+
+
+def main():
+    uncached = TwaddleRunner(DICTIONARIES / "valid_dicts", parse_cache_size=0)
+    runner = TwaddleRunner(DICTIONARIES / "valid_dicts")
+    seeded = TwaddleRunner(DICTIONARIES / "valid_dicts", seed=0)
+    expected = [seeded.run_sentence(TEMPLATE) for _ in range(10)]
+    seeded = TwaddleRunner(DICTIONARIES / "valid_dicts", seed=0)
+    assert seeded.run_sentence_many(TEMPLATE, 10) == expected
+
+    timings = {
+        "loop, no parse cache": lambda: [
+            uncached.run_sentence(TEMPLATE) for _ in range(COUNT)
+        ],
+        "loop, parse cache": lambda: [
+            runner.run_sentence(TEMPLATE) for _ in range(COUNT)
+        ],
+        "run_sentence_many": lambda: runner.run_sentence_many(TEMPLATE, COUNT),
+        "iter_sentence_many": lambda: list(runner.iter_sentence_many(TEMPLATE, COUNT)),
+        "many, no reset": lambda: runner.run_sentence_many(
+            TEMPLATE, COUNT, reset_between=False
+        ),
+    }
+    print(f"{COUNT} sentences")
+    print(f"{'method':>22} {'total (ms)':>11} {'per sentence (us)':>18}")
+    for name, run in timings.items():
+        elapsed = min(timeit.repeat(run, number=1, repeat=3))
+        print(f"{name:>22} {elapsed * 1e3:>11.1f} {elapsed / COUNT * 1e6:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Measure the memory taken by a formatter's output, per segment of text,
+and the number of memory blocks allocated for the output of a sentence,
+which stay allocated until it's resolved.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_memory
+"""
+
+import gc
+import tracemalloc
+from pathlib import Path
+
+from twaddle.interpreter.formatter import Formatter
+from twaddle.interpreter.formatting_object import FormattingStrategy
+from twaddle.interpreter.interpreter import Interpreter
+from twaddle.lookup.lookup_manager import LookupManager
+from twaddle.parser.parsing import parse_sentence
+
+DICTIONARIES = Path(__file__).parent.parent / "twaddle" / "tests" / "resources"
+SEGMENTS = 100000
+TEMPLATES = {
+    "text and lookups": "[rep:2000]{The <noun> is <adj>. }",
+    "articles": "[rep:2000]{\\a <adj> <noun>, }",
+    "case changes": "[rep:2000]{[case:upper]<adj>[case:none] <noun> }",
+}
+
+
+def measure(build) -> tuple[object, int, int, int]:
+    """Run `build`, returning what it built, the bytes and number of memory
+    blocks still allocated for it, and the peak bytes allocated meanwhile."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    built = build()
+    current, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    return built, size, blocks, peak
+
+
+def main():
+    # the same string every time, so that only the output's own objects
+    # are counted
+    text = "word "
+    for label, append in {
+        "text": lambda formatter: formatter.append(text),
+        "strategy change": lambda formatter: formatter.set_strategy(
+            FormattingStrategy.UPPER
+        ),
+        "article": lambda formatter: formatter.add_indefinite_article(),
+    }.items():
+
+        def build():
+            formatter = Formatter()
+            for _ in range(SEGMENTS):
+                append(formatter)
+            return formatter
+
+        _, size, blocks, _ = measure(build)
+        print(
+            f"{label:>16}: {size / SEGMENTS:6.1f} bytes, "
+            f"{blocks / SEGMENTS:4.2f} blocks per segment"
+        )
+
+    lookup_manager = LookupManager()
+    lookup_manager.add_dictionaries_from_folder(DICTIONARIES / "valid_dicts")
+    interpreter = Interpreter(lookup_manager)
+    print()
+    print(f"{'template':>18}{'kept (KiB)':>12}{'blocks':>10}{'peak (KiB)':>12}")
+    for name, template in TEMPLATES.items():
+        tree = parse_sentence(template)
+        interpreter.run(tree).resolve()
+        _, size, blocks, peak = measure(lambda: interpreter.run(tree))
+        print(f"{name:>18}{size / 1024:>12.0f}{blocks:>10}{peak / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
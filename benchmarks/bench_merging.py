@@ -0,0 +1,55 @@
+"""Time running deeply nested sentences where every level of nesting adds
+some output of its own, so that the output of each block is merged into
+the one around it at every level on the way out.
+
+Merging used to append every part of the inner output again, so took time
+growing with the depth as well as with the length of the output; time per
+node should now stay the same at any depth.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_merging
+"""
+
+import timeit
+from pathlib import Path
+
+from twaddle.interpreter.interpreter import Interpreter
+from twaddle.interpreter.optimizer import OptimizerPasses, count_nodes
+from twaddle.lookup.lookup_manager import LookupManager
+from twaddle.parser.parsing import parse_sentence
+
+DICTIONARIES = Path(__file__).parent.parent / "twaddle" / "tests" / "resources"
+# left unoptimized, so that single-choice blocks stay nested
+NO_OPTIMIZATIONS = OptimizerPasses(False, False, False, False)
+DEPTHS = [10, 100, 1000, 4000]
+REPEATS = 5
+
+
+def nested(depth: int) -> str:
+    return "{<adj> \\a " * depth + "egg" + "}" * depth
+
+
+def main():
+    lookup_manager = LookupManager()
+    lookup_manager.add_dictionaries_from_folder(DICTIONARIES / "valid_dicts")
+    interpreter = Interpreter(lookup_manager, optimizations=NO_OPTIMIZATIONS)
+
+    print("nanoseconds per node")
+    print(f"{'depth':>8}{'nodes':>8}{'interpreted':>14}{'compiled':>14}")
+    for depth in DEPTHS:
+        tree = parse_sentence(nested(depth))
+        program = interpreter.compile(tree)
+        nodes = count_nodes(tree)
+        row = f"{depth:>8}{nodes:>8}"
+        for run in (
+            lambda: interpreter.run(tree).resolve(),
+            lambda: program.bind(interpreter)().resolve(),
+        ):
+            elapsed = min(timeit.repeat(run, number=1, repeat=REPEATS))
+            row += f"{elapsed / nodes * 1e9:>14.0f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Compare the interpreter's explicit stack of frames with running the same
+tree by recursion, per node, for shallow and deeply nested sentences, and
+find how deeply each can nest before running out of stack.
+
+The recursive path is built here from the interpreter's own pieces, as the
+interpreter used before it ran trees that way; compiled templates are shown
+too, as they still call a function for each level of nesting.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_nesting
+"""
+
+import timeit
+from pathlib import Path
+
+from twaddle.interpreter.formatter import Formatter
+from twaddle.interpreter.interpreter import Interpreter
+from twaddle.interpreter.optimizer import OptimizerPasses, count_nodes
+from twaddle.lookup.lookup_manager import LookupManager
+from twaddle.parser.nodes import BlockNode, Node, RootNode
+from twaddle.parser.parsing import parse_sentence
+
+DICTIONARIES = Path(__file__).parent.parent / "twaddle" / "tests" / "resources"
+# left unoptimized, so that single-choice blocks stay nested
+NO_OPTIMIZATIONS = OptimizerPasses(False, False, False, False)
+REPEATS = 9
+
+
+def nested(depth: int) -> str:
+    # only the innermost block has any output, so that the time taken to
+    # merge output from one level into the next doesn't hide the rest
+    return "{" * depth + "<adj>" + "}" * depth
+
+
+TEMPLATES = {
+    "flat": "The <noun> {went|ran|walked} to \\a <adj> {shop|market}. " * 20,
+    "nested 10": nested(10) * 20,
+    "nested 100": nested(100) * 2,
+    "nested 1000": nested(1000),
+}
+DEPTHS = [100, 200, 500, 1000, 5000, 20000]
+
+
+def recursive_runner(interpreter: Interpreter):
+    run_node = interpreter.run_node
+
+    def run(node: Node) -> Formatter:
+        if isinstance(node, RootNode):
+            formatter = Formatter()
+            for child in node.contents:
+                formatter += run(child)
+            return formatter
+        if isinstance(node, BlockNode):
+            return interpreter.run_block(node, run)
+        return run_node(node)
+
+    return run
+
+
+def per_node(run, tree: RootNode) -> str:
+    try:
+        elapsed = min(timeit.repeat(lambda: run(tree), number=20, repeat=REPEATS))
+    except RecursionError:
+        return f"{'too deep':>16}"
+    return f"{elapsed / 20 / count_nodes(tree) * 1e9:>13.0f} ns"
+
+
+def main():
+    lookup_manager = LookupManager()
+    lookup_manager.add_dictionaries_from_folder(DICTIONARIES / "valid_dicts")
+    interpreter = Interpreter(lookup_manager, optimizations=NO_OPTIMIZATIONS)
+    recursive = recursive_runner(interpreter)
+
+    def compiled(tree: RootNode):
+        program = interpreter.compile(tree)
+        return lambda _: program.bind(interpreter)()
+
+    print("time per node")
+    print(f"{'template':>12}{'nodes':>8}{'stack':>16}{'recursive':>16}{'compiled':>16}")
+    for name, template in TEMPLATES.items():
+        tree = parse_sentence(template)
+        print(
+            f"{name:>12}{count_nodes(tree):>8}"
+            + per_node(interpreter.run, tree)
+            + per_node(recursive, tree)
+            + per_node(compiled(tree), tree)
+        )
+
+    print()
+    print("deepest nesting run")
+    print(f"{'depth':>12}{'stack':>16}{'recursive':>16}{'compiled':>16}")
+    for depth in DEPTHS:
+        tree = parse_sentence(nested(depth))
+        results = []
+        for run in (interpreter.run, recursive, compiled(tree)):
+            try:
+                run(tree)
+                results.append(f"{'ok':>16}")
+            except RecursionError:
+                results.append(f"{'too deep':>16}")
+        print(f"{depth:>12}" + "".join(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compare generating many variants of one template with a single runner
+against a `ParallelTwaddleRunner` with different numbers of workers, and
+check that the workers give the same results whichever number is used.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_parallel
+"""
+
+import os
+import timeit
+from pathlib import Path
+
+from twaddle.parallel import ParallelTwaddleRunner
+from twaddle.runner import TwaddleRunner
+
+DICTIONARIES = Path(__file__).parent.parent / "twaddle" / "tests" / "resources"
+TEMPLATE = (
+    "The <noun> {went|ran|walked} to the [rep:3][sep:, ]"
+    "{shop|market|\\a <adj> place} and [if:[eq:1;1];met;missed] <noun::!=a>. "
+)
+COUNT = 20000
+
+
+def main():
+    runner = TwaddleRunner(DICTIONARIES / "valid_dicts")
+    print(f"{COUNT} sentences, {os.cpu_count()} cpus")
+    print(f"{'method':>22} {'total (ms)':>11} {'per sentence (us)':>18}")
+
+    def report(name: str, elapsed: float):
+        print(f"{name:>22} {elapsed * 1e3:>11.1f} {elapsed / COUNT * 1e6:>18.1f}")
+
+    report(
+        "single runner",
+        min(
+            timeit.repeat(
+                lambda: runner.run_sentence_many(TEMPLATE, COUNT), number=1, repeat=3
+            )
+        ),
+    )
+    expected = None
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        with ParallelTwaddleRunner(DICTIONARIES / "valid_dicts", workers) as pool:
+            # starts the workers, so that loading the dictionaries isn't timed
+            results = pool.run_sentence_many(TEMPLATE, COUNT, seed=0)
+            if expected is None:
+                expected = results
+            assert results == expected
+            elapsed = min(
+                timeit.repeat(
+                    lambda: pool.run_sentence_many(TEMPLATE, COUNT, seed=0),
+                    number=1,
+                    repeat=3,
+                )
+            )
+        report(f"{workers} workers", elapsed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Compare parsing and running plain and mostly literal sentences the way
+callers do, through the interpreter's `parse` and the runner's
+`run_sentence`, against parsing (and optimizing) the whole sentence with
+the parser as they used to. The parse cache is turned off, as plain text
+never uses it.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_plain_text
+"""
+
+import timeit
+from pathlib import Path
+
+from twaddle.parser.parsing import parse_with_lark
+from twaddle.runner import TwaddleRunner
+
+DICTIONARIES = Path(__file__).parent.parent / "twaddle" / "tests" / "resources"
+PROSE = "Lorem ipsum dolor sit amet; consectetur adipiscing elit / sed do. "
+
+CASES = {
+    "short plain": "The quick brown fox jumps over the lazy dog.",
+    "long plain": PROSE * 30,
+    "mostly literal": PROSE * 15 + "{a|b} <noun>" + PROSE * 15,
+    "mostly markup": "{a|b} <noun> [rep:3]{x} " * 20,
+}
+NUMBER = 200
+
+
+def microseconds(run) -> float:
+    return min(timeit.repeat(run, number=NUMBER, repeat=3)) / NUMBER * 1e6
+
+
+def main():
+    runner = TwaddleRunner(DICTIONARIES / "valid_dicts", parse_cache_size=0)
+    interpreter = runner.interpreter
+    print(
+        f"{'case':>15} {'length':>7} {'full parse':>11} {'parse':>8} "
+        f"{'full run':>9} {'run':>8}   (us)"
+    )
+    optimize = interpreter.optimizer.optimize
+    for label, sentence in CASES.items():
+        full_parse = microseconds(lambda: optimize(parse_with_lark(sentence)))
+        parse = microseconds(lambda: interpreter.parse(sentence))
+        full_run = microseconds(
+            lambda: interpreter.interpret_tree(optimize(parse_with_lark(sentence)))
+        )
+        run = microseconds(lambda: runner.run_sentence(sentence))
+        print(
+            f"{label:>15} {len(sentence):>7} {full_parse:>11.1f} {parse:>8.1f} "
+            f"{full_run:>9.1f} {run:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
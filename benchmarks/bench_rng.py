@@ -0,0 +1,68 @@
+"""Compare the random sources a runner can draw from: `random.Random`, and
+`BufferedRandom`, the default, which draws small bounded numbers from
+buffers filled in bulk.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_rng
+"""
+
+import timeit
+from pathlib import Path
+from random import Random
+
+from twaddle.interpreter.random_source import BufferedRandom
+from twaddle.runner import TwaddleRunner
+
+DICTIONARIES = Path(__file__).parent.parent / "twaddle" / "tests" / "resources"
+TEMPLATES = {
+    "mixed": (
+        "The <noun> {went|ran|walked} to the [rep:3][sep:, ]"
+        "{shop|market|\\a <adj> place} and [if:[eq:1;1];met;missed] <noun::!=a>. "
+    ),
+    "choices": "[rep:20]{{a|b|c|d}{e|f}{g|h|i}}",
+    "lookups": "[rep:20]{<noun> <adj> <noun-vehicle> }",
+    "digits": "[rep:20]{\\d\\d\\d-}",
+    "synchronizers": "[rep:20][sync:d;deck]{a|b|c|d|e|f|g|h}",
+}
+BACKENDS = {"Random": Random, "BufferedRandom": BufferedRandom}
+COUNT = 1000
+DRAWS = 100000
+
+
+def main():
+    print(f"{'draw':>22}" + "".join(f"{name:>16}" for name in BACKENDS))
+    for name, draw in {
+        "randrange(4)": lambda rng: rng.randrange(4),
+        "randint(0, 9)": lambda rng: rng.randint(0, 9),
+        "choice (12 items)": lambda rng, items=list(range(12)): rng.choice(items),
+    }.items():
+        timings = []
+        for backend in BACKENDS.values():
+            rng = backend(0)
+            elapsed = min(timeit.repeat(lambda: draw(rng), number=DRAWS, repeat=3))
+            timings.append(f"{elapsed / DRAWS * 1e9:>13.0f} ns")
+        print(f"{name:>22}" + "".join(timings))
+
+    print()
+    print(f"{COUNT} sentences of each template, us per sentence")
+    print(f"{'template':>22}" + "".join(f"{name:>16}" for name in BACKENDS))
+    for name, template in TEMPLATES.items():
+        timings = []
+        for backend in BACKENDS.values():
+            runner = TwaddleRunner(
+                DICTIONARIES / "valid_dicts", seed=0, rng_backend=backend
+            )
+            elapsed = min(
+                timeit.repeat(
+                    lambda: runner.run_sentence_many(template, COUNT),
+                    number=1,
+                    repeat=3,
+                )
+            )
+            timings.append(f"{elapsed / COUNT * 1e6:>16.1f}")
+        print(f"{name:>22}" + "".join(timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Time reversing and replacing in large output, and reversing inside
+reversed blocks nested deeply.
+
+The output of a reversed block or regex used to be joined into a single
+string, reversed or searched, and joined again by every block around it;
+it's now kept as a rope of the pieces it was built from until the whole
+sentence is resolved, so nested reverses take time growing with the
+output rather than with the output times the depth.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_rope
+"""
+
+import timeit
+from pathlib import Path
+
+from twaddle.interpreter.interpreter import Interpreter
+from twaddle.interpreter.optimizer import OptimizerPasses
+from twaddle.lookup.lookup_manager import LookupManager
+from twaddle.parser.parsing import parse_sentence
+
+DICTIONARIES = Path(__file__).parent.parent / "twaddle" / "tests" / "resources"
+# left unoptimized, so that single-choice blocks stay nested
+NO_OPTIMIZATIONS = OptimizerPasses(False, False, False, False)
+REPEATS = 5
+
+
+def nested_reverse(depth: int) -> str:
+    return "[reverse]{<adj> egg " * depth + "}" * depth
+
+
+def nested_regex(depth: int) -> str:
+    return "[//e//:<adj> egg " * depth + ";E]" * depth
+
+
+TEMPLATES = {
+    "reverse 100k": "[reverse]{[rep:10000]{<adj> egg }}",
+    "regex 100k": "[//e//:[rep:10000]{<adj> egg };[match][match]]",
+    "reverse in regex": "[//g+//:[reverse]{[rep:10000]{<adj> egg }};G]",
+    "nested reverse 100": nested_reverse(100),
+    "nested reverse 1000": nested_reverse(1000),
+    "nested reverse 4000": nested_reverse(4000),
+    "nested regex 100": nested_regex(100),
+}
+
+
+def main():
+    lookup_manager = LookupManager()
+    lookup_manager.add_dictionaries_from_folder(DICTIONARIES / "valid_dicts")
+    interpreter = Interpreter(lookup_manager, optimizations=NO_OPTIMIZATIONS)
+
+    print("milliseconds per sentence")
+    print(f"{'template':>20}{'length':>10}{'interpreted':>14}{'compiled':>14}")
+    for name, template in TEMPLATES.items():
+        tree = parse_sentence(template)
+        program = interpreter.compile(tree)
+        length = len(interpreter.run(tree).resolve())
+        row = f"{name:>20}{length:>10}"
+        for run in (
+            lambda: interpreter.run(tree).resolve(),
+            lambda: program.bind(interpreter)().resolve(),
+        ):
+            elapsed = min(timeit.repeat(run, number=1, repeat=REPEATS))
+            row += f"{elapsed * 1e3:>14.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Generate sentences from several threads sharing one runner, checking that
+each result is consistent with itself, and compare the throughput with one
+thread and with a runner per thread.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_threads
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from twaddle.runner import TwaddleRunner
+
+DICTIONARIES = Path(__file__).parent.parent / "twaddle" / "tests" / "resources"
+# every part repeats something chosen earlier in the sentence, so any state
+# shared between threads shows up as a mismatch
+TEMPLATE = (
+    "<noun::=a>,<noun::=a>;[sync:s;locked]{1|2|3|4|5}[sync:s]{1|2|3|4|5};"
+    "[copy:c]{a|b|c|d}[paste:c]"
+)
+PER_THREAD = 2000
+
+
+def consistent(result: str) -> bool:
+    label, synced, copied = result.split(";")
+    first, second = label.split(",")
+    return first == second and synced[0] == synced[1] and copied[0] == copied[1]
+
+
+def run(runners: list[TwaddleRunner], switch_interval: float) -> tuple[float, int]:
+    """Generate PER_THREAD sentences on a thread per runner, returning the
+    time taken and the number of inconsistent results."""
+    start = threading.Barrier(len(runners))
+
+    def work(runner: TwaddleRunner) -> list[str]:
+        start.wait()
+        return runner.run_sentence_many(TEMPLATE, PER_THREAD)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(switch_interval)
+    try:
+        with ThreadPoolExecutor(len(runners)) as executor:
+            began = time.perf_counter()
+            results = list(executor.map(work, runners))
+            elapsed = time.perf_counter() - began
+    finally:
+        sys.setswitchinterval(interval)
+    return elapsed, sum(not consistent(r) for batch in results for r in batch)
+
+
+def main():
+    shared = TwaddleRunner(DICTIONARIES / "valid_dicts")
+    print(f"{PER_THREAD} sentences per thread")
+    print(
+        f"{'threads':>7} {'runners':>8} {'switch (s)':>10} {'total (ms)':>11} "
+        f"{'per sentence (us)':>18} {'inconsistent':>12}"
+    )
+    for threads in (1, 2, 8):
+        for label, runners in (
+            ("shared", [shared] * threads),
+            (
+                "own",
+                [TwaddleRunner(DICTIONARIES / "valid_dicts") for _ in range(threads)],
+            ),
+        ):
+            for switch_interval in (0.005, 1e-6):
+                elapsed, inconsistent = run(runners, switch_interval)
+                count = threads * PER_THREAD
+                print(
+                    f"{threads:>7} {label:>8} {switch_interval:>10g} "
+                    f"{elapsed * 1e3:>11.1f} {elapsed / count * 1e6:>18.1f} "
+                    f"{inconsistent:>12}"
+                )
+                assert inconsistent == 0
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
+from twaddle.compiled_template import CompiledTemplate
 from twaddle.exceptions import TwaddleException
 from twaddle.runner import TwaddleRunner
 
-__all__ = ["TwaddleRunner", "TwaddleException"]
+__all__ = ["TwaddleRunner", "TwaddleException", "CompiledTemplate"]
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from functools import partial
+from importlib.resources.abc import Traversable
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+from twaddle.compiled_template import CompiledTemplate
+from twaddle.runner import TwaddleRunner
+
+DEFAULT_MAX_PENDING = 64
+
+T = TypeVar("T")
+
+
+class AsyncTwaddleRunner:
+    """Runs a TwaddleRunner from asyncio code without blocking the event loop.
+
+    Each call is run in `executor`, by default a single thread owned by this
+    object, which must run its work in this process. Calls made together run
+    one after the other in the default thread, or at the same time in an
+    executor with several threads, each of which keeps labels and other state
+    of its own.
+
+    At most `max_pending` calls are handed to the executor at once; any more
+    wait their turn without queueing work there. A call cancelled while
+    waiting never runs, and a cancelled batch stops after the sentence it is
+    generating; either way, a call keeps its place among those pending until
+    the executor has finished with it.
+    """
+
+    def __init__(
+        self,
+        runner: TwaddleRunner,
+        executor: Optional[Executor] = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ):
+        if max_pending < 1:
+            raise ValueError(f"max_pending must be at least 1, got {max_pending}")
+        self.runner = runner
+        self._owns_executor = executor is None
+        self.executor = (
+            executor
+            if executor is not None
+            else ThreadPoolExecutor(max_workers=1, thread_name_prefix="twaddle")
+        )
+        self.max_pending = max_pending
+        self._slots = asyncio.Semaphore(max_pending)
+        self._pending = 0
+
+    @classmethod
+    async def create(
+        cls,
+        path: str | Path | Traversable,
+        executor: Optional[Executor] = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        **runner_options: Any,
+    ) -> "AsyncTwaddleRunner":
+        """Create a TwaddleRunner, loading its dictionaries in `executor`, or
+        the event loop's default executor, and wrap it."""
+        runner = await asyncio.get_running_loop().run_in_executor(
+            executor, lambda: TwaddleRunner(path, **runner_options)
+        )
+        return cls(runner, executor, max_pending)
+
+    @property
+    def pending(self) -> int:
+        """The number of calls currently handed to the executor."""
+        return self._pending
+
+    async def _run(self, function: Callable[..., T], *args: Any) -> T:
+        await self._slots.acquire()
+        self._pending += 1
+        try:
+            future = self.executor.submit(function, *args)
+        except BaseException:
+            self._release()
+            raise
+        # the slot is given up when the call finishes, rather than when it
+        # stops being awaited, so a call cancelled while running still counts
+        # until the executor is done with it; added before wrapping the
+        # future, so that the slot is free by the time the result is returned
+        future.add_done_callback(partial(self._finished, asyncio.get_running_loop()))
+        return await asyncio.wrap_future(future)
+
+    def _finished(self, loop: asyncio.AbstractEventLoop, _: Future):
+        # called in whichever thread finished or cancelled the future
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            # the event loop has already closed
+            pass
+
+    def _release(self):
+        self._pending -= 1
+        self._slots.release()
+
+    async def run_sentence(
+        self, sentence: str, seed: Optional[int | str] = None
+    ) -> str:
+        return await self._run(self.runner.run_sentence, sentence, seed)
+
+    async def compile(self, sentence: str) -> CompiledTemplate:
+        return await self._run(self.runner.compile, sentence)
+
+    async def run_compiled(
+        self, template: CompiledTemplate, seed: Optional[int | str] = None
+    ) -> str:
+        return await self._run(self.runner.run_compiled, template, seed)
+
+    async def run_sentence_many(
+        self,
+        sentence: str,
+        n: int,
+        reset_between: bool = True,
+        seed: Optional[int | str] = None,
+    ) -> list[str]:
+        cancelled = threading.Event()
+
+        def run_batch() -> list[str]:
+            results = []
+            for text in self.runner.iter_sentence_many(
+                sentence, n, reset_between, seed
+            ):
+                results.append(text)
+                if cancelled.is_set():
+                    break
+            return results
+
+        try:
+            return await self._run(run_batch)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def add_dictionaries_from_folder(self, path: str | Path | Traversable):
+        await self._run(self.runner.add_dictionaries_from_folder, path)
+
+    async def add_dictionary_file(self, path: str | Path | Traversable):
+        await self._run(self.runner.add_dictionary_file, path)
+
+    def close(self):
+        """Shut down the executor, if this object created it. Calls not yet
+        started are cancelled."""
+        if self._owns_executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> "AsyncTwaddleRunner":
+        return self
+
+    async def __aexit__(self, *_):
+        self.close()
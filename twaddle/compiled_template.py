@@ -0,0 +1,23 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+from twaddle.interpreter.compiler import CompiledProgram
+from twaddle.parser.nodes import RootNode
+
+if TYPE_CHECKING:
+    from twaddle.runner import TwaddleRunner
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """A parsed Twaddle sentence which can be rendered repeatedly without
+    going back through the parser, compiled to Python code which runs the
+    whole tree without dispatching on each node. Obtained from
+    `TwaddleRunner.compile`."""
+
+    sentence: str
+    tree: RootNode = field(repr=False, compare=False)
+    program: CompiledProgram = field(repr=False, compare=False)
+
+    def render(self, runner: "TwaddleRunner", seed: Optional[int | str] = None) -> str:
+        return runner.run_compiled(self, seed)
@@ -45,3 +45,10 @@ class TwaddleFunctionRegistryException(TwaddleException):
 
     def __init__(self, message: str):
         super().__init__(message)
+
+
+class TwaddleBudgetException(TwaddleException):
+    """Thrown when a sentence goes over its execution budget"""
+
+    def __init__(self, message: str):
+        super().__init__(message)
@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+from math import inf
+from time import monotonic
+from typing import Optional
+
+from twaddle.exceptions import TwaddleBudgetException
+
+# how many steps may pass between looks at the clock
+CLOCK_CHECK_INTERVAL = 256
+
+
+@dataclass(frozen=True)
+class ExecutionBudget:
+    """Limits on the work a single sentence may do. Each is unlimited if
+    None.
+
+    `max_steps` limits the number of nodes evaluated, counting each
+    repetition of a block as one more. `max_output` limits the number of
+    characters of output any block, or the sentence as a whole, may build
+    up, including output which is later hidden. `max_depth` limits how
+    deeply blocks may be nested, including those in loaded patterns.
+    `timeout` is the number of seconds a sentence may take.
+    """
+
+    max_steps: Optional[int] = None
+    max_output: Optional[int] = None
+    max_depth: Optional[int] = None
+    timeout: Optional[float] = None
+
+
+class BudgetTracker:
+    """Keeps count of the work done by the sentence being run, raising
+    TwaddleBudgetException as soon as it goes over its budget."""
+
+    def __init__(self, budget: ExecutionBudget):
+        self.budget = budget
+        self.max_steps = inf if budget.max_steps is None else budget.max_steps
+        self.max_output = inf if budget.max_output is None else budget.max_output
+        self.max_depth = inf if budget.max_depth is None else budget.max_depth
+        self.start()
+
+    def start(self):
+        """Start counting for a new sentence."""
+        self.steps = 0
+        self.depth = 0
+        timeout = self.budget.timeout
+        self.deadline = inf if timeout is None else monotonic() + timeout
+        self._next_check = self._next_check_after(0)
+
+    def _next_check_after(self, steps: int) -> float:
+        if self.deadline == inf:
+            return self.max_steps + 1
+        return min(self.max_steps + 1, steps + CLOCK_CHECK_INTERVAL)
+
+    def step(self, n: int = 1):
+        self.steps += n
+        if self.steps >= self._next_check:
+            self._check()
+
+    def _check(self):
+        if self.steps > self.max_steps:
+            raise TwaddleBudgetException(
+                f"[BudgetTracker.step] sentence went over its limit of "
+                f"{self.budget.max_steps} steps"
+            )
+        if monotonic() > self.deadline:
+            raise TwaddleBudgetException(
+                f"[BudgetTracker.step] sentence took longer than its limit of "
+                f"{self.budget.timeout} seconds"
+            )
+        self._next_check = self._next_check_after(self.steps)
+
+    def check_output(self, length: int):
+        if length > self.max_output:
+            raise TwaddleBudgetException(
+                f"[BudgetTracker.check_output] output went over its limit of "
+                f"{self.budget.max_output} characters"
+            )
+
+    def enter(self):
+        self.depth += 1
+        if self.depth > self.max_depth:
+            raise TwaddleBudgetException(
+                f"[BudgetTracker.enter] blocks nested deeper than the limit of "
+                f"{self.budget.max_depth}"
+            )
+
+    def leave(self):
+        self.depth -= 1
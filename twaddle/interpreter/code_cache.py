@@ -0,0 +1,68 @@
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from pathlib import Path
+from types import CodeType
+from typing import Optional
+
+# bump whenever the code generated for a template changes shape
+COMPILER_VERSION = 1
+CODE_CACHE_SUFFIX = ".twb"
+
+
+class DiskCodeCache:
+    """Persistent cache of the bytecode compiled for Twaddle templates.
+
+    Entries are keyed by a hash of the generated source, the compiler version
+    and the running Python's bytecode version, so a changed compiler or a
+    different interpreter simply misses. Code objects are stored with
+    `marshal`, as Python does in its own `.pyc` files. As with the parse
+    cache, unreadable entries count as misses and failed writes are ignored.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def _path_for(self, source: str) -> Path:
+        key = hashlib.sha256(
+            f"{COMPILER_VERSION}:{sys.implementation.cache_tag}\0{source}".encode()
+        ).hexdigest()
+        return self.directory / f"{key}{CODE_CACHE_SUFFIX}"
+
+    def get(self, source: str) -> Optional[CodeType]:
+        try:
+            code = marshal.loads(self._path_for(source).read_bytes())
+            if not isinstance(code, CodeType):
+                raise ValueError("not a code object")
+        except (OSError, EOFError, ValueError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return code
+
+    def put(self, source: str, code: CodeType):
+        payload = marshal.dumps(code)
+        try:
+            handle, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                temp_file.write(payload)
+            os.replace(temp_name, self._path_for(source))
+        except OSError:
+            Path(temp_name).unlink(missing_ok=True)
+
+    def clear(self):
+        for entry in self.directory.glob(f"*{CODE_CACHE_SUFFIX}"):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+        self.hits = 0
+        self.misses = 0
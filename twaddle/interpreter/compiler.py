@@ -0,0 +1,264 @@
+from re import Match
+from types import CodeType
+from typing import TYPE_CHECKING, Callable, Optional
+
+from twaddle.interpreter.code_cache import DiskCodeCache
+from twaddle.interpreter.context import TwaddleContext
+from twaddle.interpreter.formatter import Formatter
+from twaddle.interpreter.function_registry import FunctionRegistry
+from twaddle.interpreter.optimizer import NOT_CONSTANT, evaluate_constant_call
+from twaddle.interpreter.rope import Rope
+from twaddle.parser.nodes import (
+    BlockNode,
+    DigitNode,
+    FunctionNode,
+    IndefiniteArticleNode,
+    LookupNode,
+    Node,
+    RegexNode,
+    RootNode,
+    TextNode,
+)
+
+if TYPE_CHECKING:
+    from twaddle.interpreter.interpreter import Interpreter
+
+# name given to generated code in tracebacks
+COMPILED_FILENAME = "<twaddle template>"
+# generated functions call each other for each level of nesting, so parts of
+# a tree nested deeper than this are left to the interpreter, which doesn't
+MAX_COMPILED_DEPTH = 50
+# nodes which contain RootNodes of their own
+NESTING_NODES = (BlockNode, FunctionNode, RegexNode, RootNode)
+
+
+class CompiledEvaluator:
+    """Stands in for the interpreter when compiled code calls a function
+    handler, so that arguments the handler evaluates itself run as compiled
+    code too."""
+
+    def __init__(self, run: Callable[[RootNode], Formatter]):
+        self.run = run
+
+    def evaluate(self, root: RootNode) -> str:
+        return self.run(root).resolve()
+
+
+class SourceGenerator:
+    """Generates the Python source for a tree: one function per RootNode in
+    it, named `_r0`, `_r1`, ... with `_r0` for the tree itself, each running
+    its contents in order as straight-line code.
+
+    The generated code refers to values which can't be written as literals
+    by name; they are collected here and bound in CompiledProgram.bind:
+    `n0`, `n1`, ... are nodes, `h0`, ... function handlers, `d0`, ... the
+    `get` methods of dictionaries and `l0`, ... the context's labels for
+    each of those dictionaries.
+    """
+
+    def __init__(self):
+        self.roots: list[RootNode] = []
+        self.constants: list[object] = []
+        self.handlers: list[Callable] = []
+        self.dictionaries: list[str] = []
+        self.functions: list[str] = []
+        self.depth = 0
+
+    def generate(self, tree: RootNode) -> str:
+        self.add_root(tree)
+        return "\n".join(self.functions) + "\n"
+
+    def constant(self, value: object) -> str:
+        self.constants.append(value)
+        return f"n{len(self.constants) - 1}"
+
+    def handler(self, handler: Callable) -> str:
+        self.handlers.append(handler)
+        return f"h{len(self.handlers) - 1}"
+
+    def dictionary(self, name: str) -> int:
+        if name not in self.dictionaries:
+            self.dictionaries.append(name)
+        return self.dictionaries.index(name)
+
+    def add_root(self, root: RootNode) -> str:
+        name = f"_r{len(self.roots)}"
+        self.roots.append(root)
+        lines = [f"def {name}():", "    out = Formatter()", "    append = out.append"]
+        if root.contents:
+            # counts against the sentence's budget, if it has one
+            lines.append(f"    if step: step({len(root.contents)})")
+        self.depth += 1
+        lines.extend(f"    {self.statement(node)}" for node in root.contents)
+        self.depth -= 1
+        lines.append("    return out")
+        self.functions.append("\n".join(lines) + "\n")
+        return name
+
+    def statement(self, node: Node) -> str:
+        if self.depth > MAX_COMPILED_DEPTH and isinstance(node, NESTING_NODES):
+            return f"out += interpret({self.constant(node)})"
+        match node:
+            case TextNode(text=text):
+                return f"append({text!r})"
+            case LookupNode():
+                index = self.dictionary(node.dictionary)
+                node_name = self.constant(node)
+                return (
+                    f"append(d{index}({node_name}, context.strict_mode, l{index}, "
+                    "context.rng))"
+                )
+            case BlockNode(choices=choices):
+                for choice in choices:
+                    self.add_root(choice)
+                return f"out += run_block({self.constant(node)})"
+            case FunctionNode():
+                return self.function_statement(node)
+            case RegexNode(regex=regex, scope=scope, replacement=replacement):
+                scope_name = self.add_root(scope)
+                replacement_name = self.add_root(replacement)
+                return f"append(regex_sub({regex!r}, {scope_name}, {replacement_name}))"
+            case IndefiniteArticleNode(default_upper=default_upper):
+                return f"out.add_indefinite_article({default_upper!r})"
+            case DigitNode():
+                return "append(str(context.rng.randint(0, 9)))"
+            case RootNode():
+                return f"out += {self.add_root(node)}()"
+        return f"out += interpret({self.constant(node)})"
+
+    def function_statement(self, node: FunctionNode) -> str:
+        entry = FunctionRegistry.function_lookup.get(node.func)
+        num_args = len(node.args)
+        if (
+            entry is None
+            or num_args < entry.min_args
+            or (entry.max_args and num_args > entry.max_args)
+        ):
+            # leave the interpreter to raise the appropriate error if and
+            # when this is reached
+            return f"out += interpret({self.constant(node)})"
+        if (value := evaluate_constant_call(node)) is not NOT_CONSTANT:
+            # a pure call the optimizer couldn't replace with text, such as
+            # a case, which gives a formatting strategy
+            return f"append({self.constant(value)})"
+        if getattr(entry.handler, "evaluates_args", False):
+            handler = self.handler(entry.handler.__wrapped__)
+            args = "".join(f"{self.add_root(arg)}().resolve(), " for arg in node.args)
+            return f"append({handler}([{args}], context, evaluator))"
+        handler = self.handler(entry.handler)
+        return f"append({handler}({self.constant(node.args)}, context, evaluator))"
+
+
+class CompiledProgram:
+    """A parse tree compiled to Python bytecode.
+
+    The code is independent of any interpreter; `bind` links it to an
+    interpreter's context and dictionaries, returning a function which runs
+    the whole tree and returns its Formatter. As each thread has a context of
+    its own, bound functions are kept by the context, for as long as both it
+    and the program exist, and rebound if dictionaries are added.
+    """
+
+    def __init__(
+        self, tree: RootNode, source: str, code: CodeType, generator: SourceGenerator
+    ):
+        self.tree = tree
+        self.source = source
+        self.code = code
+        self.roots: list[RootNode] = generator.roots
+        self.constants: list[object] = generator.constants
+        self.handlers: list[Callable] = generator.handlers
+        self.dictionaries: list[str] = generator.dictionaries
+
+    def bind(self, interpreter: "Interpreter") -> Callable[[], Formatter]:
+        context = interpreter.context
+        lookup_manager = context.lookup_manager
+        bound = context.bound_programs.get(self)
+        if bound is not None and bound[0] == lookup_manager.generation:
+            return bound[1]
+        run = self._link(interpreter, context)
+        context.bound_programs[self] = (lookup_manager.generation, run)
+        return run
+
+    def _link(
+        self, interpreter: "Interpreter", context: TwaddleContext
+    ) -> Callable[[], Formatter]:
+        compiled: dict[int, Callable[[], Formatter]] = {}
+
+        def run(root: RootNode) -> Formatter:
+            if (function := compiled.get(id(root))) is not None:
+                return function()
+            return interpreter.run(root)
+
+        namespace = self._namespace(interpreter, context, run)
+        self._bind_dictionaries(namespace, context)
+        exec(self.code, namespace)
+        for index, root in enumerate(self.roots):
+            compiled[id(root)] = namespace[f"_r{index}"]
+        return namespace["_r0"]
+
+    def _namespace(
+        self,
+        interpreter: "Interpreter",
+        context: TwaddleContext,
+        run: Callable[[RootNode], Formatter],
+    ) -> dict[str, object]:
+        # the names the compiled code uses, other than its dictionaries
+
+        def run_block(block: BlockNode) -> Formatter:
+            return interpreter.run_block(block, run)
+
+        def regex_sub(regex: str, scope: Callable, replacement: Callable) -> Rope:
+            def repl(match: Match[str]):
+                context.current_regex_match = match.group()
+                return replacement().resolve()
+
+            return scope().resolve_rope().sub(regex, repl)
+
+        namespace = {
+            "Formatter": Formatter,
+            "context": context,
+            "evaluator": CompiledEvaluator(run),
+            "interpret": interpreter.run,
+            "run_block": run_block,
+            "regex_sub": regex_sub,
+            "step": context.budget.step if context.budget is not None else None,
+        }
+        for index, constant in enumerate(self.constants):
+            namespace[f"n{index}"] = constant
+        for index, handler in enumerate(self.handlers):
+            namespace[f"h{index}"] = handler
+        return namespace
+
+    def _bind_dictionaries(
+        self, namespace: dict[str, object], context: TwaddleContext
+    ) -> None:
+        # each dictionary's lookup function and labels
+        lookup_manager = context.lookup_manager
+
+        def missing_dictionary(name: str) -> Callable:
+            def get(*_):
+                # raises the usual error for a dictionary that isn't loaded
+                return lookup_manager[name]
+
+            return get
+
+        for index, name in enumerate(self.dictionaries):
+            dictionary = lookup_manager.dictionaries.get(name)
+            namespace[f"d{index}"] = (
+                dictionary.get if dictionary is not None else missing_dictionary(name)
+            )
+            namespace[f"l{index}"] = context.labels_for(name)
+
+
+def compile_tree(
+    tree: RootNode, code_cache: Optional[DiskCodeCache] = None
+) -> CompiledProgram:
+    generator = SourceGenerator()
+    source = generator.generate(tree)
+    code = code_cache.get(source) if code_cache is not None else None
+    if code is None:
+        code = compile(source, COMPILED_FILENAME, "exec")
+        if code_cache is not None:
+            code_cache.put(source, code)
+    return CompiledProgram(tree, source, code, generator)
@@ -1,46 +1,70 @@
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Optional
+from weakref import WeakKeyDictionary
 
 from twaddle.exceptions import TwaddleInterpreterException
 from twaddle.interpreter.block_attributes import BlockAttributes
+from twaddle.interpreter.budget import BudgetTracker
 from twaddle.interpreter.formatter import Formatter
+from twaddle.interpreter.random_source import DEFAULT_RNG_BACKEND, RandomSource
 from twaddle.interpreter.synchronizer import Synchronizer, sync_types
+from twaddle.lookup.lookup_entry import DictionaryEntry
 from twaddle.lookup.lookup_manager import LookupManager
 from twaddle.parser.nodes import RootNode
 
+if TYPE_CHECKING:
+    from twaddle.interpreter.compiler import CompiledProgram
 
-@dataclass
+
+@dataclass(eq=False)
 class TwaddleContext:
+    """The state built up while running sentences: saved patterns, copied
+    blocks, synchronizers and labels, and the source of every random choice.
+    Each thread using an interpreter has a context of its own."""
+
     persistent_labels: bool = False
     persistent_synchronizers: bool = False
     persistent_patterns: bool = False
     persistent_clipboard: bool = False
     strict_mode: bool = False
 
-    saved_patterns = dict[str, RootNode]()
-    copied_blocks = dict[str, Formatter]()
+    saved_patterns: dict[str, RootNode] = field(default_factory=dict)
+    copied_blocks: dict[str, Formatter] = field(default_factory=dict)
     lookup_manager: LookupManager = field(default_factory=LookupManager)
+    # labelled entries, by dictionary name and then label
+    labels: dict[str, dict[str, DictionaryEntry]] = field(default_factory=dict)
+    rng: RandomSource = field(default_factory=DEFAULT_RNG_BACKEND)
     block_attributes: BlockAttributes = field(default_factory=BlockAttributes)
     synchronizers: dict[str, Synchronizer] = field(default_factory=dict)
+    # counts the work done by the current sentence, if it has a budget
+    budget: Optional[BudgetTracker] = None
+    # compiled programs bound to this context, with the generation of the
+    # dictionaries they were bound to; kept here rather than by the programs,
+    # as the bound functions refer to the context
+    bound_programs: "WeakKeyDictionary[CompiledProgram, tuple[int, Callable]]" = field(
+        default_factory=WeakKeyDictionary
+    )
 
     current_regex_match: Optional[str] = None
 
-    def reset_for_new_sentence(self):
+    def reset_for_new_sentence(self, reset_labels_and_synchronizers: bool = True):
         if not self.persistent_patterns:
             self.saved_patterns.clear()
         if not self.persistent_clipboard:
             self.copied_blocks.clear()
-        if not self.persistent_synchronizers:
+        if reset_labels_and_synchronizers and not self.persistent_synchronizers:
             self.clear_synchronizers()
-        if not self.persistent_labels:
-            self.lookup_manager.clear_labels()
+        if reset_labels_and_synchronizers and not self.persistent_labels:
+            self.clear_labels()
         self.consume_block_attributes()
+        if self.budget is not None:
+            self.budget.start()
 
     def force_clear(self):
         self.saved_patterns.clear()
         self.copied_blocks.clear()
         self.clear_synchronizers()
-        self.lookup_manager.clear_labels()
+        self.clear_labels()
         self.consume_block_attributes()
 
     def consume_block_attributes(self) -> BlockAttributes:
@@ -54,7 +78,7 @@ class TwaddleContext:
     def create_synchronizer(
         self, name: str, sync_type: str, length: int
     ) -> Synchronizer:
-        self.synchronizers[name] = sync_types[sync_type](length)
+        self.synchronizers[name] = sync_types[sync_type](length, self.rng)
         return self.synchronizers[name]
 
     def get_synchronizer(self, name: str) -> Synchronizer:
@@ -66,3 +90,13 @@ class TwaddleContext:
 
     def clear_synchronizers(self):
         self.synchronizers.clear()
+
+    def labels_for(self, dictionary: str) -> dict[str, DictionaryEntry]:
+        if (labels := self.labels.get(dictionary)) is None:
+            labels = self.labels[dictionary] = {}
+        return labels
+
+    def clear_labels(self):
+        # cleared in place, as compiled programs hold on to these
+        for labels in self.labels.values():
+            labels.clear()
@@ -1,6 +1,6 @@
 import re
 from functools import singledispatchmethod
-from typing import Optional, Self
+from typing import Iterator, Optional, Self
 
 from twaddle.exceptions import TwaddleInterpreterException
 from twaddle.interpreter.formatting_object import (
@@ -8,26 +8,69 @@ from twaddle.interpreter.formatting_object import (
     FormattingStrategy,
     IndefiniteArticle,
     PlainText,
+    RopeText,
     StrategyChange,
 )
+from twaddle.interpreter.rope import Rope
 from twaddle.parser.nodes import IndefiniteArticleNode
 
 
 class Formatter:
+    # output merged from another formatter with more parts than this is kept
+    # as a segment of its own, a list among the parts of this one's, rather
+    # than copied in
+    segment_threshold = 16
+    # formatting objects never change, so these are shared by every formatter
+    strategy_changes = {
+        strategy: StrategyChange(strategy) for strategy in FormattingStrategy
+    }
+    articles = {article: PlainText(article) for article in ("a", "an", "A", "An")}
     # regex for finding next alphabetic string
     alphabetic_regex = re.compile(r"[^\W_]+", re.UNICODE)
+    # runs of whitespace, kept when splitting text into words
+    whitespace_regex = re.compile(r"(\s+)")
+    # points just after anything which ends a sentence
+    sentence_end_regex = re.compile(r"(?<=[.!?])")
+    # a lone lowercase i, which sentence case capitalizes
+    lone_i_regex = re.compile(r"(?<= )i(?=[\W_])")
 
     def __init__(self):
-        self.output_stack = list[FormattingObject]()
-        self.sentence = str()
+        # articles still waiting for a word are always at the top level of
+        # output_stack, never in a segment
+        self.output_stack = list[FormattingObject | list]()
+        self._reset_sentence_()
         self.current_strategy = FormattingStrategy.NONE
-        self.indefinite_article_waiting = False
+        # positions in output_stack of the articles still waiting for a word
+        # to follow them, in order
+        self.pending_articles = list[int]()
+        # the first word of the output, which decides any article waiting
+        # when it's added to the end of another formatter's
+        self.first_word: Optional[str] = None
+        # whether words added by append_formatter have gone past articles
+        # still waiting, which are decided by those words instead when this
+        # is added to the end of another formatter's
+        self.articles_passed = False
+        # characters of text in output_stack, kept up to date as it changes
+        # so that execution budgets can check it cheaply
+        self.text_length = 0
 
     def _reset_(self):
-        self.output_stack = list[FormattingObject]()
-        self.sentence = str()
+        self.output_stack = list[FormattingObject | list]()
+        self._reset_sentence_()
         self.current_strategy = FormattingStrategy.NONE
-        self.indefinite_article_waiting = False
+        self.pending_articles = list[int]()
+        self.first_word = None
+        self.articles_passed = False
+        self.text_length = 0
+
+    def _reset_sentence_(self):
+        # resolved text is collected in pieces and joined once at the end;
+        # all the case strategies need to know of the text before is whether
+        # it ended a sentence, and whether it ended a word
+        self.sentence_parts = list[str | Rope]()
+        self.sentence_ropes = False
+        self.sentence_start = True
+        self.word_start = True
 
     @classmethod
     def from_text(cls, text: str) -> "Formatter":
@@ -35,6 +78,12 @@ class Formatter:
         formatter.append(text)
         return formatter
 
+    @classmethod
+    def from_rope(cls, rope: Rope) -> "Formatter":
+        formatter = Formatter()
+        formatter.append(rope)
+        return formatter
+
     @singledispatchmethod
     def append(self, arg) -> "Formatter":
         if arg is None:
@@ -47,15 +96,20 @@ class Formatter:
 
     @append.register(str)
     def _(self, item: str) -> Self:
-        previous = self._get_previous_object_()
-        self.output_stack.append(PlainText(previous, item))
-        if self.indefinite_article_waiting:
-            self._replace_indefinite_articles(item)
+        self._append_text_(item)
+        return self
+
+    @append.register(Rope)
+    def _(self, item: Rope) -> Self:
+        self.output_stack.append(RopeText(item))
+        self.text_length += len(item)
+        if self.pending_articles or self.first_word is None:
+            self._add_word_(item.first_word())
         return self
 
     @append.register(FormattingStrategy)
     def _(self, item: FormattingStrategy) -> Self:
-        self.output_stack.append(StrategyChange(self._get_previous_object_(), item))
+        self.output_stack.append(self.strategy_changes[item])
         return self
 
     @append.register(IndefiniteArticleNode)
@@ -70,102 +124,270 @@ class Formatter:
 
     @append.register(PlainText)
     def _(self, item: PlainText) -> Self:
-        previous = self._get_previous_object_()
-        self.output_stack.append(PlainText(previous, item.text))
-        if self.indefinite_article_waiting:
-            self._replace_indefinite_articles(item.text)
+        self._append_text_(item.text)
         return self
 
     @append.register(FormattingObject)
     def _(self, item: FormattingObject) -> Self:
-        item.previous = self._get_previous_object_()
         self.output_stack.append(item)
         return self
 
-    def append_formatter(self, formatter: Self):
-        self.output_stack += formatter.output_stack
+    def _append_text_(self, text: str):
+        self.output_stack.append(PlainText(text))
+        self.text_length += len(text)
+        if self.pending_articles or self.first_word is None:
+            self._add_word_(self._find_alphabetic_string_(text))
 
-    def _get_previous_object_(self) -> Optional[FormattingObject]:
-        if len(self.output_stack):
-            return self.output_stack[-1]
-        return None
+    def _add_word_(self, word: Optional[str]):
+        # a word coming after everything already in the output
+        if word is None:
+            return
+        if self.pending_articles:
+            self._replace_indefinite_articles(word)
+        if self.first_word is None:
+            self.first_word = word
+
+    def _splice_(
+        self, items: list[FormattingObject | list], pending_articles: list[int]
+    ):
+        output_stack = self.output_stack
+        if not output_stack:
+            self.output_stack = items
+            self.pending_articles = list(pending_articles)
+            return
+        # everything before the first article still waiting can go into a
+        # segment, leaving the articles at the top level
+        head = pending_articles[0] if pending_articles else len(items)
+        if head > self.segment_threshold:
+            output_stack.append(items if head == len(items) else items[:head])
+            items = items[head:]
+            offset = len(output_stack) - head
+        else:
+            offset = len(output_stack)
+        self.pending_articles += (index + offset for index in pending_articles)
+        output_stack += items
+
+    @staticmethod
+    def _flatten_(items: list[FormattingObject | list]) -> Iterator[FormattingObject]:
+        # segments may be nested as deeply as the blocks which produced them
+        stack = [iter(items)]
+        while stack:
+            for item in stack[-1]:
+                if type(item) is list:
+                    stack.append(iter(item))
+                    break
+                yield item
+            else:
+                stack.pop()
+
+    @classmethod
+    def _text_length_of_(cls, items: list[FormattingObject | list]) -> int:
+        length = 0
+        for item in cls._flatten_(items):
+            if type(item) is PlainText:
+                length += len(item.text)
+            elif type(item) is RopeText:
+                length += len(item.rope)
+        return length
 
     def _print_(self, text_object: PlainText):
         self._append_to_sentence_(text_object.text)
 
+    def _print_rope_(self, rope_text: RopeText):
+        rope = rope_text.rope
+        if not len(rope):
+            return
+        if self.current_strategy is not FormattingStrategy.NONE:
+            self._append_to_sentence_(str(rope))
+            return
+        # kept whole, to be joined with everything else in the end
+        self.sentence_parts.append(rope)
+        self.sentence_ropes = True
+        last = rope.last_character()
+        self.word_start = last.isspace()
+        if not self.word_start:
+            self.sentence_start = last in ".!?"
+        elif (visible := rope.last_character(visible=True)) is not None:
+            self.sentence_start = visible in ".!?"
+
     def _default_indefinite_article_(self, _: IndefiniteArticle):
         self._append_to_sentence_("a")
 
     def _append_to_sentence_(self, text: str):
+        if not text:
+            return
         match self.current_strategy:
             case FormattingStrategy.NONE:
-                self.sentence += text
+                pass
             case FormattingStrategy.UPPER:
-                self.sentence += text.upper()
+                text = text.upper()
             case FormattingStrategy.LOWER:
-                self.sentence += text.lower()
+                text = text.lower()
             case FormattingStrategy.SENTENCE:
-                self.sentence += self.apply_sentence_case(text)
+                text = self.apply_sentence_case(text)
             case FormattingStrategy.TITLE:
-                self.sentence += self.apply_title_case(text)
+                text = self.apply_title_case(text)
             case _:
                 raise TwaddleInterpreterException(
                     f"[Formatter.append] no handling defined for {self.current_strategy}"
                 )
+        self.sentence_parts.append(text)
+        last = text[-1]
+        self.word_start = last.isspace()
+        if not self.word_start:
+            self.sentence_start = last in ".!?"
+        elif visible := text.rstrip():
+            self.sentence_start = visible[-1] in ".!?"
+
+    def __iadd__(self, other: "Formatter") -> Self:
+        """Add the output of `other` to the end of this formatter's, with
+        the same result as appending each part of it in turn, without
+        copying it, so in constant time unless `append_formatter` left
+        articles in `other` waiting past words. `other` may be left sharing
+        its output with this formatter, so shouldn't be changed afterwards."""
+        if other.articles_passed:
+            # rare, so left to appending each part in turn to decide
+            for item in self._flatten_(other.output_stack):
+                self.append(item.rope if type(item) is RopeText else item)
+            return self
+        self._add_word_(other.first_word)
+        self._splice_(other.output_stack, other.pending_articles)
+        self.text_length += other.text_length
+        return self
 
-    def __iadd__(self, other):
-        for item in other.output_stack:
-            self.append(item)
+    def append_formatter(self, other: "Formatter") -> Self:
+        """Add the output of `other` as `+=` does, except that articles
+        already waiting here are left waiting for a word after it rather than
+        decided by the words in it, as for a block's separators and the
+        content before its first and last repetitions."""
+        if self.pending_articles:
+            self.articles_passed = self.articles_passed or other.first_word is not None
+        elif self.first_word is None:
+            self.first_word = other.first_word
+        self._splice_(other.output_stack, other.pending_articles)
+        self.text_length += other.text_length
         return self
 
+    def __copy__(self) -> "Formatter":
+        # a copy with lists of its own, so that merging either of them into
+        # another formatter leaves the other as it was; segments are never
+        # changed, so can be shared
+        copied = Formatter.__new__(Formatter)
+        copied.__dict__.update(self.__dict__)
+        copied.output_stack = list(self.output_stack)
+        copied.pending_articles = list(self.pending_articles)
+        return copied
+
     def resolve(self) -> str:
+        self._resolve_items_(self.output_stack)
+        result = self._joined_sentence_()
+        self._reset_()
+        return result
+
+    def resolve_rope(self) -> Rope:
+        """Resolve the output as `resolve` does, but leave it as a rope of
+        the pieces it's made of rather than joining them."""
+        self._resolve_items_(self.output_stack)
+        result = Rope(self.sentence_parts)
+        self._reset_()
+        return result
+
+    def _joined_sentence_(self) -> str:
+        if self.sentence_ropes:
+            return str(Rope(self.sentence_parts))
+        return "".join(self.sentence_parts)
+
+    def _resolve_items_(self, items: list[FormattingObject | list]):
+        # a fresh list, so that shallow copies of this formatter resolve into
+        # their own
+        self.sentence_parts = list[str | Rope]()
+        self.sentence_ropes = False
         function_dict = {
             PlainText: self._print_,
+            RopeText: self._print_rope_,
             StrategyChange: self._set_strategy_,
             IndefiniteArticle: self._default_indefinite_article_,
         }
-        for item in self.output_stack:
+        for item in self._flatten_(items):
             function_dict[type(item)](item)
-        result = self.sentence
-        self._reset_()
+
+    def _settled_length_(self) -> int:
+        # nothing appended later can change the output before the first
+        # article still waiting for a word to follow it
+        if self.pending_articles:
+            return self.pending_articles[0]
+        return len(self.output_stack)
+
+    def _remove_settled_(self, settled: int):
+        if not settled:
+            return
+        del self.output_stack[:settled]
+        self.pending_articles = [index - settled for index in self.pending_articles]
+        # no word can follow an article still waiting for one, so what's
+        # left has none
+        self.first_word = None
+
+    def move_settled(self, target: "Formatter"):
+        """Append the settled part of the output to `target`, as `+=` would,
+        and remove it from this formatter."""
+        settled = self._settled_length_()
+        if not settled:
+            return
+        unsettled_length = self._text_length_of_(self.output_stack[settled:])
+        moved_length = self.text_length - unsettled_length
+        target._add_word_(self.first_word)
+        target._splice_(self.output_stack[:settled], [])
+        target.text_length += moved_length
+        self.text_length = unsettled_length
+        self._remove_settled_(settled)
+
+    def resolve_settled(self, final: bool = False) -> str:
+        """Resolve the settled part of the output and remove it from this
+        formatter, returning the text resolved. If `final`, everything left
+        is resolved, as by `resolve`.
+
+        Case strategies carry on from one call to the next.
+        """
+        settled = len(self.output_stack) if final else self._settled_length_()
+        items = self.output_stack[:settled]
+        self._resolve_items_(items)
+        self._remove_settled_(settled)
+        self.text_length -= self._text_length_of_(items)
+        result = self._joined_sentence_()
+        if final:
+            self._reset_()
         return result
 
     def set_strategy(self, strategy: FormattingStrategy):
-        self.output_stack.append(StrategyChange(self._get_previous_object_(), strategy))
+        self.output_stack.append(self.strategy_changes[strategy])
 
     def _set_strategy_(self, strategy: StrategyChange):
         self.current_strategy = strategy.strategy
 
     def add_indefinite_article(self, default_upper=False):
-        previous = self._get_previous_object_()
-        self.output_stack.append(IndefiniteArticle(previous, default_upper))
-        self.indefinite_article_waiting = True
+        self.pending_articles.append(len(self.output_stack))
+        self.output_stack.append(IndefiniteArticle(default_upper))
 
-    def _replace_indefinite_articles(self, text: str):
-        next_word = self._find_alphabetic_string_(text)
-        if next_word is None:
-            return
+    def _replace_indefinite_articles(self, next_word: str):
         chosen_article = "an" if self._indefinite_article_use_an_(next_word) else "a"
-        self.output_stack = [
-            (
-                item
-                if not isinstance(item, IndefiniteArticle)
-                else self._convert_article(item, chosen_article)
+        output_stack = self.output_stack
+        for index in self.pending_articles:
+            output_stack[index] = self._convert_article(
+                output_stack[index], chosen_article
             )
-            for item in self.output_stack
-        ]
+        if self.first_word is None:
+            # the articles came before any other word
+            self.first_word = output_stack[self.pending_articles[0]].text
+        self.pending_articles = list[int]()
+        self.articles_passed = False
 
     def _convert_article(
         self, article: IndefiniteArticle, chosen_article: str
     ) -> PlainText:
         if article.default_upper:
             chosen_article = chosen_article.capitalize()
-        self.indefinite_article_waiting = False
-        result = PlainText(article.previous, chosen_article)
-        if article.next:
-            result.next = article.next
-            article.next.previous = result
-        return PlainText(article.previous, chosen_article)
+        self.text_length += len(chosen_article)
+        return self.articles[chosen_article]
 
     def _find_alphabetic_string_(self, text: str) -> str | None:
         result = self.alphabetic_regex.search(text)
@@ -208,31 +430,26 @@ class Formatter:
         # skip rest of evaluation if "I" is the total text content
         if text == "I":
             return text
-        result = str()
-        sentence_start = False
-        if not self.sentence or self.sentence.rstrip()[-1] in ".!?":
-            sentence_start = True
-        for char in text:
-            if not char.isalnum() and len(result) > 0:
-                if result[-2:] == " i":
-                    result = result[:-2] + " I"
-            if sentence_start:
-                result += char.upper()
-            else:
-                result += char.lower()
-            if not char.isspace():
-                sentence_start = char in ".!?"
-        return result
+        # every piece but the last ends a sentence, so begins the next
+        pieces = self.sentence_end_regex.split(text)
+        for index in range(0 if self.sentence_start else 1, len(pieces)):
+            piece = pieces[index]
+            words = piece.lstrip()
+            if words:
+                space = len(piece) - len(words)
+                pieces[index] = piece[:space] + words[0].upper() + words[1:].lower()
+        if not self.sentence_start:
+            pieces[0] = pieces[0].lower()
+        return self.lone_i_regex.sub("I", "".join(pieces))
 
     def apply_title_case(self, text: str) -> str:
-        result = str()
-        word_start = False
-        if not self.sentence or self.sentence[-1].isspace():
-            word_start = True
-        for char in text:
-            if word_start:
-                result += char.upper()
-            else:
-                result += char.lower()
-            word_start = True if char.isspace() else False
-        return result
+        # words and the whitespace between them take turns, starting with a
+        # word, which is empty if the text starts with whitespace
+        pieces = self.whitespace_regex.split(text)
+        for index in range(0 if self.word_start else 2, len(pieces), 2):
+            word = pieces[index]
+            if word:
+                pieces[index] = word[0].upper() + word[1:].lower()
+        if not self.word_start:
+            pieces[0] = pieces[0].lower()
+        return "".join(pieces)
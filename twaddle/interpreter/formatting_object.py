@@ -1,5 +1,6 @@
 from enum import Enum, auto
-from typing import Optional
+
+from twaddle.interpreter.rope import Rope
 
 
 class FormattingStrategy(Enum):
@@ -11,31 +12,34 @@ class FormattingStrategy(Enum):
 
 
 class FormattingObject:
-    def __init__(self, previous: Optional["FormattingObject"]):
-        self.previous = None
-        if previous is not None:
-            self.previous = previous
-            previous.next = self
-        self.next = None
+    # formatters hold one of these for every piece of output, so they're kept
+    # as small as they can be
+    __slots__ = ()
 
 
 class PlainText(FormattingObject):
-    def __init__(self, previous: Optional[FormattingObject], text: str):
-        FormattingObject.__init__(self, previous)
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
         self.text = text
 
 
 class StrategyChange(FormattingObject):
-    def __init__(
-        self, previous: Optional[FormattingObject], strategy: FormattingStrategy
-    ):
-        FormattingObject.__init__(self, previous)
+    __slots__ = ("strategy",)
+
+    def __init__(self, strategy: FormattingStrategy):
         self.strategy = strategy
 
 
 class IndefiniteArticle(FormattingObject):
-    def __init__(
-        self, previous: Optional[FormattingObject], default_upper_case: bool = False
-    ):
-        FormattingObject.__init__(self, previous)
+    __slots__ = ("default_upper",)
+
+    def __init__(self, default_upper_case: bool = False):
         self.default_upper = default_upper_case
+
+
+class RopeText(FormattingObject):
+    __slots__ = ("rope",)
+
+    def __init__(self, rope: Rope):
+        self.rope = rope
@@ -1,6 +1,5 @@
 from copy import copy as shallow_copy
 from math import prod
-from random import randint
 from typing import Optional
 
 from twaddle.exceptions import TwaddleFunctionException
@@ -310,6 +309,7 @@ def abbreviate(
         "Takes one argument, `case` (one of: none, upper, lower, sentence, title). "
         "Sets a casing style to be used until the next use of [case]"
     ),
+    pure=True,
 )
 @evaluate_args
 def case(
@@ -361,7 +361,7 @@ def match(
 @evaluate_args
 def rand(
     evaluated_args: list[str],
-    _context: TwaddleContext,
+    context: TwaddleContext,
     _interpreter: InterpreterDecoratorProtocol,
 ) -> str:
     if len(evaluated_args) != 2:
@@ -370,7 +370,7 @@ def rand(
         )
     minimum = int(evaluated_args[0])
     maximum = int(evaluated_args[1])
-    return str(randint(minimum, maximum))
+    return str(context.rng.randint(minimum, maximum))
 
 
 @FunctionRegistry.register(
@@ -507,6 +507,7 @@ def boolean_helper(evaluated_arg: str) -> bool:
     min_args=1,
     max_args=1,
     description="Takes one argument, `value`. Returns '1' if the value is truthy, '0' otherwise.",
+    pure=True,
 )
 @evaluate_args
 def boolean(
@@ -528,6 +529,7 @@ def boolean(
     min_args=2,
     max_args=2,
     description="Takes two arguments, `a` and `b`, which must both be numbers. Returns '1' if a < b, '0' otherwise.",
+    pure=True,
 )
 @evaluate_args
 def less_than(
@@ -549,6 +551,7 @@ def less_than(
     min_args=2,
     max_args=2,
     description="Takes two arguments, `a` and `b`, which must both be numbers. Returns '1' if a > b, '0' otherwise.",
+    pure=True,
 )
 @evaluate_args
 def greater_than(
@@ -573,6 +576,7 @@ def greater_than(
         "Takes two arguments, `a` and `b`. Returns '1' if a equals b, '0' otherwise. "
         "Compares numerically if both arguments interpretable as numbers, otherwise string comparison."
     ),
+    pure=True,
 )
 @evaluate_args
 def equal_to(
@@ -596,6 +600,7 @@ def equal_to(
     min_args=2,
     max_args=2,
     description="Takes two arguments, `a` and `b`. Returns '1' if both are truthy, '0' otherwise.",
+    pure=True,
 )
 @evaluate_args
 def logical_and(
@@ -616,6 +621,7 @@ def logical_and(
     min_args=1,
     max_args=1,
     description="Takes one argument, `value`. Returns '1' if the value is falsy, '0' otherwise.",
+    pure=True,
 )
 @evaluate_args
 def logical_not(
@@ -636,6 +642,7 @@ def logical_not(
     min_args=2,
     max_args=2,
     description="Takes two arguments, `a` and `b`. Returns '1' if either is truthy, '0' otherwise.",
+    pure=True,
 )
 @evaluate_args
 def logical_or(
@@ -656,6 +663,7 @@ def logical_or(
     min_args=2,
     max_args=2,
     description="Takes two arguments, `a` and `b`. Returns '1' if exactly one is truthy, '0' otherwise.",
+    pure=True,
 )
 @evaluate_args
 def logical_xor(
@@ -22,6 +22,9 @@ def evaluate_args(func):
         evaluated = [interpreter.evaluate(arg) for arg in args]
         return func(evaluated, context, interpreter, *rest, **kwargs)
 
+    # lets compiled templates evaluate the arguments inline and call `func`
+    # (as wrapper.__wrapped__) directly
+    wrapper.evaluates_args = True
     return wrapper
 
 
@@ -34,6 +37,7 @@ class FunctionEntry:
         max_args: Optional[int],
         description: str,
         handler: Callable,
+        pure: bool = False,
     ):
         self.name = name
         self.aliases = aliases if aliases else []
@@ -41,6 +45,7 @@ class FunctionEntry:
         self.max_args = max_args
         self.description = description
         self.handler = handler
+        self.pure = pure
 
 
 class FunctionRegistry:
@@ -73,7 +78,11 @@ class FunctionRegistry:
         min_args: int = 0,
         max_args: int = 0,
         description: str = "",
+        pure: bool = False,
     ):
+        # a pure function's result depends on nothing but its arguments, and
+        # it has no other effects, so it can be evaluated ahead of time when
+        # they are constant
         def decorator(func):
             entry = FunctionEntry(
                 name=name,
@@ -82,6 +91,7 @@ class FunctionRegistry:
                 max_args=max_args,
                 description=description,
                 handler=func,
+                pure=pure,
             )
             cls.add_function_entry(entry)
             return func
@@ -1,11 +1,16 @@
-from copy import copy
+import threading
+from contextlib import closing, contextmanager
+from copy import copy, deepcopy
 from functools import singledispatchmethod
-from random import randint, randrange
-from re import Match, sub
-from typing import Optional
+from pathlib import Path
+from re import Match
+from typing import Callable, Generator, Iterator, Optional
 
 from twaddle.exceptions import TwaddleInterpreterException
 from twaddle.interpreter.block_attributes import BlockAttributes
+from twaddle.interpreter.budget import BudgetTracker, ExecutionBudget
+from twaddle.interpreter.code_cache import DiskCodeCache
+from twaddle.interpreter.compiler import CompiledProgram, compile_tree
 from twaddle.interpreter.context import TwaddleContext
 from twaddle.interpreter.formatter import Formatter
 from twaddle.interpreter.function_definitions import boolean_helper
@@ -13,73 +18,61 @@ from twaddle.interpreter.function_registry import FunctionRegistry
 from twaddle.interpreter.interpreter_decorator_protocol import (
     InterpreterDecoratorProtocol,
 )
+from twaddle.interpreter.optimizer import OptimizerPasses, TreeOptimizer
+from twaddle.interpreter.parse_cache import DEFAULT_PARSE_CACHE_SIZE, ParseCache
+from twaddle.interpreter.random_source import (
+    DEFAULT_RNG_BACKEND,
+    RandomBackend,
+    RandomSource,
+    spawn_rng,
+)
 from twaddle.interpreter.synchronizer import Synchronizer
 from twaddle.lookup.lookup_dictionary import LookupDictionary
 from twaddle.lookup.lookup_manager import LookupManager
+from twaddle.parser.disk_cache import DiskParseCache
 from twaddle.parser.nodes import (
     BlockNode,
     DigitNode,
     FunctionNode,
     IndefiniteArticleNode,
     LookupNode,
+    Node,
     RegexNode,
     RootNode,
     TextNode,
 )
-from twaddle.parser.transformer import TwaddleTransformer
-from twaddle.parser.twaddle_parser import Lark_StandAlone as TwaddleParser
-from twaddle.parser.twaddle_parser import (
-    UnexpectedCharacters,
-    UnexpectedInput,
-    UnexpectedToken,
-)
+from twaddle.parser.parsing import is_plain_text, parse_sentence
+
+
+class _RootFrame:
+    """A RootNode being run by Interpreter._run_frames: its contents, how far
+    through them it has got and the output so far."""
+
+    __slots__ = ("contents", "index", "formatter")
 
-parser = TwaddleParser()
-transformer = TwaddleTransformer()
-
-TOKEN_NAMES = {
-    "MORETHAN": "'>'",
-    "LESSTHAN": "'<'",
-    "LBRACE": "'{'",
-    "RBRACE": "'}'",
-    "LSQB": "'['",
-    "RSQB": "']'",
-    "PIPE": "'|'",
-    "SEMICOLON": "';'",
-    "DOT": "'.'",
-    "MINUS": "'-'",
-    "BACKSLASH": "'\\'",
-    "FORWARD_SLASH": "'/'",
-    "COLON": "':'",
-    "TEXT": "text",
-    "NAME": "identifier",
-    "ESCAPED_CHAR": "escape character",
-    "LABEL_MODIFIER": "'!' or '^'",
-    "TAG_MODIFIER": "'!'",
-}
-
-# Examples for matching common parse errors to friendly messages
-PARSE_ERROR_EXAMPLES = {
-    "Unclosed block - missing '}'": [
-        "{a|b",
-        "{a|b|c",
-    ],
-    "Unclosed function - missing ']'": [
-        "[rep:3",
-        "[sync:name;locked",
-    ],
-    "Invalid function name: no whitespace allowed": [
-        "[function name]",
-    ],
-    "Invalid lookup - unclosed or invalid whitespace in identifier": [
-        "<noun",
-        "<noun-tag",
-        "<noun::=label",
-        "<verb.past",
-        "<noun::=a label>",
-        "<noun-some tag>",
-    ],
-}
+    def __init__(self, contents: list[Node]):
+        self.contents = contents
+        self.index = 0
+        self.formatter = Formatter()
+
+
+class _BlockFrame:
+    """A block being run by Interpreter._run_frames, with its repetitions
+    still to come."""
+
+    __slots__ = ("block", "attributes", "formatter", "steps")
+
+    def __init__(
+        self,
+        block: BlockNode,
+        attributes: BlockAttributes,
+        formatter: Formatter,
+        steps: Generator[Optional[RootNode], Optional[Formatter], None],
+    ):
+        self.block = block
+        self.attributes = attributes
+        self.formatter = formatter
+        self.steps = steps
 
 
 class Interpreter(InterpreterDecoratorProtocol):
@@ -91,63 +84,224 @@ class Interpreter(InterpreterDecoratorProtocol):
         persistent_patterns: bool = False,
         persistent_clipboard: bool = False,
         strict_mode: bool = False,
+        parse_cache_size: int = DEFAULT_PARSE_CACHE_SIZE,
+        parse_cache_dir: Optional[str | Path] = None,
+        code_cache_dir: Optional[str | Path] = None,
+        optimizations: Optional[OptimizerPasses] = None,
+        rng: Optional[RandomSource] = None,
+        rng_backend: RandomBackend = DEFAULT_RNG_BACKEND,
+        budget: Optional[ExecutionBudget] = None,
     ):
-        self.context = TwaddleContext(
-            persistent_clipboard=persistent_clipboard,
-            persistent_labels=persistent_labels,
-            persistent_patterns=persistent_patterns,
-            persistent_synchronizers=persistent_synchronizers,
-            strict_mode=strict_mode,
-            lookup_manager=lookup_manager,
+        self.optimizer = TreeOptimizer(optimizations)
+        self.parse_cache = ParseCache(parse_cache_size)
+        self.disk_cache = (
+            DiskParseCache(parse_cache_dir) if parse_cache_dir is not None else None
+        )
+        self.code_cache = (
+            DiskCodeCache(code_cache_dir) if code_cache_dir is not None else None
         )
-        self.context.saved_patterns = dict[str, RootNode]()
-        self.context.copied_blocks = dict[str, Formatter]()
+        self.lookup_manager = lookup_manager
+        self.persistent_labels = persistent_labels
+        self.persistent_synchronizers = persistent_synchronizers
+        self.persistent_patterns = persistent_patterns
+        self.persistent_clipboard = persistent_clipboard
+        self.strict_mode = strict_mode
+        self.budget = budget
+        # the first thread to use the interpreter draws from this; others
+        # draw from streams spawned from a stream of its own, seeded from a
+        # copy of the first, so that neither creating nor spawning from it
+        # disturbs the first
+        self.rng_backend = rng_backend
+        self.rng = rng if rng is not None else rng_backend(None)
+        self._spawner = spawn_rng(deepcopy(self.rng), rng_backend)
+        self._rng_taken = False
+        self._rng_lock = threading.Lock()
+        self._local = threading.local()
+        # looking up a singledispatchmethod builds a new wrapper each time
+        self._run_node = self.run_node
+
+    @property
+    def context(self) -> TwaddleContext:
+        """The context of the calling thread, so that threads sharing an
+        interpreter each have their own labels, synchronizers, saved
+        patterns, copied blocks and random stream."""
+        try:
+            return self._local.context
+        except AttributeError:
+            context = self._local.context = self.new_context()
+            return context
+
+    def new_context(self) -> TwaddleContext:
+        with self._rng_lock:
+            if self._rng_taken:
+                rng = spawn_rng(self._spawner, self.rng_backend)
+            else:
+                rng = self.rng
+                self._rng_taken = True
+        return TwaddleContext(
+            persistent_clipboard=self.persistent_clipboard,
+            persistent_labels=self.persistent_labels,
+            persistent_patterns=self.persistent_patterns,
+            persistent_synchronizers=self.persistent_synchronizers,
+            strict_mode=self.strict_mode,
+            lookup_manager=self.lookup_manager,
+            rng=rng,
+            budget=BudgetTracker(self.budget) if self.budget is not None else None,
+        )
+
+    def spawn_rng(self) -> RandomSource:
+        """A new random stream, independent of every other this interpreter
+        uses."""
+        with self._rng_lock:
+            return spawn_rng(self._spawner, self.rng_backend)
+
+    @contextmanager
+    def seeded(self, seed: Optional[int | str]) -> Iterator[None]:
+        """Make the calling thread draw from a new stream seeded with `seed`
+        inside the block, then carry on with its own stream where it left
+        off. Does nothing if `seed` is None."""
+        if seed is None:
+            yield
+            return
+        rng = self.rng_backend(seed)
+        try:
+            with self.using_rng(rng):
+                yield
+        finally:
+            self.release_rng(rng)
+
+    @contextmanager
+    def using_rng(self, rng: RandomSource) -> Iterator[None]:
+        """Make the calling thread draw from `rng` inside the block, then
+        carry on with its own stream where it left off."""
+        context = self.context
+        previous = context.rng
+        context.rng = rng
+        try:
+            yield
+        finally:
+            context.rng = previous
+
+    def release_rng(self, rng: RandomSource) -> None:
+        """Move the calling thread's synchronizers which draw from `rng` to
+        its own stream, once `rng` is finished with, so that persistent ones
+        created while it was in use don't keep drawing from it."""
+        context = self.context
+        for synchronizer in context.synchronizers.values():
+            if synchronizer.rng is rng:
+                synchronizer.rng = context.rng
 
     def interpret_external(self, sentence: str) -> str:
+        return self.interpret_tree(self.parse(sentence))
+
+    def interpret_tree(self, tree: RootNode) -> str:
         self.context.reset_for_new_sentence()
-        try:
-            tree = parser.parse(sentence)
-            transformed_tree = transformer.transform(tree)
-        except UnexpectedInput as err:
-            raise TwaddleInterpreterException(self._format_parse_error(err, sentence))
-        return self.interpret_internal(transformed_tree)
-
-    def _format_parse_error(self, err: UnexpectedInput, sentence: str) -> str:
-        context = err.get_context(sentence)
-
-        # Try to match against known error patterns first
-        label = err.match_examples(parser.parse, PARSE_ERROR_EXAMPLES)
-        if label:
-            return f"{label}\n{context}"
-
-        # Fall back to generic message based on exception type
-        if isinstance(err, UnexpectedToken):
-            token = err.token
-            if token.type == "$END":
-                msg = "Unexpected end of input"
+        return self.interpret_internal(tree)
+
+    def stream_tree(self, tree: RootNode) -> Iterator[str]:
+        """Run a tree as `interpret_tree` does, yielding its output in pieces
+        as soon as nothing later in the sentence can change them.
+
+        Output is produced after each node at the top level of the tree,
+        and after each repetition of a block there, unless the block is
+        hidden, reversed, abbreviated or copied, which needs all of its
+        output at once.
+        """
+        self.context.reset_for_new_sentence()
+        budget = self.context.budget
+        if budget is not None:
+            budget.step(len(tree.contents))
+        formatter = Formatter()
+        produced = 0
+        for node in tree.contents:
+            if isinstance(node, BlockNode):
+                steps = self._stream_block(node, formatter)
             else:
-                msg = f"Unexpected '{token.value}'"
-            expected = [e for e in err.expected if not e.startswith("_")]
-            if expected:
-                friendly = [TOKEN_NAMES.get(e, e) for e in expected]
-                msg += f" (expected: {', '.join(friendly)})"
-        elif isinstance(err, UnexpectedCharacters):
-            msg = f"Unexpected character '{err.char}'"
-            if err.allowed:
-                friendly = [TOKEN_NAMES.get(e, e) for e in err.allowed]
-                msg += f" (allowed: {', '.join(friendly)})"
-        else:
-            msg = "Parse error"
-        return f"{msg}\n{context}\nSee the documentation at https://chrishengler.github.io/twaddle/ for help"
+                formatter += self.run(node)
+                steps = (None,)
+            for _ in steps:
+                if budget is not None:
+                    budget.check_output(produced + formatter.text_length)
+                if text := formatter.resolve_settled():
+                    produced += len(text)
+                    yield text
+        if text := formatter.resolve_settled(final=True):
+            yield text
 
-    def interpret_internal(self, parse_result: RootNode) -> str:
+    def _stream_block(self, block: BlockNode, out: Formatter) -> Iterator[None]:
+        """Run a block into `out`, yielding whenever more of its output has
+        been added there."""
         formatter = Formatter()
-        for obj in parse_result.contents:
-            resulting_formatter = self.run(obj)
-            if resulting_formatter:
-                formatter += resulting_formatter
-        result = formatter.resolve()
-        return result
+        attributes = self._take_block_attributes()
+        streaming = not (
+            attributes.hidden
+            or attributes.reverse
+            or attributes.abbreviate
+            or attributes.copy_as
+        )
+        with closing(self._block_repetitions(block, attributes, formatter)) as steps:
+            result = None
+            while True:
+                try:
+                    request = steps.send(result)
+                except StopIteration:
+                    break
+                if request is not None:
+                    result = self.run(request)
+                    continue
+                result = None
+                if streaming:
+                    formatter.move_settled(out)
+                    yield
+        out += self._finish_block(block, attributes, formatter)
+        yield
+
+    def compile(self, tree: RootNode) -> CompiledProgram:
+        return compile_tree(tree, self.code_cache)
+
+    def interpret_program(self, program: CompiledProgram) -> str:
+        self.context.reset_for_new_sentence()
+        return self._resolve(program.bind(self)())
+
+    def interpret_program_many(
+        self, program: CompiledProgram, n: int, reset_between: bool = True
+    ) -> Iterator[str]:
+        """Run a compiled program `n` times, yielding each output in turn.
+
+        Each run starts as a new sentence would, except that if
+        `reset_between` is False, labels and synchronizers are only reset
+        before the first run and carry on from one run to the next.
+        """
+        for index in range(n):
+            self.context.reset_for_new_sentence(reset_between or index == 0)
+            yield self._resolve(program.bind(self)())
+
+    def parse(self, sentence: str) -> RootNode:
+        if is_plain_text(sentence):
+            # cheaper to split again than to cache, and would only push
+            # sentences with real markup out of the caches; there is nothing
+            # to optimize that would make it run faster than that costs
+            return parse_sentence(sentence)
+        if (cached := self.parse_cache.get(sentence)) is not None:
+            return cached
+        if self.disk_cache is None:
+            transformed_tree = parse_sentence(sentence)
+        elif (transformed_tree := self.disk_cache.get(sentence)) is None:
+            transformed_tree = parse_sentence(sentence)
+            self.disk_cache.put(sentence, transformed_tree)
+        # trees on disk are kept unoptimized, as interpreters sharing the
+        # directory may run different passes
+        transformed_tree = self.optimizer.optimize(transformed_tree)
+        self.parse_cache.put(sentence, transformed_tree)
+        return transformed_tree
+
+    def interpret_internal(self, parse_result: RootNode) -> str:
+        return self._resolve(self.run(parse_result))
+
+    def _resolve(self, formatter: Formatter) -> str:
+        if self.budget is not None:
+            self.context.budget.check_output(formatter.text_length)
+        return formatter.resolve()
 
     def _get_synchronizer_for_block(
         self, attributes: BlockAttributes, num_choices: int
@@ -180,71 +334,242 @@ class Interpreter(InterpreterDecoratorProtocol):
         # need evaluated rather than raw args
         return self.run(root).resolve()
 
+    def run(self, node: Optional[Node]) -> Formatter:
+        """Run a node, returning its output.
+
+        Blocks and RootNodes are run from an explicit stack of frames rather
+        than by recursion, so that however deeply they are nested, running
+        them takes no more of Python's stack. Functions which run their own
+        arguments, such as `[if]`, still do so by calling `evaluate`.
+        """
+        if type(node) is RootNode or type(node) is BlockNode:
+            return self._run_frames(node)
+        return self._run_node(node)
+
+    def _run_frames(self, node: RootNode | BlockNode) -> Formatter:
+        budget = self.context.budget if self.budget is not None else None
+        stack = [self._frame(node, budget)]
+        # the output of the frame last finished, for the one below it
+        result: Optional[Formatter] = None
+        try:
+            while True:
+                frame = stack[-1]
+                if type(frame) is _RootFrame:
+                    result = self._step_root_frame(frame, result, stack, budget)
+                else:
+                    result = self._step_block_frame(frame, result, stack, budget)
+                if not stack:
+                    return result
+        finally:
+            # if anything went wrong, the blocks left waiting are closed now,
+            # rather than whenever they are collected
+            for frame in stack:
+                if type(frame) is _BlockFrame:
+                    frame.steps.close()
+
+    def _step_root_frame(
+        self,
+        frame: "_RootFrame",
+        result: Optional[Formatter],
+        stack: list,
+        budget: Optional[BudgetTracker],
+    ) -> Optional[Formatter]:
+        # run the contents of a RootNode up to the next block or RootNode,
+        # pushing a frame for it, or to the end, popping the frame and
+        # returning its output
+        formatter = frame.formatter
+        if result is not None:
+            formatter += result
+        run_node = self._run_node
+        contents = frame.contents
+        while frame.index < len(contents):
+            child = contents[frame.index]
+            frame.index += 1
+            kind = type(child)
+            if kind is TextNode:
+                formatter.append(child.text)
+            elif kind is RootNode or kind is BlockNode:
+                stack.append(self._frame(child, budget))
+                return None
+            else:
+                formatter += run_node(child)
+        stack.pop()
+        return formatter
+
+    def _step_block_frame(
+        self,
+        frame: "_BlockFrame",
+        result: Optional[Formatter],
+        stack: list,
+        budget: Optional[BudgetTracker],
+    ) -> Optional[Formatter]:
+        # send a block the output it asked for, pushing a frame for the next
+        # thing it asks to have run, or popping the frame and returning its
+        # output once it's finished
+        try:
+            request = frame.steps.send(result)
+        except StopIteration:
+            stack.pop()
+            return self._finish_block(frame.block, frame.attributes, frame.formatter)
+        if request is not None:
+            stack.append(self._frame(request, budget))
+        return None
+
+    def _frame(
+        self, node: RootNode | BlockNode, budget: Optional[BudgetTracker]
+    ) -> "_RootFrame | _BlockFrame":
+        if type(node) is BlockNode:
+            formatter = Formatter()
+            attributes = self._take_block_attributes()
+            steps = self._block_repetitions(node, attributes, formatter)
+            return _BlockFrame(node, attributes, formatter, steps)
+        if budget is not None:
+            budget.step(len(node.contents))
+        return _RootFrame(node.contents)
+
     # noinspection PyUnusedLocal
     @singledispatchmethod
-    def run(self, _arg: None) -> Formatter:
+    def run_node(self, _arg: None) -> Formatter:
         formatter = Formatter()
         return formatter
 
-    @run.register(RootNode)
-    def _(self, root: RootNode):
-        formatter = Formatter()
-        for item in root.contents:
-            item_result = self.run(item)
-            if item_result:
-                formatter += item_result
-        return formatter
+    @run_node.register(RootNode)
+    @run_node.register(BlockNode)
+    def _(self, node: RootNode | BlockNode):
+        return self._run_frames(node)
 
-    @run.register(BlockNode)
-    def _(self, block: BlockNode):
+    def run_block(
+        self, block: BlockNode, run: Callable[[RootNode], Formatter]
+    ) -> Formatter:
+        """Run a block under the pending block attributes, using `run` to
+        evaluate its chosen choices and any other content, such as
+        separators, set by the attributes."""
         formatter = Formatter()
+        attributes = self._take_block_attributes()
+        with closing(self._block_repetitions(block, attributes, formatter)) as steps:
+            result = None
+            while True:
+                try:
+                    request = steps.send(result)
+                except StopIteration:
+                    break
+                result = run(request) if request is not None else None
+        return self._finish_block(block, attributes, formatter)
+
+    def _take_block_attributes(self) -> BlockAttributes:
         attributes: BlockAttributes = self.context.consume_block_attributes()
         if attributes.repetitions > 1 and attributes.while_predicate:
             raise TwaddleInterpreterException(
                 "Cannot apply repeat and while to same block "
                 "(try nesting [while] inside [repeat]-ed block if this was intentional)."
             )
-        first_repetition = True
         if attributes.repetitions and (attributes.repetitions < 2):
             attributes.separator = None
             attributes.first = None
             attributes.last = None
+        return attributes
+
+    def _block_repetitions(
+        self,
+        block: BlockNode,
+        attributes: BlockAttributes,
+        formatter: Formatter,
+    ) -> Generator[Optional[RootNode], Optional[Formatter], None]:
+        """Run each repetition of a block into `formatter`.
+
+        Rather than running any content itself, this yields each RootNode it
+        needs run, whether a chosen choice or content such as a separator set
+        by the attributes, and must be sent back its output, leaving whoever
+        is driving it to decide how to run it. It also yields None after each
+        repetition, and must be sent None back.
+        """
+        first_repetition = True
         synchronizer = self._get_synchronizer_for_block(attributes, len(block.choices))
+        budget = self._enter_block_budget()
+        try:
+            while (yield from self._repeat_again(attributes)):
+                self._step_block_budget(budget)
+                choice = self._choose(block, synchronizer)
+                if (
+                    before := self._before_repetition(attributes, first_repetition)
+                ) is not None:
+                    formatter.append_formatter((yield before))
+                first_repetition = False
+                attributes.repetitions = attributes.repetitions - 1
+                formatter += yield block.choices[choice]
+                if attributes.repetitions > 1 and attributes.separator:
+                    formatter.append_formatter((yield attributes.separator))
+                self._check_block_budget(budget, formatter)
+                yield None
+        finally:
+            self._leave_block_budget(budget)
+
+    def _enter_block_budget(self) -> Optional[BudgetTracker]:
+        # the budget a block's repetitions count against, if there is one,
+        # with the block counted towards its depth
+        budget = self.context.budget if self.budget is not None else None
+        if budget is not None:
+            budget.enter()
+        return budget
+
+    @staticmethod
+    def _step_block_budget(budget: Optional[BudgetTracker]):
+        if budget is not None:
+            budget.step()
 
-        def _continue():
-            if attributes.while_predicate:
-                attributes.while_iteration += 1
-                if attributes.while_iteration > attributes.max_while_iterations:
-                    return False
-                return boolean_helper(self.run(attributes.while_predicate).resolve())
-            if attributes.repetitions > 0:
-                return True
+    @staticmethod
+    def _check_block_budget(budget: Optional[BudgetTracker], formatter: Formatter):
+        if budget is not None:
+            budget.check_output(formatter.text_length)
+
+    @staticmethod
+    def _leave_block_budget(budget: Optional[BudgetTracker]):
+        if budget is not None:
+            budget.leave()
+
+    def _choose(self, block: BlockNode, synchronizer: Optional[Synchronizer]) -> int:
+        # the index of the choice to run for a repetition of a block
+        if synchronizer is None:
+            if len(block.choices) > 1:
+                return self.context.rng.randrange(len(block.choices))
+            return 0
+        choice = synchronizer.next()
+        if choice >= len(block.choices):
+            raise TwaddleInterpreterException(
+                f"[Interpreter.run](RantBlockObject) tried to get item no. {choice} of {len(block.choices)} -"
+                "when using synchronizers, make sure you have the same number of choices each time"
+            )
+        return choice
+
+    @staticmethod
+    def _repeat_again(
+        attributes: BlockAttributes,
+    ) -> Generator[Optional[RootNode], Optional[Formatter], bool]:
+        # whether a block should be repeated again, yielding its while
+        # predicate, if it has one, to be run
+        if not attributes.while_predicate:
+            return attributes.repetitions > 0
+        attributes.while_iteration += 1
+        if attributes.while_iteration > attributes.max_while_iterations:
             return False
+        predicate = yield attributes.while_predicate
+        return boolean_helper(predicate.resolve())
 
-        while _continue():
-            if synchronizer is None:
-                choice = randrange(0, len(block.choices))
-            else:
-                choice = synchronizer.next()
-                if choice >= len(block.choices):
-                    raise TwaddleInterpreterException(
-                        f"[Interpreter.run](RantBlockObject) tried to get item no. {choice} of {len(block.choices)} -"
-                        "when using synchronizers, make sure you have the same number of choices each time"
-                    )
-            if first_repetition and attributes.first:
-                first_repetition = False
-                formatter.append_formatter(self.run(attributes.first))
-            elif attributes.repetitions == 1:
-                if attributes.last:
-                    formatter.append_formatter(self.run(attributes.last))
-                elif attributes.separator:
-                    formatter.append_formatter(self.run(attributes.separator))
-            attributes.repetitions = attributes.repetitions - 1
-            partial_result = self.run(block.choices[choice])
-            formatter += partial_result
-            if attributes.repetitions > 1 and attributes.separator:
-                formatter.append_formatter(self.run(attributes.separator))
+    @staticmethod
+    def _before_repetition(
+        attributes: BlockAttributes, first_repetition: bool
+    ) -> Optional[RootNode]:
+        # what comes before a repetition of a block: its first content for the
+        # first repetition, or its last or a separator for the last
+        if first_repetition and attributes.first:
+            return attributes.first
+        if attributes.repetitions == 1:
+            return attributes.last or attributes.separator or None
+        return None
 
+    def _finish_block(
+        self, block: BlockNode, attributes: BlockAttributes, formatter: Formatter
+    ) -> Formatter:
         if name := attributes.save_as:
             self._save_pattern(block, name)
         if name := attributes.copy_as:
@@ -252,8 +577,7 @@ class Interpreter(InterpreterDecoratorProtocol):
         if attributes.hidden:
             return Formatter()
         if attributes.reverse:
-            block_result = formatter.resolve()
-            formatter = Formatter.from_text("".join(reversed(block_result)))
+            formatter = Formatter.from_rope(formatter.resolve_rope().reversed())
         if attributes.abbreviate:
             abbreviation = self._get_abbreviation(formatter, attributes)
             formatter = Formatter.from_text(abbreviation)
@@ -290,7 +614,7 @@ class Interpreter(InterpreterDecoratorProtocol):
     def _save_pattern(self, block: BlockNode, name: str):
         self.context.saved_patterns[name] = RootNode(contents=[block])
 
-    @run.register(FunctionNode)
+    @run_node.register(FunctionNode)
     def _(self, func: FunctionNode):
         formatter = Formatter()
         if func.func in FunctionRegistry.function_lookup:
@@ -303,30 +627,38 @@ class Interpreter(InterpreterDecoratorProtocol):
             )
         return formatter
 
-    @run.register(TextNode)
+    @run_node.register(TextNode)
     def _(self, text: TextNode):
         return Formatter.from_text(text.text)
 
-    @run.register(LookupNode)
+    @run_node.register(LookupNode)
     def _(self, lookup: LookupNode):
         formatter = Formatter()
-        dictionary: LookupDictionary = self.context.lookup_manager[lookup.dictionary]
-        formatter.append(dictionary.get(lookup, self.context.strict_mode))
+        context = self.context
+        dictionary: LookupDictionary = context.lookup_manager[lookup.dictionary]
+        formatter.append(
+            dictionary.get(
+                lookup,
+                context.strict_mode,
+                context.labels_for(lookup.dictionary),
+                context.rng,
+            )
+        )
         return formatter
 
     # noinspection SpellCheckingInspection
-    @run.register(IndefiniteArticleNode)
+    @run_node.register(IndefiniteArticleNode)
     def _(self, indef: IndefiniteArticleNode):
         formatter = Formatter()
         formatter.add_indefinite_article(indef.default_upper)
         return formatter
 
     # noinspection PyUnusedLocal
-    @run.register(DigitNode)
+    @run_node.register(DigitNode)
     def _(self, digit: DigitNode):
-        return Formatter.from_text(str(randint(0, 9)))
+        return Formatter.from_text(str(self.context.rng.randint(0, 9)))
 
-    @run.register(RegexNode)
+    @run_node.register(RegexNode)
     def _(self, regex: RegexNode):
         # noinspection SpellCheckingInspection
 
@@ -334,6 +666,6 @@ class Interpreter(InterpreterDecoratorProtocol):
             self.context.current_regex_match = matchobj.group()
             return self.run(regex.replacement).resolve()
 
-        return Formatter.from_text(
-            sub(regex.regex, repl, self.run(regex.scope).resolve())
+        return Formatter.from_rope(
+            self.run(regex.scope).resolve_rope().sub(regex.regex, repl)
         )
@@ -0,0 +1,452 @@
+import threading
+from dataclasses import dataclass, field, fields
+from typing import Callable, Iterator, Optional
+
+from twaddle.exceptions import TwaddleException
+from twaddle.interpreter.context import TwaddleContext
+from twaddle.interpreter.formatter import Formatter
+from twaddle.interpreter.function_registry import FunctionRegistry
+from twaddle.parser.nodes import (
+    BlockNode,
+    FunctionNode,
+    IndefiniteArticleNode,
+    LookupNode,
+    Node,
+    RegexNode,
+    RootNode,
+    TextNode,
+)
+
+# functions which, though not pure, never set block attributes, so that
+# running one (with arguments which don't either) leaves the next block
+# unaffected; the arithmetic functions read the block's max_decimals, so
+# can't be evaluated ahead of time
+ATTRIBUTE_FREE_FUNCTIONS = frozenset(
+    {"add", "divide", "if", "match", "multiply", "paste", "rand", "subtract"}
+)
+# functions whose arguments are stored as block attributes and run inside the
+# next block, between it taking its attributes and running its chosen choice
+ATTRIBUTE_CONTENT_FUNCTIONS = frozenset({"first", "last", "separator", "while"})
+# nodes whose output can include indefinite articles
+ARTICLE_NODES = (IndefiniteArticleNode, LookupNode, BlockNode, RootNode)
+
+
+@dataclass(frozen=True)
+class OptimizerPasses:
+    """Which of the optimization passes to run, in the order they run."""
+
+    inline_blocks: bool = True
+    flatten_roots: bool = True
+    fold_constants: bool = True
+    merge_text: bool = True
+
+
+@dataclass(frozen=True)
+class OptimizationReport:
+    trees: int
+    nodes_before: int
+    nodes_after: int
+    removed_by_pass: dict[str, int]
+
+    @property
+    def nodes_removed(self) -> int:
+        return self.nodes_before - self.nodes_after
+
+
+@dataclass(frozen=True)
+class TreeFacts:
+    """What the passes need to know about a tree as a whole."""
+
+    # whether block attributes are clear when a block's choice starts, unless
+    # an earlier repetition of the block left them
+    clean_choices: bool
+    # whether the tree changes case anywhere, making text chunks significant
+    uses_case: bool
+    # sets_block_attributes for each node asked about so far, by id, with
+    # the node itself so that its id can't be reused while the tree is
+    # being optimized
+    attribute_setters: dict[int, tuple[Node, bool]] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+
+def function_name(node: FunctionNode) -> Optional[str]:
+    entry = FunctionRegistry.function_lookup.get(node.func)
+    return entry.name if entry is not None else None
+
+
+def is_attribute_free(node: FunctionNode) -> bool:
+    entry = FunctionRegistry.function_lookup.get(node.func)
+    return entry is not None and (entry.pure or entry.name in ATTRIBUTE_FREE_FUNCTIONS)
+
+
+def child_roots(node: Node) -> list[RootNode]:
+    match node:
+        case BlockNode(choices=choices):
+            return choices
+        case FunctionNode(args=args):
+            return args
+        case RegexNode(scope=scope, replacement=replacement):
+            return [scope, replacement]
+        case RootNode():
+            return [node]
+    return []
+
+
+def children(node: Node) -> list[Node]:
+    if isinstance(node, RootNode):
+        return node.contents
+    return child_roots(node)
+
+
+def walk(node: Node) -> Iterator[Node]:
+    """Every node in the tree below `node`, and `node` itself, parents before
+    their children. Trees are walked with an explicit stack, as they may be
+    nested too deeply to recurse through."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(children(node)))
+
+
+def count_nodes(node: Node) -> int:
+    return sum(1 for _ in walk(node))
+
+
+def function_nodes(node: Node) -> Iterator[FunctionNode]:
+    return (child for child in walk(node) if isinstance(child, FunctionNode))
+
+
+def sets_block_attributes(
+    node: Node, known: Optional[dict[int, tuple[Node, bool]]] = None
+) -> bool:
+    """Whether running `node` could leave block attributes for the next block.
+
+    If `known` is given, answers already in it are used, and answers for
+    `node` and everything below it are added, so that asking about each
+    block in a deeply nested tree in turn doesn't take quadratic time."""
+    if known is None:
+        known = {}
+    elif (answer := known.get(id(node))) is not None:
+        return answer[1]
+    # children before their parents, skipping anything already known
+    order = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if id(current) not in known:
+            order.append(current)
+            stack.extend(children(current))
+    for current in reversed(order):
+        sets = (
+            isinstance(current, FunctionNode) and not is_attribute_free(current)
+        ) or any(known[id(child)][1] for child in children(current))
+        known[id(current)] = (current, sets)
+    return known[id(node)][1]
+
+
+def tree_facts(tree: RootNode) -> TreeFacts:
+    functions = [(function_name(node), node) for node in function_nodes(tree)]
+    known: dict[int, tuple[Node, bool]] = {}
+    return TreeFacts(
+        clean_choices=not any(
+            name in ATTRIBUTE_CONTENT_FUNCTIONS
+            and any(sets_block_attributes(arg, known) for arg in node.args)
+            for name, node in functions
+        ),
+        uses_case=any(name == "case" for name, _ in functions),
+        attribute_setters=known,
+    )
+
+
+def can_splice(contents: list[Node]) -> bool:
+    """Whether running `contents` straight into the enclosing formatter gives
+    the same output as running them in a formatter of their own and adding
+    that in, as happens for a RootNode or a block.
+
+    The two only differ when an indefinite article is waiting as `contents`
+    start and they end up choosing an article before any word: on its own,
+    that article chooses the waiting one too, while spliced in, the word
+    after both would.
+    """
+    if (
+        contents
+        and isinstance(contents[0], TextNode)
+        and Formatter.alphabetic_regex.search(contents[0].text)
+    ):
+        return True
+    return not any(isinstance(node, ARTICLE_NODES) for node in contents)
+
+
+def joins_words(left: str, right: str) -> bool:
+    return bool(
+        left and right and Formatter.alphabetic_regex.fullmatch(left[-1] + right[0])
+    )
+
+
+class ConstantEvaluator:
+    """Stands in for the interpreter when a call is evaluated ahead of time,
+    for arguments which are only text."""
+
+    def evaluate(self, root: RootNode) -> str:
+        return "".join(node.text for node in root.contents)
+
+
+def is_foldable(node: FunctionNode) -> bool:
+    """Whether `node` is a call fold_constants might replace."""
+    entry = FunctionRegistry.function_lookup.get(node.func)
+    return (
+        entry is not None
+        and entry.pure
+        and all(isinstance(n, TextNode) for arg in node.args for n in arg.contents)
+    )
+
+
+# returned by evaluate_constant_call for a call it can't evaluate
+NOT_CONSTANT = object()
+
+
+def evaluate_constant_call(node: FunctionNode) -> object:
+    """The result of a call to a pure function whose arguments are only text,
+    or NOT_CONSTANT. Calls which would fail are left to fail when run."""
+    if not is_foldable(node):
+        return NOT_CONSTANT
+    try:
+        return FunctionRegistry.handle(
+            node.func, node.args, TwaddleContext(), ConstantEvaluator()
+        )
+    except TwaddleException:
+        return NOT_CONSTANT
+
+
+def scan_tree(tree: RootNode) -> tuple[int, set[str]]:
+    """The number of nodes in a tree and the names of the passes which might
+    rewrite something in it, found in a single walk, so that a tree with
+    nothing to rewrite costs no more than that."""
+    nodes = 0
+    candidates = set()
+    stack = [tree]
+    while stack:
+        root = stack.pop()
+        nodes += 1
+        previous = None
+        for node in root.contents:
+            if isinstance(node, RootNode):
+                # counted when its own contents are
+                candidates.add("flatten_roots")
+            else:
+                nodes += 1
+            if isinstance(node, TextNode) and isinstance(previous, TextNode):
+                candidates.add("merge_text")
+            elif isinstance(node, BlockNode) and len(node.choices) == 1:
+                candidates.add("inline_blocks")
+            elif isinstance(node, FunctionNode) and is_foldable(node):
+                candidates.add("fold_constants")
+            stack.extend(child_roots(node))
+            previous = node
+    return nodes, candidates
+
+
+# a pass rewrites one list of contents, whose own RootNodes have already been
+# rewritten, given whether block attributes are known to be clear as it starts
+Pass = Callable[[list[Node], bool, TreeFacts], list[Node]]
+
+
+def inline_blocks(contents: list[Node], clean: bool, facts: TreeFacts) -> list[Node]:
+    """Replace single-choice blocks with the contents of their choice, where
+    the block runs without attributes and so would just run that choice."""
+    result = []
+    for node in contents:
+        if (
+            clean
+            and isinstance(node, BlockNode)
+            and len(node.choices) == 1
+            and can_splice(node.choices[0].contents)
+        ):
+            result.extend(node.choices[0].contents)
+        else:
+            result.append(node)
+        if isinstance(node, BlockNode):
+            # a block takes any waiting attributes, but then runs content
+            # which might set more
+            clean = facts.clean_choices and not sets_block_attributes(
+                node, facts.attribute_setters
+            )
+        elif sets_block_attributes(node, facts.attribute_setters):
+            clean = False
+    return result
+
+
+def flatten_roots(contents: list[Node], _clean: bool, _facts: TreeFacts) -> list[Node]:
+    """Replace RootNodes within contents with their own contents."""
+    result = []
+    for node in contents:
+        if isinstance(node, RootNode) and can_splice(node.contents):
+            result.extend(node.contents)
+        else:
+            result.append(node)
+    return result
+
+
+def fold_constants(contents: list[Node], _clean: bool, _facts: TreeFacts) -> list[Node]:
+    """Replace calls to pure functions whose arguments are only text with the
+    text they return. Arguments are rewritten first, so nested calls fold
+    from the inside out."""
+    result = []
+    for node in contents:
+        if not isinstance(node, FunctionNode):
+            result.append(node)
+        elif isinstance(value := evaluate_constant_call(node), str):
+            if value:
+                result.append(TextNode(value))
+        elif value is not None:
+            # NOT_CONSTANT, or a result with no node to stand for it, such as
+            # a case; None is just dropped, as it adds nothing to the output
+            result.append(node)
+    return result
+
+
+def merge_text(contents: list[Node], _clean: bool, facts: TreeFacts) -> list[Node]:
+    """Join adjacent TextNodes into one.
+
+    Articles are chosen by the first word of a piece of text, so text isn't
+    joined where that would make one word out of two. Sentence case treats
+    each piece of text separately, so nothing is joined in a tree which might
+    use it.
+    """
+    if facts.uses_case:
+        return contents
+    result: list[Node] = []
+    for node in contents:
+        if (
+            isinstance(node, TextNode)
+            and result
+            and isinstance(previous := result[-1], TextNode)
+            and not joins_words(previous.text, node.text)
+        ):
+            result[-1] = TextNode(previous.text + node.text)
+        else:
+            result.append(node)
+    return result
+
+
+PASSES: dict[str, Pass] = {
+    "inline_blocks": inline_blocks,
+    "flatten_roots": flatten_roots,
+    "fold_constants": fold_constants,
+    "merge_text": merge_text,
+}
+
+
+def apply_pass(
+    root: RootNode, rewrite: Pass, clean: bool, facts: TreeFacts
+) -> RootNode:
+    """Rewrite the contents of every RootNode in the tree with `rewrite`,
+    innermost first. The tree is rebuilt with an explicit stack, as it may be
+    nested too deeply to recurse through."""
+    # each entry is a node, whether it starts clean if it is a RootNode, the
+    # RootNodes within it and whether each starts clean, and those rebuilt
+    stack = [(root, clean, rebuild_parts(root, facts), [])]
+    while True:
+        node, clean, parts, rebuilt = stack[-1]
+        if len(rebuilt) < len(parts):
+            part, part_clean = parts[len(rebuilt)]
+            part_parts = rebuild_parts(part, facts)
+            if part_parts or isinstance(part, RootNode):
+                stack.append((part, part_clean, part_parts, []))
+            else:
+                rebuilt.append(part)
+            continue
+        stack.pop()
+        match node:
+            case RootNode():
+                result = RootNode(rewrite(rebuilt, clean, facts))
+            case BlockNode():
+                result = BlockNode(rebuilt)
+            case FunctionNode(func=func):
+                result = FunctionNode(func, rebuilt)
+            case RegexNode(regex=regex):
+                result = RegexNode(regex, *rebuilt)
+        if not stack:
+            return result
+        stack[-1][3].append(result)
+
+
+def rebuild_parts(node: Node, facts: TreeFacts) -> list[tuple[Node, bool]]:
+    """What apply_pass rebuilds `node` from, with whether each part runs
+    with block attributes known to be clear."""
+    match node:
+        case RootNode(contents=contents):
+            return [(child, False) for child in contents]
+        case BlockNode(choices=choices):
+            clean = facts.clean_choices and not sets_block_attributes(
+                node, facts.attribute_setters
+            )
+            return [(choice, clean) for choice in choices]
+        case FunctionNode(args=args):
+            # arguments run whenever the function chooses, perhaps while
+            # attributes are waiting for the next block
+            return [(arg, False) for arg in args]
+        case RegexNode(scope=scope, replacement=replacement):
+            return [(scope, False), (replacement, False)]
+    return []
+
+
+class TreeOptimizer:
+    """Simplifies transformed parse trees before they are interpreted, without
+    changing what they output.
+
+    Each pass enabled in `passes` runs over the whole tree in turn, and the
+    number of nodes each removes is counted, for `report`.
+    """
+
+    def __init__(self, passes: Optional[OptimizerPasses] = None):
+        self.passes = passes if passes is not None else OptimizerPasses()
+        self.enabled = [
+            (field.name, PASSES[field.name])
+            for field in fields(self.passes)
+            if getattr(self.passes, field.name)
+        ]
+        self.trees = 0
+        self.nodes_before = 0
+        self.nodes_after = 0
+        self.removed_by_pass = {field.name: 0 for field in fields(self.passes)}
+        # only the counts are shared; trees are optimized outside the lock
+        self._counts_lock = threading.Lock()
+
+    def optimize(self, tree: RootNode) -> RootNode:
+        if not self.enabled:
+            return tree
+        nodes, candidates = scan_tree(tree)
+        nodes_before = nodes
+        facts = None
+        removed = {}
+        for name, rewrite in self.enabled:
+            if name not in candidates:
+                # would only rebuild the same tree
+                continue
+            if facts is None:
+                facts = tree_facts(tree)
+            # the top level of a tree runs straight after the attributes
+            # are cleared for a new sentence
+            tree = apply_pass(tree, rewrite, True, facts)
+            remaining, candidates = scan_tree(tree)
+            removed[name] = nodes - remaining
+            nodes = remaining
+        with self._counts_lock:
+            self.trees += 1
+            self.nodes_before += nodes_before
+            self.nodes_after += nodes
+            for name, count in removed.items():
+                self.removed_by_pass[name] += count
+        return tree
+
+    def report(self) -> OptimizationReport:
+        with self._counts_lock:
+            return OptimizationReport(
+                trees=self.trees,
+                nodes_before=self.nodes_before,
+                nodes_after=self.nodes_after,
+                removed_by_pass=dict(self.removed_by_pass),
+            )
@@ -0,0 +1,74 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from twaddle.parser.nodes import RootNode
+
+DEFAULT_PARSE_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class ParseCacheInfo:
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ParseCache:
+    """Bounded LRU cache of transformed parse trees, keyed by sentence text.
+
+    A `maxsize` of 0 disables the cache: nothing is stored, and every lookup
+    counts as a miss. The cache can be shared between threads.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_PARSE_CACHE_SIZE):
+        if maxsize < 0:
+            raise ValueError(f"parse cache size must not be negative, got {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._trees = OrderedDict[str, RootNode]()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def get(self, sentence: str) -> Optional[RootNode]:
+        with self._lock:
+            tree = self._trees.get(sentence)
+            if tree is None:
+                self.misses += 1
+                return None
+            self._trees.move_to_end(sentence)
+            self.hits += 1
+            return tree
+
+    def put(self, sentence: str, tree: RootNode):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._trees[sentence] = tree
+            self._trees.move_to_end(sentence)
+            while len(self._trees) > self.maxsize:
+                self._trees.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._trees.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> ParseCacheInfo:
+        with self._lock:
+            return ParseCacheInfo(
+                hits=self.hits,
+                misses=self.misses,
+                maxsize=self.maxsize,
+                currsize=len(self._trees),
+            )
+
+    def __len__(self) -> int:
+        return len(self._trees)
@@ -0,0 +1,143 @@
+from abc import abstractmethod
+from random import Random
+from typing import Any, Callable, MutableSequence, Optional, Protocol, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# bounds up to this are drawn from buffers of single bytes
+MAX_BUFFERED_BOUND = 256
+INITIAL_BUFFER_SIZE = 64
+MAX_BUFFER_SIZE = 4096
+
+
+class RandomSource(Protocol):
+    """The methods Twaddle uses to make random choices, which
+    `random.Random` provides."""
+
+    @abstractmethod
+    def randrange(self, start: int, stop: Optional[int] = None, step: int = 1) -> int:
+        pass
+
+    @abstractmethod
+    def randint(self, a: int, b: int) -> int:
+        pass
+
+    @abstractmethod
+    def choice(self, seq: Sequence[T]) -> T:
+        pass
+
+    @abstractmethod
+    def shuffle(self, x: MutableSequence[Any]) -> None:
+        pass
+
+    @abstractmethod
+    def getrandbits(self, k: int) -> int:
+        pass
+
+
+# creates a source from a seed, or from the operating system if given None
+RandomBackend = Callable[[Optional[int | str]], RandomSource]
+
+
+def _byte_tables(bound: int) -> tuple[bytes, bytes]:
+    # each byte maps to its remainder, except those above the largest
+    # multiple of the bound, which are deleted so that no result is more
+    # likely than another
+    limit = MAX_BUFFERED_BOUND - MAX_BUFFERED_BOUND % bound
+    return bytes(b % bound for b in range(256)), bytes(range(limit, 256))
+
+
+BYTE_TABLES = [None] + [_byte_tables(n) for n in range(1, MAX_BUFFERED_BOUND + 1)]
+
+
+class BufferedRandom(Random):
+    """A `random.Random` which draws numbers below small bounds, as used to
+    pick a block's choice, a digit or a dictionary entry, from buffers filled
+    in bulk, rather than generating each one separately.
+
+    There is a buffer for each bound up to 256, filled from random bytes
+    with those which would bias the results thrown away, so every result is
+    equally likely. Buffers grow as they are used, so that a stream only
+    used for a few draws stays cheap to create. Larger bounds, and
+    everything else, are left to `random.Random`.
+    """
+
+    def seed(self, a=None, version: int = 2):
+        super().seed(a, version)
+        self._draws: dict[int, Any] = {}
+        self._buffer_sizes: dict[int, int] = {}
+
+    def getstate(self) -> tuple:
+        remaining = {bound: bytes(draws) for bound, draws in self._draws.items()}
+        self._draws = {bound: iter(draws) for bound, draws in remaining.items()}
+        return super().getstate(), remaining, dict(self._buffer_sizes)
+
+    def setstate(self, state: tuple):
+        base, remaining, buffer_sizes = state
+        super().setstate(base)
+        self._draws = {bound: iter(draws) for bound, draws in remaining.items()}
+        self._buffer_sizes = dict(buffer_sizes)
+
+    def _refill(self, bound: int) -> int:
+        size = self._buffer_sizes.get(bound, INITIAL_BUFFER_SIZE)
+        self._buffer_sizes[bound] = min(size * 2, MAX_BUFFER_SIZE)
+        table, rejected = BYTE_TABLES[bound]
+        draws = iter(self.randbytes(size).translate(table, rejected))
+        self._draws[bound] = draws
+        for value in draws:
+            return value
+        # every byte was rejected, which is vanishingly unlikely
+        return self._refill(bound)
+
+    def _below(self, bound: int) -> int:
+        try:
+            return next(self._draws[bound])
+        except (KeyError, StopIteration):
+            if 0 < bound <= MAX_BUFFERED_BOUND:
+                return self._refill(bound)
+            return self._randbelow(bound)
+
+    def randrange(self, start: int, stop: Optional[int] = None, step: int = 1) -> int:
+        if stop is None:
+            # the common case, inlined
+            try:
+                return next(self._draws[start])
+            except (KeyError, StopIteration):
+                if type(start) is int and 0 < start <= MAX_BUFFERED_BOUND:
+                    return self._refill(start)
+        elif step == 1 and type(start) is int and type(stop) is int and stop > start:
+            return start + self._below(stop - start)
+        return super().randrange(start, stop, step)
+
+    def randint(self, a: int, b: int) -> int:
+        try:
+            return a + next(self._draws[b - a + 1])
+        except (KeyError, StopIteration):
+            if type(a) is int and type(b) is int and b >= a:
+                return a + self._below(b - a + 1)
+        return super().randint(a, b)
+
+    def choice(self, seq: Sequence[T]) -> T:
+        try:
+            return seq[next(self._draws[len(seq)])]
+        except (KeyError, StopIteration):
+            if not len(seq):
+                raise IndexError("Cannot choose from an empty sequence")
+            return seq[self._below(len(seq))]
+
+    def shuffle(self, x: MutableSequence[Any]) -> None:
+        below = self._below
+        for i in reversed(range(1, len(x))):
+            j = below(i + 1)
+            x[i], x[j] = x[j], x[i]
+
+
+DEFAULT_RNG_BACKEND: RandomBackend = BufferedRandom
+
+
+def spawn_rng(
+    rng: RandomSource, backend: RandomBackend = DEFAULT_RNG_BACKEND
+) -> RandomSource:
+    """A new random stream seeded from `rng`, independent of it from then on.
+    Spawning from a seeded stream gives the same children every time."""
+    return backend(rng.getrandbits(128))
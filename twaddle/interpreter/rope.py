@@ -0,0 +1,197 @@
+import re
+from typing import Callable, Iterable, Iterator, Match, Optional, Union
+
+
+class Rope:
+    """Text held as the pieces it was built from, which may themselves be
+    ropes, and joined into a single string only when asked for with `str`.
+
+    Reversing or slicing a rope gives a new rope sharing the pieces of the
+    first, so large output can be reversed, sliced and searched without
+    being copied each time.
+    """
+
+    __slots__ = ("pieces", "length", "reverse", "flat", "head", "tail")
+
+    # how many characters from either end of a rope are kept with it, so that
+    # its first word and last character can be found without walking it
+    end_length = 64
+
+    # regex for finding next alphabetic string, as Formatter finds it
+    alphabetic_regex = re.compile(r"[^\W_]+", re.UNICODE)
+    # the alphabetic characters at the start of a piece
+    leading_alphabetic_regex = re.compile(r"^[^\W_]+", re.UNICODE)
+
+    def __init__(
+        self,
+        pieces: Iterable[Union[str, "Rope"]] = (),
+        reverse: bool = False,
+        length: Optional[int] = None,
+    ):
+        self.pieces = list(pieces)
+        self.length = sum(map(len, self.pieces)) if length is None else length
+        self.reverse = reverse
+        # whether every piece is a string, so the rope can be joined as it is
+        self.flat = all(type(piece) is str for piece in self.pieces)
+        if reverse:
+            self.head = self._end(self.pieces, backwards=True)[::-1]
+            self.tail = self._end(self.pieces, backwards=False)[::-1]
+        else:
+            self.head = self._end(self.pieces, backwards=False)
+            self.tail = self._end(self.pieces, backwards=True)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield the text of the rope in pieces, in order."""
+        for piece, reverse in self._walk(backwards=False):
+            yield piece[::-1] if reverse else piece
+
+    def __str__(self) -> str:
+        if self.flat:
+            text = "".join(self.pieces)
+            return text[::-1] if self.reverse else text
+        return "".join(self)
+
+    def __repr__(self) -> str:
+        return f"Rope({str(self)!r})"
+
+    def _walk(self, backwards: bool) -> Iterator[tuple[str, bool]]:
+        # each string in the rope, in the order they come in its text or the
+        # opposite order if `backwards`, with whether its characters run
+        # backwards in the text; ropes may be nested as deeply as the output
+        # they were built from, so are walked with a stack of their own;
+        # ropes only of strings are joined as they're reached, rather than
+        # walked a piece at a time
+        stack = [(self._ordered(self.pieces, self.reverse != backwards), self.reverse)]
+        while stack:
+            pieces, reverse = stack[-1]
+            for piece in pieces:
+                if type(piece) is Rope:
+                    inner = reverse != piece.reverse
+                    if piece.flat:
+                        if piece.length:
+                            yield "".join(piece.pieces), inner
+                        continue
+                    stack.append(
+                        (self._ordered(piece.pieces, inner != backwards), inner)
+                    )
+                    break
+                if piece:
+                    yield piece, reverse
+            else:
+                stack.pop()
+
+    @classmethod
+    def _end(cls, pieces: list, backwards: bool) -> str:
+        # the first (or last, if `backwards`) characters of the pieces, from
+        # those kept with any ropes among them
+        taken = list[str]()
+        wanted = cls.end_length
+        for piece in reversed(pieces) if backwards else pieces:
+            if type(piece) is Rope:
+                piece = piece.tail if backwards else piece.head
+            if not piece:
+                continue
+            taken.append(piece[-wanted:] if backwards else piece[:wanted])
+            wanted -= len(taken[-1])
+            if not wanted:
+                break
+        return "".join(reversed(taken) if backwards else taken)
+
+    @staticmethod
+    def _ordered(pieces: list, reverse: bool) -> Iterator:
+        return reversed(pieces) if reverse else iter(pieces)
+
+    def reversed(self) -> "Rope":
+        return Rope((self,), reverse=True, length=self.length)
+
+    def __getitem__(self, index: slice) -> "Rope":
+        start, stop, step = index.indices(self.length)
+        if step != 1:
+            raise ValueError("ropes can only be sliced with a step of 1")
+        return Rope(self._between(list(self), start, stop))
+
+    @staticmethod
+    def _between(pieces: list[str], start: int, stop: int) -> list[str]:
+        # the pieces making up the text from start to stop; pieces wholly
+        # within it are used as they are, so only those at either end of it
+        # are copied
+        taken = list[str]()
+        offset = 0
+        for piece in pieces:
+            end = offset + len(piece)
+            if end > start and offset < stop:
+                if start <= offset and end <= stop:
+                    taken.append(piece)
+                else:
+                    cut_start, cut_stop = max(start - offset, 0), stop - offset
+                    taken.append(piece[cut_start:cut_stop])
+            if end >= stop:
+                break
+            offset = end
+        return taken
+
+    def sub(
+        self, pattern: str, repl: Callable[[Match[str]], Union[str, "Rope"]]
+    ) -> "Rope":
+        """Replace matches of `pattern` as `re.sub` would, giving a rope of
+        the text between the matches and their replacements."""
+        # a regex needs a single string to search, which costs nothing if
+        # there's only one piece
+        text = str(self)
+        result = list[Union[str, Rope]]()
+        ropes = False
+        last = 0
+        for match in re.finditer(pattern, text):
+            start = match.start()
+            result.append(text[last:start])
+            replacement = repl(match)
+            ropes = ropes or type(replacement) is Rope
+            result.append(replacement)
+            last = match.end()
+        result.append(text[last:])
+        if not ropes:
+            # as cheap to join now as later, and saves keeping every piece
+            return Rope(("".join(result),))
+        return Rope(result)
+
+    def first_word(self) -> Optional[str]:
+        """The first run of alphabetic characters, even if it runs across
+        pieces; as it's only needed to choose an article, a word running on
+        past the characters kept from the start of the rope is cut short
+        there if enough of it has been found."""
+        match = self.alphabetic_regex.search(self.head)
+        if len(self.head) == self.length:
+            return match[0] if match else None
+        if match is not None and (
+            match.end() < len(self.head) or len(match[0]) >= self.end_length // 2
+        ):
+            return match[0]
+        word = list[str]()
+        for piece in self:
+            if word:
+                match = self.leading_alphabetic_regex.match(piece)
+            else:
+                match = self.alphabetic_regex.search(piece)
+            if match is None:
+                if word:
+                    break
+                continue
+            word.append(match[0])
+            if match.end() < len(piece):
+                break
+        return "".join(word) or None
+
+    def last_character(self, visible: bool = False) -> Optional[str]:
+        """The last character, or if `visible` the last which isn't
+        whitespace, or None if there's no such character."""
+        tail = self.tail.rstrip() if visible else self.tail
+        if tail or len(self.tail) == self.length:
+            return tail[-1] if tail else None
+        for piece, reverse in self._walk(backwards=True):
+            for char in piece if reverse else reversed(piece):
+                if not visible or not char.isspace():
+                    return char
+        return None
@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
-from random import randrange, shuffle
+from typing import Optional
+
+from twaddle.interpreter.random_source import DEFAULT_RNG_BACKEND, RandomSource
 
 
 class Synchronizer(ABC):
-    def __init__(self, num_choices: int):
+    def __init__(self, num_choices: int, rng: Optional[RandomSource] = None):
         self.num_choices = num_choices
+        self.rng = rng if rng is not None else DEFAULT_RNG_BACKEND(None)
 
     @abstractmethod
     def next(self) -> int:
@@ -12,24 +15,24 @@ class Synchronizer(ABC):
 
 
 class LockedSynchronizer(Synchronizer):
-    def __init__(self, num_choices: int):
-        super().__init__(num_choices)
-        self.pick = randrange(0, num_choices)
+    def __init__(self, num_choices: int, rng: Optional[RandomSource] = None):
+        super().__init__(num_choices, rng)
+        self.pick = self.rng.randrange(0, num_choices)
 
     def next(self) -> int:
         return self.pick
 
 
 class DeckSynchronizer(Synchronizer):
-    def __init__(self, num_choices: int):
-        super().__init__(num_choices)
+    def __init__(self, num_choices: int, rng: Optional[RandomSource] = None):
+        super().__init__(num_choices, rng)
         self.num_choices = num_choices
         self.deck = list()
         self.shuffle_deck()
 
     def shuffle_deck(self):
         self.deck = list(range(0, self.num_choices))
-        shuffle(self.deck)
+        self.rng.shuffle(self.deck)
 
     def next(self) -> int:
         if len(self.deck) == 0:
@@ -38,8 +41,8 @@ class DeckSynchronizer(Synchronizer):
 
 
 class CyclicDeckSynchronizer(Synchronizer):
-    def __init__(self, num_choices: int):
-        super().__init__(num_choices)
+    def __init__(self, num_choices: int, rng: Optional[RandomSource] = None):
+        super().__init__(num_choices, rng)
         self.num_choices = num_choices
         self.deck = list()
         self.shuffle_deck()
@@ -47,7 +50,7 @@ class CyclicDeckSynchronizer(Synchronizer):
 
     def shuffle_deck(self):
         self.deck = list(range(0, self.num_choices))
-        shuffle(self.deck)
+        self.rng.shuffle(self.deck)
 
     def next(self) -> int:
         self.pos = self.pos + 1
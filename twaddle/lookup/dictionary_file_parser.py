@@ -39,6 +39,8 @@ class DictionaryFileParser:
                     # so we can't reach here if forms is None
                     assert forms is not None
                     DictionaryFileParser._read_line(line, forms, classes, dictionary)
+            if dictionary is not None:
+                dictionary.freeze()
             return dictionary
 
     @staticmethod
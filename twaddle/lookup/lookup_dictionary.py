@@ -1,13 +1,21 @@
 from collections import OrderedDict
-from random import choice
 from typing import Optional
 
 from twaddle.exceptions import TwaddleLookupException
+from twaddle.interpreter.random_source import DEFAULT_RNG_BACKEND, RandomSource
 from twaddle.lookup.lookup_entry import DictionaryEntry
 from twaddle.parser.nodes import IndefiniteArticleNode, LookupNode
 
+# chooses entries for callers which don't give a random source of their own
+DEFAULT_RNG = DEFAULT_RNG_BACKEND(None)
+
 
 class LookupDictionary:
+    """The entries of one dictionary, which are added while it is read and
+    can't be changed once it is frozen. A frozen dictionary can be shared by
+    any number of runners and threads, as everything that changes during a
+    sentence, such as labels, is kept by the caller."""
+
     special_tokens = {
         "{a}": IndefiniteArticleNode(False),
         "{A}": IndefiniteArticleNode(True),
@@ -15,12 +23,32 @@ class LookupDictionary:
 
     def __init__(self, name: str, forms: list[str]):
         self.name = name
-        self.forms = forms
-        self.entries: list[DictionaryEntry] = []
-        self.labels: dict[str, DictionaryEntry] = {}
-        self.tags: list[str] = []
+        self.forms: list[str] | tuple[str, ...] = forms
+        self.entries: list[DictionaryEntry] | tuple[DictionaryEntry, ...] = []
+        self.tags: list[str] | tuple[str, ...] = []
+        self.frozen = False
+
+    def __setattr__(self, name: str, value):
+        if getattr(self, "frozen", False):
+            raise TwaddleLookupException(
+                f"[LookupDictionary.__setattr__] dictionary '{self.name}' is read-only"
+            )
+        super().__setattr__(name, value)
+
+    def freeze(self):
+        """Make the dictionary read-only."""
+        if self.frozen:
+            return
+        self.forms = tuple(self.forms)
+        self.entries = tuple(self.entries)
+        self.tags = tuple(self.tags)
+        self.frozen = True
 
     def add(self, forms: list[str], tags: set[str] | None = None):
+        if self.frozen:
+            raise TwaddleLookupException(
+                f"[LookupDictionary.add] dictionary '{self.name}' is read-only"
+            )
         if len(forms) != len(self.forms):
             raise TwaddleLookupException(
                 "[LookupDictionary.add] wrong number of forms provided"
@@ -32,9 +60,6 @@ class LookupDictionary:
                     self.tags.append(tag)
         self.entries.append(entry)
 
-    def clear_labels(self):
-        self.labels = {}
-
     def _get_form(self, form: str | None) -> str:
         if form is None:
             form = self.forms[0]
@@ -53,11 +78,11 @@ class LookupDictionary:
                     "[LookupDictionary._valid_choices_for_strictness_level] "
                     f"no valid choices for strict mode lookup in dictionary '{self.name}'"
                 )
-            valid_choices = self.entries.copy()
+            valid_choices = list(self.entries)
         return valid_choices
 
     def _get_valid_choices(
-        self, lookup: LookupNode, strict: bool
+        self, lookup: LookupNode, strict: bool, labels: dict[str, DictionaryEntry]
     ) -> list[DictionaryEntry]:
         valid_choices: list[DictionaryEntry] = []
         for entry in self.entries:
@@ -65,32 +90,47 @@ class LookupDictionary:
                 continue
             if not lookup.positive_tags or entry.has_all_tags(lookup.positive_tags):
                 valid_choices.append(entry)
-        valid_choices = self._prune_valid_choices(valid_choices, lookup.negative_labels)
+        valid_choices = self._prune_valid_choices(
+            valid_choices, lookup.negative_labels, labels
+        )
         valid_choices = self._valid_choices_for_strictness_level(valid_choices, strict)
         return valid_choices
 
     def _prune_valid_choices(
-        self, valid_choices: list[DictionaryEntry], labels_negative: set[str]
+        self,
+        valid_choices: list[DictionaryEntry],
+        labels_negative: set[str],
+        labels: dict[str, DictionaryEntry],
     ) -> list[DictionaryEntry]:
         if labels_negative:
             for label in labels_negative:
-                if label in self.labels and self.labels[label] in valid_choices:
-                    valid_choices.remove(self.labels[label])
+                if label in labels and labels[label] in valid_choices:
+                    valid_choices.remove(labels[label])
         return valid_choices
 
-    def _get(self, lookup: LookupNode, strict: bool = False) -> str:
+    def _get(
+        self,
+        lookup: LookupNode,
+        strict: bool = False,
+        labels: Optional[dict[str, DictionaryEntry]] = None,
+        rng: Optional[RandomSource] = None,
+    ) -> str:
+        if labels is None:
+            labels = {}
+        if rng is None:
+            rng = DEFAULT_RNG
         form = self._get_form(lookup.form)
-        if lookup.positive_label and lookup.positive_label in self.labels:
-            return self.labels[lookup.positive_label][form]
+        if lookup.positive_label and lookup.positive_label in labels:
+            return labels[lookup.positive_label][form]
 
-        valid_choices = self._get_valid_choices(lookup, strict)
+        valid_choices = self._get_valid_choices(lookup, strict, labels)
 
-        chosen_entry = choice(valid_choices)
+        chosen_entry = rng.choice(valid_choices)
         if lookup.redefine_labels:
             for label in lookup.redefine_labels:
-                self.labels[label] = chosen_entry
+                labels[label] = chosen_entry
         elif lookup.positive_label:
-            self.labels[lookup.positive_label] = chosen_entry
+            labels[lookup.positive_label] = chosen_entry
         return chosen_entry[form]
 
     def _strict_class_validation(self, lookup: LookupNode):
@@ -108,25 +148,39 @@ class LookupDictionary:
                     f"for dictionary '{self.name}' in strict mode"
                 )
 
-    def _strict_label_validation(self, lookup: LookupNode):
+    def _strict_label_validation(
+        self, lookup: LookupNode, labels: dict[str, DictionaryEntry]
+    ):
         if lookup.negative_labels:
             for label in lookup.negative_labels:
-                if label not in self.labels:
+                if label not in labels:
                     raise TwaddleLookupException(
                         "[LookupDictionary._strict_label_validation] Requested antimatch of label "
                         f"'{label}', not defined for dictionary '{self.name}'"
                     )
 
-    def _validate_strict_mode(self, lookup: LookupNode):
+    def _validate_strict_mode(
+        self, lookup: LookupNode, labels: dict[str, DictionaryEntry]
+    ):
         self._strict_class_validation(lookup)
-        self._strict_label_validation(lookup)
+        self._strict_label_validation(lookup, labels)
 
     def get(
-        self, lookup: LookupNode, strict: bool = False
+        self,
+        lookup: LookupNode,
+        strict: bool = False,
+        labels: Optional[dict[str, DictionaryEntry]] = None,
+        rng: Optional[RandomSource] = None,
     ) -> str | IndefiniteArticleNode:
+        """Look up an entry for `lookup`, chosen with `rng`, or a stream shared
+        by every caller without one. Labels are read from and stored in
+        `labels`, which belongs to the caller, as the dictionary itself is
+        shared; without it, no labels are kept from one lookup to the next."""
+        if labels is None:
+            labels = {}
         if strict:
-            self._validate_strict_mode(lookup)
-        result = self._get(lookup, strict)
+            self._validate_strict_mode(lookup, labels)
+        result = self._get(lookup, strict, labels, rng)
         if result in self.special_tokens:
             return self.special_tokens[result]
         return result
@@ -136,6 +190,6 @@ class LookupDictionary:
             return None
         return {
             "name": self.name,
-            "forms": self.forms,
+            "forms": list(self.forms),
             "example": {form: self.entries[0][form] for form in self.forms},
         }
@@ -1,10 +1,15 @@
 from collections import OrderedDict
+from types import MappingProxyType
 
 
 class DictionaryEntry:
+    __slots__ = ("forms", "tags")
+
     def __init__(self, forms: OrderedDict[str, str], tags: set[str] = None):
-        self.forms = forms
-        self.tags = tags
+        # read-only views, as entries are shared by every runner using the
+        # dictionary
+        self.forms = MappingProxyType(forms)
+        self.tags = frozenset(tags) if tags is not None else None
 
     def __getitem__(self, form: str):
         return self.forms[form]
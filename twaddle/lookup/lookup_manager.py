@@ -8,6 +8,9 @@ from twaddle.lookup.lookup_dictionary import LookupDictionary
 class LookupManager:
     def __init__(self):
         self.dictionaries = dict[str, LookupDictionary]()
+        # incremented whenever a dictionary is added, so that anything holding
+        # on to dictionaries can tell when to look them up again
+        self.generation = 0
 
     def __getitem__(self, name: str) -> LookupDictionary:
         if dictionary := self.dictionaries.get(name):
@@ -31,7 +34,4 @@ class LookupManager:
                 "Are name and forms defined?"
             )
         self.dictionaries[new_dictionary.name] = new_dictionary
-
-    def clear_labels(self):
-        for dictionary in self.dictionaries.values():
-            dictionary.clear_labels()
+        self.generation += 1
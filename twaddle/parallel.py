@@ -0,0 +1,180 @@
+import os
+import secrets
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from twaddle.compiled_template import CompiledTemplate
+from twaddle.parser.parsing import parse_sentence
+from twaddle.runner import TwaddleRunner
+
+DEFAULT_CHUNK_SIZE = 100
+
+# the runner belonging to a worker process, created once by _start_worker
+_worker_runner: Optional[TwaddleRunner] = None
+
+
+@dataclass(frozen=True)
+class WorkUnit:
+    """`count` results of `sentence`, generated from a random stream seeded
+    with `seed`. The same unit always gives the same results, whichever
+    worker runs it."""
+
+    sentence: str
+    count: int
+    seed: str
+
+
+def _start_worker(path: str | Path, runner_options: dict[str, Any]):
+    global _worker_runner
+    _worker_runner = TwaddleRunner(path, **runner_options)
+
+
+@lru_cache(maxsize=64)
+def _compiled(sentence: str) -> CompiledTemplate:
+    return _worker_runner.compile(sentence)
+
+
+def _run_unit(unit: WorkUnit) -> list[str]:
+    template = _compiled(unit.sentence)
+    # nothing left behind by whichever unit this worker ran last may change
+    # the results
+    _worker_runner.clear()
+    interpreter = _worker_runner.interpreter
+    with interpreter.seeded(unit.seed):
+        return list(interpreter.interpret_program_many(template.program, unit.count))
+
+
+def split_work(
+    sentence: str, n: int, seed: int | str, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> list[WorkUnit]:
+    """Split `n` results of `sentence` into units of at most `chunk_size`,
+    each seeded from `seed` and its position."""
+    if n < 0:
+        raise ValueError(f"number of sentences must not be negative, got {n}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    return [
+        WorkUnit(sentence, min(chunk_size, n - start), f"{seed}:{index}")
+        for index, start in enumerate(range(0, n, chunk_size))
+    ]
+
+
+class ParallelTwaddleRunner:
+    """Generates many sentences at once in a pool of worker processes.
+
+    Each worker creates its own TwaddleRunner with the dictionaries in `path`
+    and `runner_options` when it starts, and keeps it for every unit of work
+    it is given. The work is split into units whose size doesn't depend on
+    the number of workers, and each unit is seeded separately, so a given
+    seed gives the same results however many workers there are.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        **runner_options: Any,
+    ):
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        # enough submitted to keep every worker busy without holding the
+        # whole of a large batch in memory
+        self.max_pending = 2 * self.workers
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_start_worker,
+            initargs=(path, runner_options),
+        )
+
+    def run_sentence_many(
+        self, sentence: str, n: int, seed: Optional[int | str] = None
+    ) -> list[str]:
+        return list(self.iter_sentence_many(sentence, n, seed))
+
+    def iter_sentence_many(
+        self,
+        sentence: str,
+        n: int,
+        seed: Optional[int | str] = None,
+        ordered: bool = True,
+    ) -> Iterator[str]:
+        """Generate `n` results of `sentence`. If `ordered` is False, each
+        unit's results are yielded as soon as it is finished, rather than in
+        the order they would be with ordered output."""
+        if seed is None:
+            seed = secrets.randbits(64)
+        units = split_work(sentence, n, seed, self.chunk_size)
+        # parsed here so that parse errors are raised straight away, rather
+        # than from a worker
+        parse_sentence(sentence)
+        return chain.from_iterable(
+            results for _, results in self.run_units(units, ordered)
+        )
+
+    def run_units(
+        self, units: Iterable[WorkUnit], ordered: bool = True
+    ) -> Iterator[tuple[WorkUnit, list[str]]]:
+        """Run each unit in the pool, yielding it with its results in the
+        order given or, if `ordered` is False, as each is finished."""
+        if ordered:
+            return self._run_in_order(units)
+        return self._run_as_completed(units)
+
+    def _run_in_order(
+        self, units: Iterable[WorkUnit]
+    ) -> Iterator[tuple[WorkUnit, list[str]]]:
+        running: deque[tuple[WorkUnit, Future]] = deque()
+        try:
+            for unit in units:
+                running.append((unit, self.pool.submit(_run_unit, unit)))
+                if len(running) >= self.max_pending:
+                    unit, future = running.popleft()
+                    yield unit, future.result()
+            while running:
+                unit, future = running.popleft()
+                yield unit, future.result()
+        finally:
+            for _, future in running:
+                future.cancel()
+
+    def _run_as_completed(
+        self, units: Iterable[WorkUnit]
+    ) -> Iterator[tuple[WorkUnit, list[str]]]:
+        running: dict[Future, WorkUnit] = {}
+        try:
+            for unit in units:
+                running[self.pool.submit(_run_unit, unit)] = unit
+                if len(running) >= self.max_pending:
+                    yield from self._finished(running)
+            while running:
+                yield from self._finished(running)
+        finally:
+            for future in running:
+                future.cancel()
+
+    @staticmethod
+    def _finished(
+        running: dict[Future, WorkUnit],
+    ) -> Iterator[tuple[WorkUnit, list[str]]]:
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield running.pop(future), future.result()
+
+    def close(self):
+        """Shut down the worker processes. Units not yet started are
+        cancelled."""
+        self.pool.shutdown(cancel_futures=True)
+
+    def __enter__(self) -> "ParallelTwaddleRunner":
+        return self
+
+    def __exit__(self, *_):
+        self.close()
@@ -0,0 +1,166 @@
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from functools import cache
+from importlib.resources import files
+from pathlib import Path
+from typing import Any, Optional
+
+from twaddle.parser.nodes import (
+    BlockNode,
+    DigitNode,
+    FunctionNode,
+    IndefiniteArticleNode,
+    LookupNode,
+    Node,
+    RegexNode,
+    RootNode,
+    TextNode,
+)
+
+# bump whenever the encoding below changes
+CACHE_FORMAT_VERSION = 1
+CACHE_FILE_SUFFIX = ".twc"
+
+# sources which determine the shape of the tree produced for a sentence
+_GRAMMAR_SOURCES = ("twaddle.lark", "transformer.py", "nodes.py")
+
+_ROOT, _TEXT, _LOOKUP, _BLOCK, _FUNCTION, _REGEX, _ARTICLE, _DIGIT = range(8)
+
+
+@cache
+def grammar_version() -> str:
+    digest = hashlib.sha256(
+        f"{CACHE_FORMAT_VERSION}:{sys.implementation.cache_tag}".encode()
+    )
+    package = files("twaddle.parser")
+    for source in _GRAMMAR_SOURCES:
+        digest.update(package.joinpath(source).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def encode_tree(node: Node) -> tuple:
+    match node:
+        case RootNode(contents=contents):
+            return (_ROOT, tuple(encode_tree(child) for child in contents))
+        case TextNode(text=text):
+            return (_TEXT, text)
+        case LookupNode():
+            return (
+                _LOOKUP,
+                node.dictionary,
+                node.form,
+                node.positive_tags,
+                node.negative_tags,
+                node.positive_label,
+                node.negative_labels,
+                node.redefine_labels,
+            )
+        case BlockNode(choices=choices):
+            return (_BLOCK, tuple(encode_tree(choice) for choice in choices))
+        case FunctionNode(func=func, args=args):
+            return (_FUNCTION, func, tuple(encode_tree(arg) for arg in args))
+        case RegexNode(regex=regex, scope=scope, replacement=replacement):
+            return (_REGEX, regex, encode_tree(scope), encode_tree(replacement))
+        case IndefiniteArticleNode(default_upper=default_upper):
+            return (_ARTICLE, default_upper)
+        case DigitNode():
+            return (_DIGIT,)
+    raise TypeError(f"[disk_cache.encode_tree] cannot encode {type(node)}")
+
+
+def decode_tree(data: tuple) -> Any:
+    tag = data[0]
+    if tag == _ROOT:
+        return RootNode([decode_tree(child) for child in data[1]])
+    if tag == _TEXT:
+        return TextNode(data[1])
+    if tag == _LOOKUP:
+        return LookupNode(*data[1:])
+    if tag == _BLOCK:
+        return BlockNode([decode_tree(choice) for choice in data[1]])
+    if tag == _FUNCTION:
+        return FunctionNode(data[1], [decode_tree(arg) for arg in data[2]])
+    if tag == _REGEX:
+        return RegexNode(data[1], decode_tree(data[2]), decode_tree(data[3]))
+    if tag == _ARTICLE:
+        return IndefiniteArticleNode(data[1])
+    if tag == _DIGIT:
+        return DigitNode()
+    raise ValueError(f"[disk_cache.decode_tree] unknown node tag {tag}")
+
+
+class DiskParseCache:
+    """Persistent cache of transformed parse trees.
+
+    Each tree is stored in its own file, named by a hash of the sentence and
+    the grammar version, so entries written for a different grammar are never
+    read back; they are deleted when the cache is opened. Files hold the tree
+    as nested tuples serialised with `marshal`, which is compact, quick to load
+    and cannot execute code. The cache is best effort: unreadable entries count
+    as misses and failed writes are ignored.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.version = grammar_version()
+        self.hits = 0
+        self.misses = 0
+        self.prune()
+
+    def _path_for(self, sentence: str) -> Path:
+        key = hashlib.sha256(f"{self.version}\0{sentence}".encode()).hexdigest()
+        return self.directory / f"{self.version}-{key}{CACHE_FILE_SUFFIX}"
+
+    def get(self, sentence: str) -> Optional[RootNode]:
+        try:
+            stored_sentence, data = marshal.loads(self._path_for(sentence).read_bytes())
+            if stored_sentence != sentence:
+                raise ValueError("hash collision")
+            tree = decode_tree(data)
+        except (OSError, EOFError, ValueError, TypeError, IndexError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return tree
+
+    def put(self, sentence: str, tree: RootNode):
+        try:
+            payload = marshal.dumps((sentence, encode_tree(tree)))
+        except (ValueError, RecursionError):
+            # too deeply nested to serialise, just parse it next time
+            return
+        try:
+            handle, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                temp_file.write(payload)
+            os.replace(temp_name, self._path_for(sentence))
+        except OSError:
+            Path(temp_name).unlink(missing_ok=True)
+
+    def prune(self) -> int:
+        """Delete entries for other grammar versions, returning the number removed."""
+        removed = 0
+        for entry in self.directory.glob(f"*{CACHE_FILE_SUFFIX}"):
+            if not entry.name.startswith(f"{self.version}-"):
+                try:
+                    entry.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def clear(self):
+        for entry in self.directory.glob(f"*{CACHE_FILE_SUFFIX}"):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+        self.hits = 0
+        self.misses = 0
@@ -1,2 +1,3 @@
 #!/bin/sh
-PYTHONPATH=../.. python -m lark.tools.standalone twaddle.lark > twaddle_parser.py
\ No newline at end of file
+PYTHONPATH=../.. python -m lark.tools.standalone twaddle.lark > twaddle_parser.py
+PYTHONPATH=../.. python -m twaddle.parser.parser_snapshot
@@ -0,0 +1,134 @@
+import re
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+
+from twaddle.parser.twaddle_parser import Lark, Lexer, PatternStr, Token
+
+if TYPE_CHECKING:
+    from twaddle.parser.twaddle_parser import (
+        LexerState,
+        ParserState,
+        TerminalDef,
+    )
+
+# a compiled scanner for one set of acceptable terminals: the bound match
+# method of its regex, and the literal terminals which its regex terminals
+# stand in for, by value
+Scanner = tuple[Callable[..., Optional[re.Match]], dict[str, dict[str, str]]]
+
+
+def terminal_order(terminal: "TerminalDef") -> tuple:
+    # the order in which Lark tries terminals: the first to match wins, and
+    # open-ended regexes come before longer literals before shorter ones
+    return (
+        -terminal.priority,
+        -terminal.pattern.max_width,
+        -len(terminal.pattern.value),
+        terminal.name,
+    )
+
+
+def build_scanner(terminals: list["TerminalDef"]) -> Scanner:
+    literals = [t for t in terminals if isinstance(t.pattern, PatternStr)]
+    patterns = [t for t in terminals if not isinstance(t.pattern, PatternStr)]
+    # a literal which one of the regexes also matches in full (';' as a NAME,
+    # say) is found by that regex and renamed afterwards
+    retype: dict[str, dict[str, str]] = {}
+    embedded = set()
+    for pattern in patterns:
+        regex = re.compile(pattern.pattern.to_regexp())
+        for literal in literals:
+            value = literal.pattern.value
+            if literal.priority != pattern.priority:
+                continue
+            if (found := regex.match(value)) and found.group() == value:
+                retype.setdefault(pattern.name, {}).setdefault(value, literal.name)
+                if literal.pattern.flags <= pattern.pattern.flags:
+                    embedded.add(literal.name)
+    scanned = sorted(
+        (t for t in terminals if t.name not in embedded), key=terminal_order
+    )
+    alternatives = "|".join(f"(?P<{t.name}>{t.pattern.to_regexp()})" for t in scanned)
+    # a state which accepts no terminals must only ever see the end of input
+    return re.compile(alternatives or "(?!)").match, retype
+
+
+class TwaddleLexer(Lexer):
+    """Single pass tokenizer for Twaddle sentences.
+
+    Like Lark's contextual lexer it only looks for the terminals the parser
+    can accept in its current state, so that the same characters can be TEXT
+    in one place and a NAME in another, but it reads the parser state
+    directly and builds each token in one step. The terminals are matched by
+    one regex per set of acceptable terminals, compiled when first needed.
+
+    Anything it can't tokenize is handed to the Lark lexer it replaces,
+    which then reports the error exactly as it would have done itself.
+    """
+
+    def __init__(self, parser: Lark):
+        frontend = parser.parser
+        lexer_conf = frontend.lexer_conf
+        if lexer_conf.ignore or lexer_conf.postlex:
+            raise ValueError("TwaddleLexer doesn't support ignored terminals")
+        self.fallback: Lexer = frontend.lexer
+        terminals_by_name = lexer_conf.terminals_by_name
+        self.terminals_by_state: dict[int, list["TerminalDef"]] = {}
+        for state, actions in frontend.parser._parse_table.states.items():
+            self.terminals_by_state[state] = [
+                terminals_by_name[name] for name in actions if name in terminals_by_name
+            ]
+        self.scanners: dict[int, Scanner] = {}
+        self._scanners_by_terminals: dict[frozenset[str], Scanner] = {}
+
+    def scanner_for(self, state: int) -> Scanner:
+        terminals = self.terminals_by_state[state]
+        key = frozenset(t.name for t in terminals)
+        if (scanner := self._scanners_by_terminals.get(key)) is None:
+            scanner = build_scanner(terminals)
+            self._scanners_by_terminals[key] = scanner
+        self.scanners[state] = scanner
+        return scanner
+
+    def lex(
+        self, lexer_state: "LexerState", parser_state: "ParserState"
+    ) -> Iterator[Token]:
+        text = lexer_state.text.text
+        end = lexer_state.text.end
+        line_ctr = lexer_state.line_ctr
+        pos = line_ctr.char_pos
+        line = line_ctr.line
+        line_start = line_ctr.line_start_pos
+        state_stack = parser_state.state_stack
+        scanners = self.scanners
+        new_token = Token._future_new
+        while pos < end:
+            state = state_stack[-1]
+            try:
+                match, retype = scanners[state]
+            except KeyError:
+                match, retype = self.scanner_for(state)
+            found = match(text, pos, end)
+            if found is None:
+                yield from self.fallback.lex(lexer_state, parser_state)
+                return
+            value = found.group()
+            type_ = found.lastgroup
+            if type_ in retype:
+                type_ = retype[type_].get(value, type_)
+            start_line = line
+            start_column = pos - line_start + 1
+            start_pos = pos
+            pos = found.end()
+            if "\n" in value:
+                line += value.count("\n")
+                line_start = start_pos + value.rindex("\n") + 1
+            column = pos - line_start + 1
+            token = new_token(
+                type_, value, start_pos, start_line, start_column, line, column, pos
+            )
+            line_ctr.char_pos = pos
+            line_ctr.line = line
+            line_ctr.column = column
+            line_ctr.line_start_pos = line_start
+            lexer_state.last_token = token
+            yield token
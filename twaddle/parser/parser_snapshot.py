@@ -0,0 +1,84 @@
+import hashlib
+import pickle
+from importlib import import_module
+from importlib.resources import files
+from io import BytesIO
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from twaddle.parser.twaddle_parser import Lark
+
+# Building a parser from the generated module deserialises its parse tables
+# and lexer definitions on every start. A snapshot holds the finished parser
+# object (including its TwaddleInlineTransformer callbacks), pickled, which
+# loads several times faster. It is regenerated by
+# generate_parser.sh alongside twaddle_parser.py; if it is missing or was
+# built from a different grammar it is ignored and the parser is built as usual.
+SNAPSHOT_NAME = "twaddle_parser.snapshot"
+
+
+class _SnapshotPickler(pickle.Pickler):
+    # the parser keeps a reference to the `re` module, which can't be pickled
+    def persistent_id(self, obj):
+        if isinstance(obj, ModuleType):
+            return obj.__name__
+        return None
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        return import_module(pid)
+
+
+def snapshot_key() -> str:
+    from twaddle.parser.twaddle_parser import __version__ as lark_version
+
+    digest = hashlib.sha256(lark_version.encode())
+    package = files("twaddle.parser")
+    for source in ("twaddle.lark", "transformer.py"):
+        digest.update(package.joinpath(source).read_bytes())
+    return digest.hexdigest()
+
+
+def save_snapshot(parser: "Lark", path: Optional[str | Path] = None):
+    path = Path(path) if path is not None else Path(__file__).with_name(SNAPSHOT_NAME)
+    with path.open("wb") as snapshot_file:
+        pickler = _SnapshotPickler(snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+        pickler.dump(snapshot_key())
+        pickler.dump(parser)
+
+
+def load_snapshot(path: Optional[str | Path] = None) -> Optional["Lark"]:
+    try:
+        if path is None:
+            data = files("twaddle.parser").joinpath(SNAPSHOT_NAME).read_bytes()
+        else:
+            data = Path(path).read_bytes()
+        unpickler = _SnapshotUnpickler(BytesIO(data))
+        if unpickler.load() != snapshot_key():
+            return None
+        return unpickler.load()
+    except (
+        OSError,
+        EOFError,
+        ImportError,
+        AttributeError,
+        ValueError,
+        TypeError,
+        KeyError,
+        IndexError,
+        pickle.UnpicklingError,
+    ):
+        return None
+
+
+def main():
+    from twaddle.parser.parsing import build_parser
+
+    save_snapshot(build_parser())
+
+
+if __name__ == "__main__":
+    main()
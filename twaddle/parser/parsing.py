@@ -0,0 +1,270 @@
+import re
+from functools import cache
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from twaddle.exceptions import TwaddleInterpreterException
+from twaddle.parser.nodes import Node, RootNode, TextNode
+
+# The generated parser module is large, and building a parser from it means
+# deserialising its parse tables. Both are deferred until the first sentence
+# is parsed so that importing twaddle stays cheap.
+if TYPE_CHECKING:
+    from twaddle.parser.transformer import TwaddleTransformer
+    from twaddle.parser.twaddle_parser import Lark, UnexpectedInput
+
+TOKEN_NAMES = {
+    "MORETHAN": "'>'",
+    "LESSTHAN": "'<'",
+    "LBRACE": "'{'",
+    "RBRACE": "'}'",
+    "LSQB": "'['",
+    "RSQB": "']'",
+    "PIPE": "'|'",
+    "SEMICOLON": "';'",
+    "DOT": "'.'",
+    "MINUS": "'-'",
+    "BACKSLASH": "'\\'",
+    "FORWARD_SLASH": "'/'",
+    "COLON": "':'",
+    "TEXT": "text",
+    "NAME": "identifier",
+    "ESCAPED_CHAR": "escape character",
+    "LABEL_MODIFIER": "'!' or '^'",
+    "TAG_MODIFIER": "'!'",
+}
+
+# Examples for matching common parse errors to friendly messages
+PARSE_ERROR_EXAMPLES = {
+    "Unclosed block - missing '}'": [
+        "{a|b",
+        "{a|b|c",
+    ],
+    "Unclosed function - missing ']'": [
+        "[rep:3",
+        "[sync:name;locked",
+    ],
+    "Invalid function name: no whitespace allowed": [
+        "[function name]",
+    ],
+    "Invalid lookup - unclosed or invalid whitespace in identifier": [
+        "<noun",
+        "<noun-tag",
+        "<noun::=label",
+        "<verb.past",
+        "<noun::=a label>",
+        "<noun-some tag>",
+    ],
+}
+
+
+@cache
+def get_parser(lark_lexer: bool = False) -> "Lark":
+    """Parser which builds Twaddle nodes directly as each rule is reduced,
+    without first building a Lark parse tree.
+
+    Sentences are tokenized by a TwaddleLexer unless `lark_lexer` is set, in
+    which case the Lark lexer generated along with the parser is used."""
+    from twaddle.parser.parser_snapshot import load_snapshot
+
+    parser = load_snapshot() or build_parser()
+    return parser if lark_lexer else install_twaddle_lexer(parser)
+
+
+def build_parser() -> "Lark":
+    from twaddle.parser.transformer import TwaddleInlineTransformer
+    from twaddle.parser.twaddle_parser import Lark_StandAlone
+
+    return Lark_StandAlone(transformer=TwaddleInlineTransformer())
+
+
+@cache
+def get_tree_parser(lark_lexer: bool = False) -> "Lark":
+    """Parser producing a Lark parse tree, to be converted by get_transformer()."""
+    from twaddle.parser.twaddle_parser import Lark_StandAlone
+
+    parser = Lark_StandAlone()
+    return parser if lark_lexer else install_twaddle_lexer(parser)
+
+
+def install_twaddle_lexer(parser: "Lark") -> "Lark":
+    from twaddle.parser.lexer import TwaddleLexer
+
+    parser.parser.lexer = TwaddleLexer(parser)
+    return parser
+
+
+@cache
+def get_transformer() -> "TwaddleTransformer":
+    from twaddle.parser.transformer import TwaddleTransformer
+
+    return TwaddleTransformer()
+
+
+# characters which open, close or escape markup; anything else is plain text
+markup_regex = re.compile(r"[{}\[\]<>\\]")
+# how the lexer splits plain text into TEXT, PIPE, SEMICOLON and FORWARD_SLASH
+literal_token_regex = re.compile(r"[^|;/]+|[|;/]")
+openers = frozenset("{[<")
+closers = frozenset("}]>")
+# a separate call into the parser costs roughly as much as lexing and
+# reducing this many tokens, so shorter literal runs between markup regions
+# are left in the region rather than splitting it in two
+PARSER_CALL_TOKENS = 8
+# a run of plain text long enough to be worth splitting out of the parser,
+# checked before scanning sentences that are mostly markup
+splittable_run_regex = re.compile(r"[|;/](?:[^{}\[\]<>\\|;/]*[|;/]){3}")
+
+
+def is_plain_text(sentence: str) -> bool:
+    return markup_regex.search(sentence) is None
+
+
+def literal_nodes(text: str) -> list[Node]:
+    return [TextNode(token) for token in literal_token_regex.findall(text)]
+
+
+def top_level_regions(sentence: str) -> Iterator[Optional[tuple[int, int]]]:
+    """Yield the start and end of each top level block, function, lookup and
+    escape in a sentence, or None if the brackets don't balance."""
+    depth = 0
+    start = 0
+    position = 0
+    length = len(sentence)
+    while (match := markup_regex.search(sentence, position)) is not None:
+        char = match.group()
+        position = match.end()
+        if char == "\\":
+            # the escaped character is part of the escape
+            position += 1
+            if depth == 0:
+                yield match.start(), min(position, length)
+        elif char in openers:
+            if depth == 0:
+                start = match.start()
+            depth += 1
+        else:
+            depth -= 1
+            if depth < 0:
+                break
+            if depth == 0:
+                yield start, position
+    if depth != 0:
+        yield None
+
+
+def merge_span(
+    spans: list[tuple[int, int]], sentence: str, region: tuple[int, int]
+) -> None:
+    """Add a region to the spans found so far, joining it to the last of them
+    if only a little plain text lies between."""
+    region_start, region_end = region
+    if spans:
+        previous_start, previous_end = spans[-1]
+        between = sentence[previous_end:region_start]
+        if len(literal_token_regex.findall(between)) < PARSER_CALL_TOKENS:
+            spans[-1] = (previous_start, region_end)
+            return
+    spans.append(region)
+
+
+def markup_spans(sentence: str) -> Optional[list[tuple[int, int]]]:
+    """Find the top level blocks, functions, lookups and escapes in a sentence,
+    merging neighbours separated by only a little plain text.
+
+    Returns None if the brackets don't balance, leaving the parser to report
+    the error."""
+    spans: list[tuple[int, int]] = []
+    for region in top_level_regions(sentence):
+        if region is None:
+            return None
+        merge_span(spans, sentence, region)
+    return spans
+
+
+def parse_markup_regions(
+    sentence: str, fused: bool, lark_lexer: bool
+) -> Optional[RootNode]:
+    """Parse only the markup in a sentence, building the plain text between it
+    directly. Returns None if there is too little plain text for this to pay
+    off, or if any region fails to parse on its own."""
+    from twaddle.parser.twaddle_parser import UnexpectedInput
+
+    if splittable_run_regex.search(sentence) is None:
+        return None
+    spans = markup_spans(sentence)
+    if spans is None:
+        return None
+    contents: list[Node] = []
+    position = 0
+    try:
+        for start, end in spans:
+            contents.extend(literal_nodes(sentence[position:start]))
+            region = parse_with_lark(sentence[start:end], fused, lark_lexer)
+            contents.extend(region.contents)
+            position = end
+    except UnexpectedInput:
+        return None
+    contents.extend(literal_nodes(sentence[position:]))
+    return RootNode(contents)
+
+
+def parse_with_lark(
+    sentence: str, fused: bool = True, lark_lexer: bool = False
+) -> RootNode:
+    if fused:
+        return get_parser(lark_lexer).parse(sentence)
+    tree = get_tree_parser(lark_lexer).parse(sentence)
+    return get_transformer().transform(tree)
+
+
+def parse_sentence(
+    sentence: str, fused: bool = True, lark_lexer: bool = False
+) -> RootNode:
+    """Parse a sentence into a tree of Twaddle nodes.
+
+    Plain text never reaches the parser, and only the markup regions of a
+    mostly literal sentence do; the tree is the same as a full parse would
+    give. Anything which doesn't parse cleanly region by region is parsed
+    again as a whole, so that errors are reported against the full sentence.
+    """
+    from twaddle.parser.twaddle_parser import UnexpectedInput
+
+    if is_plain_text(sentence):
+        return RootNode(literal_nodes(sentence))
+    if (tree := parse_markup_regions(sentence, fused, lark_lexer)) is not None:
+        return tree
+    try:
+        return parse_with_lark(sentence, fused, lark_lexer)
+    except UnexpectedInput as err:
+        raise TwaddleInterpreterException(format_parse_error(err, sentence))
+
+
+def format_parse_error(err: "UnexpectedInput", sentence: str) -> str:
+    from twaddle.parser.twaddle_parser import UnexpectedCharacters, UnexpectedToken
+
+    context = err.get_context(sentence)
+
+    # Try to match against known error patterns first
+    label = err.match_examples(get_parser().parse, PARSE_ERROR_EXAMPLES)
+    if label:
+        return f"{label}\n{context}"
+
+    # Fall back to generic message based on exception type
+    if isinstance(err, UnexpectedToken):
+        token = err.token
+        if token.type == "$END":
+            msg = "Unexpected end of input"
+        else:
+            msg = f"Unexpected '{token.value}'"
+        expected = [e for e in err.expected if not e.startswith("_")]
+        if expected:
+            friendly = [TOKEN_NAMES.get(e, e) for e in expected]
+            msg += f" (expected: {', '.join(friendly)})"
+    elif isinstance(err, UnexpectedCharacters):
+        msg = f"Unexpected character '{err.char}'"
+        if err.allowed:
+            friendly = [TOKEN_NAMES.get(e, e) for e in err.allowed]
+            msg += f" (allowed: {', '.join(friendly)})"
+    else:
+        msg = "Parse error"
+    return f"{msg}\n{context}\nSee the documentation at https://chrishengler.github.io/twaddle/ for help"
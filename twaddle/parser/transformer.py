@@ -1,3 +1,4 @@
+import re
 from dataclasses import dataclass
 
 from twaddle.exceptions import TwaddleParserException
@@ -12,7 +13,7 @@ from twaddle.parser.nodes import (
     RootNode,
     TextNode,
 )
-from twaddle.parser.twaddle_parser import Token, Transformer
+from twaddle.parser.twaddle_parser import Discard, Token, Transformer, Tree
 
 
 @dataclass
@@ -51,6 +52,31 @@ LookupModifier = (
 
 
 class TwaddleTransformer(Transformer):
+    def transform(self, tree: Tree) -> RootNode:
+        """Transform a parse tree as Transformer.transform does, but with an
+        explicit stack rather than by recursion, so that sentences nested
+        too deeply to recurse through can be transformed."""
+        # each entry is a subtree, its children still to transform and those
+        # already transformed
+        stack = [(tree, iter(tree.children), [])]
+        while True:
+            subtree, children, transformed = stack[-1]
+            for child in children:
+                if isinstance(child, Tree):
+                    stack.append((child, iter(child.children), []))
+                    break
+                if self.__visit_tokens__ and isinstance(child, Token):
+                    child = self._call_userfunc_token(child)
+                if child is not Discard:
+                    transformed.append(child)
+            else:
+                stack.pop()
+                result = self._call_userfunc(subtree, transformed)
+                if not stack:
+                    return result
+                if result is not Discard:
+                    stack[-1][2].append(result)
+
     # default
     def __default__(self, data, children, meta):
         raise TwaddleParserException(
@@ -226,3 +252,28 @@ class TwaddleTransformer(Transformer):
                 return TextNode(char)
             case _:
                 raise TwaddleParserException(f"invalid escape sequence \\{char}")
+
+
+class _Expansion:
+    # stands in for a Tree for the grammar's internal repetition rules, whose
+    # children are spliced into the parent rule by the parser's child filters
+    __slots__ = ("children",)
+
+    def __init__(self, children: list):
+        self.children = children
+
+
+class TwaddleInlineTransformer(TwaddleTransformer):
+    """TwaddleTransformer for use as the parser's own callbacks, so nodes are
+    built as each rule is reduced instead of from a finished parse tree."""
+
+    # repetition rules generated by Lark, e.g. __start_star_0
+    internal_rule_regex = re.compile(r"__\w+_(star|plus)_\d+")
+
+    def __getattr__(self, name: str):
+        if self.internal_rule_regex.fullmatch(name):
+            return _Expansion
+        raise AttributeError(name)
+
+    def __default__(self, data, children, meta):
+        raise TwaddleParserException(f"Unknown rule '{data}'")
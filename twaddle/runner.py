@@ -1,25 +1,66 @@
+from contextlib import closing
 from importlib.resources import as_file
 from importlib.resources.abc import Traversable
 from pathlib import Path
+from typing import Iterator, Optional
 
+from twaddle.compiled_template import CompiledTemplate
+from twaddle.interpreter.budget import ExecutionBudget
 from twaddle.interpreter.function_registry import FunctionRegistry
 from twaddle.interpreter.interpreter import Interpreter
+from twaddle.interpreter.optimizer import OptimizationReport, OptimizerPasses
+from twaddle.interpreter.parse_cache import DEFAULT_PARSE_CACHE_SIZE, ParseCacheInfo
+from twaddle.interpreter.random_source import (
+    DEFAULT_RNG_BACKEND,
+    RandomBackend,
+    RandomSource,
+)
 from twaddle.lookup.lookup_manager import LookupManager
 
 
 class TwaddleRunner:
     def __init__(
         self,
-        path: str | Path | Traversable,
+        path: str | Path | Traversable | LookupManager,
         persistent: bool = False,
         persistent_labels: bool = False,
         persistent_synchronizers: bool = False,
         persistent_patterns: bool = False,
         persistent_clipboard: bool = False,
         strict_mode: bool = False,
+        parse_cache_size: int = DEFAULT_PARSE_CACHE_SIZE,
+        parse_cache_dir: Optional[str | Path] = None,
+        code_cache_dir: Optional[str | Path] = None,
+        optimizations: Optional[OptimizerPasses] = None,
+        seed: Optional[int | str] = None,
+        rng: Optional[RandomSource] = None,
+        rng_backend: RandomBackend = DEFAULT_RNG_BACKEND,
+        budget: Optional[ExecutionBudget] = None,
     ):
+        if seed is not None and rng is not None:
+            raise ValueError("give either a seed or a random source, not both")
+        if rng is None:
+            rng = rng_backend(seed)
+        if isinstance(path, LookupManager):
+            # dictionaries already loaded, shared with other runners
+            self._initialize(
+                path,
+                persistent,
+                persistent_labels,
+                persistent_synchronizers,
+                persistent_patterns,
+                persistent_clipboard,
+                strict_mode,
+                parse_cache_size,
+                parse_cache_dir,
+                code_cache_dir,
+                optimizations,
+                rng,
+                rng_backend,
+                budget,
+            )
         # Handle Traversable objects from importlib.resources
-        if isinstance(path, Traversable):
+        elif isinstance(path, Traversable):
             with as_file(path) as directory:
                 self._initialize(
                     directory,
@@ -29,6 +70,13 @@ class TwaddleRunner:
                     persistent_patterns,
                     persistent_clipboard,
                     strict_mode,
+                    parse_cache_size,
+                    parse_cache_dir,
+                    code_cache_dir,
+                    optimizations,
+                    rng,
+                    rng_backend,
+                    budget,
                 )
         else:
             if not isinstance(path, Path):
@@ -41,20 +89,37 @@ class TwaddleRunner:
                 persistent_patterns,
                 persistent_clipboard,
                 strict_mode,
+                parse_cache_size,
+                parse_cache_dir,
+                code_cache_dir,
+                optimizations,
+                rng,
+                rng_backend,
+                budget,
             )
 
     def _initialize(
         self,
-        path: Path,
+        path: Path | LookupManager,
         persistent: bool,
         persistent_labels: bool,
         persistent_synchronizers: bool,
         persistent_patterns: bool,
         persistent_clipboard: bool,
         strict_mode: bool,
+        parse_cache_size: int,
+        parse_cache_dir: Optional[str | Path],
+        code_cache_dir: Optional[str | Path],
+        optimizations: Optional[OptimizerPasses],
+        rng: RandomSource,
+        rng_backend: RandomBackend,
+        budget: Optional[ExecutionBudget],
     ):
-        self.lookup_manager = LookupManager()
-        self.lookup_manager.add_dictionaries_from_folder(path)
+        if isinstance(path, LookupManager):
+            self.lookup_manager = path
+        else:
+            self.lookup_manager = LookupManager()
+            self.lookup_manager.add_dictionaries_from_folder(path)
         persistent_labels = True if persistent else persistent_labels
         persistent_synchronizers = True if persistent else persistent_synchronizers
         persistent_patterns = True if persistent else persistent_patterns
@@ -66,6 +131,13 @@ class TwaddleRunner:
             persistent_patterns=persistent_patterns,
             persistent_clipboard=persistent_clipboard,
             strict_mode=strict_mode,
+            parse_cache_size=parse_cache_size,
+            parse_cache_dir=parse_cache_dir,
+            code_cache_dir=code_cache_dir,
+            optimizations=optimizations,
+            rng=rng,
+            rng_backend=rng_backend,
+            budget=budget,
         )
 
     def add_dictionaries_from_folder(self, path: str | Path | Traversable):
@@ -98,8 +170,89 @@ class TwaddleRunner:
     def list_functions(self) -> dict:
         return FunctionRegistry.list_functions()
 
-    def run_sentence(self, sentence: str) -> str:
-        return self.interpreter.interpret_external(sentence)
+    def run_sentence(self, sentence: str, seed: Optional[int | str] = None) -> str:
+        with self.interpreter.seeded(seed):
+            return self.interpreter.interpret_external(sentence)
+
+    def stream_sentence(
+        self, sentence: str, seed: Optional[int | str] = None
+    ) -> Iterator[str]:
+        # parsed here rather than in a generator, so that parse errors are
+        # raised straight away
+        tree = self.interpreter.parse(sentence)
+        return self._seeded(seed, self.interpreter.stream_tree(tree))
+
+    def run_sentence_many(
+        self,
+        sentence: str,
+        n: int,
+        reset_between: bool = True,
+        seed: Optional[int | str] = None,
+    ) -> list[str]:
+        return list(self.iter_sentence_many(sentence, n, reset_between, seed))
+
+    def iter_sentence_many(
+        self,
+        sentence: str,
+        n: int,
+        reset_between: bool = True,
+        seed: Optional[int | str] = None,
+    ) -> Iterator[str]:
+        if n < 0:
+            raise ValueError(f"number of sentences must not be negative, got {n}")
+        # compiled here rather than in a generator, so that parse errors are
+        # raised straight away
+        template = self.compile(sentence)
+        return self._seeded(
+            seed,
+            self.interpreter.interpret_program_many(template.program, n, reset_between),
+        )
+
+    def _seeded(self, seed: Optional[int | str], results: Iterator[str]):
+        if seed is None:
+            return results
+        return self._iterate_seeded(seed, results)
+
+    def _iterate_seeded(self, seed: int | str, results: Iterator[str]) -> Iterator[str]:
+        # the seeded stream is only drawn from while each result is being
+        # generated, so that calls made between results, or after the
+        # iterator is abandoned, draw from the runner's own stream
+        rng = self.interpreter.rng_backend(seed)
+        try:
+            with closing(results):
+                while True:
+                    with self.interpreter.using_rng(rng):
+                        result = next(results, None)
+                    if result is None:
+                        return
+                    yield result
+        finally:
+            self.interpreter.release_rng(rng)
+
+    def compile(self, sentence: str) -> CompiledTemplate:
+        tree = self.interpreter.parse(sentence)
+        return CompiledTemplate(sentence, tree, self.interpreter.compile(tree))
+
+    def run_compiled(
+        self, template: CompiledTemplate, seed: Optional[int | str] = None
+    ) -> str:
+        with self.interpreter.seeded(seed):
+            return self.interpreter.interpret_program(template.program)
+
+    def spawn_rng(self) -> RandomSource:
+        """A new random stream, independent of this runner's, for example to
+        give to a runner in another worker. A runner created with a seed
+        spawns the same streams each time."""
+        return self.interpreter.spawn_rng()
 
     def clear(self) -> None:
         self.interpreter.context.force_clear()
+
+    def parse_cache_info(self) -> ParseCacheInfo:
+        return self.interpreter.parse_cache.info()
+
+    def clear_parse_cache(self) -> None:
+        self.interpreter.parse_cache.clear()
+
+    def optimization_report(self) -> OptimizationReport:
+        return self.interpreter.optimizer.report()
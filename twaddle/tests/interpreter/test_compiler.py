@@ -0,0 +1,133 @@
+import os
+
+import pytest
+
+from twaddle.exceptions import (
+    TwaddleDictionaryException,
+    TwaddleFunctionRegistryException,
+    TwaddleInterpreterException,
+)
+from twaddle.interpreter.code_cache import CODE_CACHE_SUFFIX, DiskCodeCache
+from twaddle.interpreter.interpreter import Interpreter
+from twaddle.lookup.lookup_manager import LookupManager
+from twaddle.runner import TwaddleRunner
+
+
+def relative_path_to_full_path(rel_path: str) -> str:
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(current_dir, rel_path)
+
+
+path = relative_path_to_full_path("../resources/valid_dicts")
+
+sentences = [
+    "hello world",
+    r"\a <adj> \A <noun> {a|b|c} \d\d",
+    "[rep:4][sep:, ][first:(][last:)]{x|y|z}",
+    "[rep:3][sep:{a|b}]{[rep:2]{c|d}|e}",
+    "[while:[lt:[rand:1;10];8];20]{w}",
+    "[x:s;deck]{1|2|3}[x:s]{1|2|3}[x:s]{1|2|3}",
+    "[save:p][hide]{q|w}[load:p] [load:missing;fallback]",
+    "[copy:a]{<noun-vehicle>} [reverse]{[paste:a]}",
+    "[abbr:lower]{Portable Network Graphics} [abbr]{a b 12c}",
+    "[case:sentence]an apple. {i think|so} [case:title]big old {cat|dog}",
+    "[//[aeiou]//i:<noun>;[match][match]] [//x//:a;b]",
+    "[if:[eq:1;1];yes;no] [if:[gt:1;2];yes] [not:0][and:1;0][or:1;0][xor:1;1]",
+    "[add:1;2.5][sub:5;1][mul:2;3][div:7;2][bool:x]",
+    "<noun-building-large::=a> <noun-building::!=a> <noun::^=a>",
+    "{a|{b|{c|\\a <adj>}}} {\\A <noun-vehicle>|}",
+    "[clear][rep:2]{[sync:z;locked]{a|b}[sync:z]{c|d}}",
+]
+
+
+def runner() -> TwaddleRunner:
+    return TwaddleRunner(path)
+
+
+@pytest.mark.parametrize("sentence", sentences)
+def test_compiled_output_matches_interpreter(sentence: str):
+    interpreter = runner().interpreter
+    tree = interpreter.parse(sentence)
+    program = interpreter.compile(tree)
+    for seed in range(10):
+        with interpreter.seeded(seed):
+            expected = interpreter.interpret_tree(tree)
+        with interpreter.seeded(seed):
+            assert interpreter.interpret_program(program) == expected
+
+
+@pytest.mark.parametrize("sentence", sentences)
+def test_compiled_code_does_not_dispatch(sentence: str):
+    interpreter = runner().interpreter
+    program = interpreter.compile(interpreter.parse(sentence))
+    assert "interpret(" not in program.source
+
+
+def test_pure_calls_evaluated_when_compiling():
+    interpreter = Interpreter(LookupManager())
+    program = interpreter.compile(interpreter.parse("[case:upper]a [not:0]"))
+    assert program.handlers == []
+    assert interpreter.interpret_program(program) == "A 1"
+
+
+def test_unknown_function_raises_when_reached():
+    interpreter = Interpreter(LookupManager())
+    program = interpreter.compile(interpreter.parse("[if:0;[nope]]ok"))
+    assert interpreter.interpret_program(program) == "ok"
+    program = interpreter.compile(interpreter.parse("a[nope]"))
+    with pytest.raises(TwaddleInterpreterException):
+        interpreter.interpret_program(program)
+
+
+def test_wrong_number_of_arguments_raises():
+    interpreter = Interpreter(LookupManager())
+    program = interpreter.compile(interpreter.parse("[rep:1;2]{a}"))
+    with pytest.raises(TwaddleFunctionRegistryException):
+        interpreter.interpret_program(program)
+
+
+def test_missing_dictionary_raises():
+    interpreter = Interpreter(LookupManager())
+    program = interpreter.compile(interpreter.parse("<noun>"))
+    with pytest.raises(TwaddleDictionaryException):
+        interpreter.interpret_program(program)
+
+
+def test_dictionaries_added_later_are_used(tmp_path):
+    twaddle_runner = TwaddleRunner(tmp_path)
+    template = twaddle_runner.compile("<noun-building-large>")
+    with pytest.raises(TwaddleDictionaryException):
+        template.render(twaddle_runner)
+    twaddle_runner.add_dictionaries_from_folder(path)
+    assert template.render(twaddle_runner) == "factory"
+
+
+def test_code_cache(tmp_path):
+    cache = DiskCodeCache(tmp_path)
+    interpreter = Interpreter(LookupManager(), code_cache_dir=tmp_path)
+    tree = interpreter.parse("[rep:3]{a}")
+    first = interpreter.compile(tree)
+    assert len(list(tmp_path.glob(f"*{CODE_CACHE_SUFFIX}"))) == 1
+    assert cache.get(first.source) is not None
+    second = interpreter.compile(tree)
+    assert interpreter.code_cache.hits == 1
+    assert interpreter.interpret_program(second) == "aaa"
+
+
+def test_unreadable_code_cache_entry_is_a_miss(tmp_path):
+    interpreter = Interpreter(LookupManager(), code_cache_dir=tmp_path)
+    tree = interpreter.parse("[rep:3]{a}")
+    interpreter.compile(tree)
+    for entry in tmp_path.glob(f"*{CODE_CACHE_SUFFIX}"):
+        entry.write_bytes(b"rubbish")
+    program = interpreter.compile(tree)
+    assert interpreter.code_cache.misses == 2
+    assert interpreter.interpret_program(program) == "aaa"
+
+
+def test_runner_code_cache_dir(tmp_path):
+    twaddle_runner = TwaddleRunner(path, code_cache_dir=tmp_path)
+    assert twaddle_runner.compile("[rep:2]{<adj>}").render(twaddle_runner) == (
+        "happyhappy"
+    )
+    assert len(list(tmp_path.glob(f"*{CODE_CACHE_SUFFIX}"))) == 1
@@ -1,5 +1,10 @@
 from twaddle.interpreter.formatter import Formatter
-from twaddle.interpreter.formatting_object import FormattingStrategy
+from twaddle.interpreter.formatting_object import (
+    FormattingStrategy,
+    IndefiniteArticle,
+    PlainText,
+    StrategyChange,
+)
 
 formatter = Formatter()
 
@@ -50,5 +55,108 @@ def test_title():
     assert formatter.resolve() == "Hey There! This Text's A Test"
 
 
+def test_cases_carry_across_appended_text():
+    formatter.set_strategy(FormattingStrategy.SENTENCE)
+    for text in ["hey", " ", "there.", "  ", "this i", "s i", " think", " "]:
+        formatter.append(text)
+    assert formatter.resolve() == "Hey there.  This is i think "
+    formatter.set_strategy(FormattingStrategy.TITLE)
+    for text in ["a", "b ", "c", "  ", "d"]:
+        formatter.append(text)
+    assert formatter.resolve() == "Ab C  D"
+
+
+def test_large_output_resolves():
+    pieces = ["the cat sat. ", "i think ", "so! ", "WELL "]
+    length = sum(len(piece) for piece in pieces)
+    for strategy in FormattingStrategy:
+        # every repetition after the first follows the same text, so is
+        # formatted the same way
+        small = Formatter()
+        small.set_strategy(strategy)
+        for piece in pieces * 2:
+            small.append(piece)
+        text = small.resolve()
+        first, second = text[:length], text[length:]
+        formatter.set_strategy(strategy)
+        for piece in pieces * 5000:
+            formatter.append(piece)
+        assert formatter.resolve() == first + second * 4999
+
+
+def test_many_waiting_articles():
+    for _ in range(20000):
+        formatter.add_indefinite_article()
+        formatter.append(" ")
+        formatter.add_indefinite_article(default_upper=True)
+        formatter.append(" egg ")
+        formatter.add_indefinite_article()
+        formatter.append(" ")
+    formatter.append("b")
+    # articles waiting together are decided by the same word
+    assert formatter.resolve() == "an An egg an " * 19999 + "an An egg a b"
+
+
+def test_articles_wait_across_merged_formatters():
+    waiting = Formatter()
+    waiting.append("the ")
+    waiting.add_indefinite_article()
+    merged = Formatter()
+    merged += waiting
+    merged.append(" hour, ")
+    merged.add_indefinite_article()
+    assert merged.resolve_settled() == "the an hour, "
+    merged.append(" uniform")
+    assert merged.resolve_settled(final=True) == "a uniform"
+
+
+def test_merging_decides_waiting_articles():
+    merged = Formatter()
+    merged.add_indefinite_article(default_upper=True)
+    merged += Formatter.from_text(" ")
+    assert merged.text_length == 1
+    merged += Formatter.from_text("elephant")
+    merged += Formatter()
+    merged.add_indefinite_article()
+    article_first = Formatter()
+    article_first.add_indefinite_article()
+    article_first.append(" cat")
+    merged += article_first
+    # the first word of what's merged is its own article
+    expected = "An elephantana cat"
+    assert merged.text_length == len(expected)
+    assert merged.resolve() == expected
+
+
+def test_merging_deeply_nested_output():
+    inner = Formatter.from_text("egg")
+    for _ in range(5000):
+        outer = Formatter()
+        outer.append("x ")
+        outer.add_indefinite_article()
+        outer.append(" ")
+        outer += inner
+        inner = outer
+    # see benchmarks/bench_merging.py for how long this takes at each depth
+    assert inner.text_length == len("x an ") * 5000 + len("egg")
+    assert inner.resolve() == "x an " * 5000 + "egg"
+
+
+def test_formatting_objects_are_compact():
+    for item in [
+        PlainText("a"),
+        StrategyChange(FormattingStrategy.UPPER),
+        IndefiniteArticle(),
+    ]:
+        assert not hasattr(item, "__dict__")
+    # objects are shared between formatters, so must be left as they are
+    first, second = Formatter(), Formatter()
+    for shared in (first, second):
+        shared.add_indefinite_article()
+        shared.set_strategy(FormattingStrategy.UPPER)
+        shared.append(" egg")
+    assert first.resolve() == second.resolve() == "an EGG"
+
+
 if __name__ == "__main__":
     test_sentence()
@@ -1,5 +1,6 @@
 import pytest
 
+import twaddle.interpreter.function_definitions  # noqa: F401
 from twaddle.exceptions import TwaddleFunctionRegistryException
 from twaddle.interpreter.context import TwaddleContext
 from twaddle.interpreter.function_registry import (
@@ -106,6 +107,22 @@ class TestRegistration:
         assert entry.min_args == 1
         assert entry.max_args == 3
         assert entry.description == "does a thing"
+        assert not entry.pure
+
+    def test_register_pure(self):
+        @FunctionRegistry.register(name="myfunc", pure=True)
+        def myfunc(args, context, interpreter):
+            pass
+
+        assert FunctionRegistry.function_lookup["myfunc"].pure
+
+    def test_functions_with_effects_are_not_pure(self):
+        for name in ["sync", "save", "load", "copy", "repeat", "rand", "match"]:
+            assert not FunctionRegistry.function_lookup[name].pure
+        # arithmetic reads the block's max_decimals
+        for name in ["add", "subtract", "multiply", "divide"]:
+            assert not FunctionRegistry.function_lookup[name].pure
+        assert FunctionRegistry.function_lookup["equal_to"].pure
 
     def test_register_returns_original_function(self):
         @FunctionRegistry.register(name="myfunc")
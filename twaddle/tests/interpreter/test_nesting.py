@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from twaddle.exceptions import TwaddleBudgetException, TwaddleDictionaryException
+from twaddle.interpreter.budget import ExecutionBudget
+from twaddle.interpreter.compiler import MAX_COMPILED_DEPTH
+from twaddle.interpreter.optimizer import OptimizerPasses, TreeOptimizer, count_nodes
+from twaddle.parser.parsing import parse_sentence
+from twaddle.runner import TwaddleRunner
+
+
+def relative_path_to_full_path(rel_path: str) -> str:
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(current_dir, rel_path)
+
+
+path = relative_path_to_full_path("../resources/valid_dicts")
+
+# far deeper than Python's default recursion limit allows recursing through
+DEPTH = 5000
+
+
+def nested(inner: str, depth: int = DEPTH, opening: str = "{") -> str:
+    return opening * depth + inner + "}" * depth
+
+
+def every_way(runner: TwaddleRunner, sentence: str) -> list[str]:
+    return [
+        runner.run_sentence(sentence),
+        "".join(runner.stream_sentence(sentence)),
+        runner.run_compiled(runner.compile(sentence)),
+        runner.run_sentence_many(sentence, 1)[0],
+    ]
+
+
+@pytest.mark.parametrize(
+    "optimizations", [None, OptimizerPasses(False, False, False, False)]
+)
+def test_deeply_nested_blocks(optimizations):
+    runner = TwaddleRunner(path, optimizations=optimizations)
+    assert every_way(runner, nested("<adj>")) == ["happy"] * 4
+    assert every_way(runner, "x " + nested("y|y") + " z") == ["x y z"] * 4
+
+
+def test_deeply_nested_block_functions():
+    runner = TwaddleRunner(path)
+    sentence = nested("\\a <adj> thing", opening="[rep:1]{")
+    assert every_way(runner, sentence) == ["a happy thing"] * 4
+
+
+def test_deeply_nested_choices():
+    runner = TwaddleRunner(path)
+    sentence = "{a|" * DEPTH + "b" + "}" * DEPTH
+    for result in every_way(runner, sentence):
+        assert result in ("a", "b")
+
+
+def test_tree_transformer_matches_fused_parser():
+    sentence = nested("[rep:2]{<adj>|b}", 100)
+    assert parse_sentence(sentence, fused=False) == parse_sentence(sentence)
+    deep = nested("<adj>")
+    assert count_nodes(parse_sentence(deep, fused=False)) == count_nodes(
+        parse_sentence(deep)
+    )
+
+
+def test_optimizer_on_deep_tree():
+    optimizer = TreeOptimizer()
+    tree = optimizer.optimize(parse_sentence(nested("a")))
+    # single choice blocks without attributes are inlined all the way down
+    assert count_nodes(tree) == 2
+    tree = optimizer.optimize(parse_sentence(nested("a", opening="[rep:1]{")))
+    assert count_nodes(tree) > DEPTH
+
+
+def test_deep_compiled_templates_left_to_interpreter():
+    runner = TwaddleRunner(
+        path, optimizations=OptimizerPasses(False, False, False, False)
+    )
+    template = runner.compile(nested("<adj>", MAX_COMPILED_DEPTH * 2))
+    assert "interpret(" in template.program.source
+    assert runner.run_compiled(template) == "happy"
+    shallow = runner.compile(nested("<adj>", MAX_COMPILED_DEPTH // 2))
+    assert "interpret(" not in shallow.program.source
+
+
+def test_errors_from_deep_inside():
+    runner = TwaddleRunner(path, budget=ExecutionBudget(max_depth=DEPTH + 10))
+    for _ in range(2):
+        with pytest.raises(TwaddleDictionaryException):
+            runner.run_sentence(nested("[rep:1]{<nonexistent>}"))
+    # the blocks left unfinished don't count against the next sentence
+    assert runner.run_sentence(nested("[rep:1]{<adj>}")) == "happy"
+    with pytest.raises(TwaddleBudgetException):
+        runner.run_sentence(nested("[rep:1]{<adj>}", DEPTH + 10))
@@ -0,0 +1,241 @@
+import os
+import random
+
+import pytest
+
+from twaddle.interpreter.interpreter import Interpreter
+from twaddle.interpreter.optimizer import (
+    OptimizerPasses,
+    TreeOptimizer,
+    count_nodes,
+)
+from twaddle.lookup.lookup_manager import LookupManager
+from twaddle.parser.nodes import BlockNode, FunctionNode, RootNode, TextNode
+from twaddle.parser.parsing import parse_sentence
+from twaddle.runner import TwaddleRunner
+
+
+def relative_path_to_full_path(rel_path: str) -> str:
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(current_dir, rel_path)
+
+
+path = relative_path_to_full_path("../resources/valid_dicts")
+no_passes = OptimizerPasses(
+    inline_blocks=False, flatten_roots=False, fold_constants=False, merge_text=False
+)
+
+sentences = [
+    "a|b;c/d",
+    "{hello} {{world}}",
+    r"\a {apple} \a {<adj>} {\a} {banana}",
+    r"\a {\a banana} \A {x}{y}",
+    "[rep:3]{a}{b}[sep:, ]{c}",
+    "{[rep:2]}{a}",
+    "[rep:2][if:1;{x}]{y}",
+    "[rep:3][sep:{[rep:2]}]{a|b}{c}",
+    r"[rep:2]{{[reverse][rep:2]\d}\a }",
+    "[case:sentence]i {am} here. {i}{ think}",
+    "[case:sentence]so i| am",
+    "[hide]{a}{b} [reverse]{abc} [abbr]{Big Old Cat}",
+    "[save:p]{a}[load:p]{b}",
+    "[x:s;locked]{a|b}{c}[x:s]{d|e}",
+    "[//a//:{banana};{A}]",
+    "[add:1;2] [mul:[add:1;1];1.5] [div:1;0] [eq:a;a]",
+    "[case:upper]a [case:[if:1;lower]]B [case:nonsense]c [bool:x]",
+    "[if:[and:1;[not:0]];{yes};no] [rep:[add:1;1]]{a}",
+    r"{\a|{\a}} {apple|pear}",
+]
+
+
+def random_sentence(rng: random.Random, depth: int = 0) -> str:
+    atoms = [
+        "a",
+        "x",
+        "I",
+        "i",
+        " ",
+        ". ",
+        "apple",
+        r"\a ",
+        r"\A ",
+        "<adj>",
+        r"\d",
+        "[rep:2]",
+        "[sep:, ]",
+        "[sep:{-|[rep:2]}]",
+        "[first:(]",
+        "[hide]",
+        "[reverse]",
+        "[case:sentence]",
+        "[case:title]",
+        "[rand:1;3]",
+        "[x:s;deck]",
+        "[while:[lt:[rand:1;10];8]]",
+        "[add:1;[mul:2;3]]",
+        "[rep:[sub:3;1]]",
+        "[case:[if:[rand:0;1];upper;lower]]",
+    ]
+    parts = []
+    for _ in range(rng.randint(1, 5)):
+        kind = rng.random()
+        if depth < 3 and kind < 0.35:
+            choices = [
+                random_sentence(rng, depth + 1)
+                for _ in range(rng.choice([1, 1, 1, 2, 3]))
+            ]
+            parts.append("{" + "|".join(choices) + "}")
+        elif depth < 3 and kind < 0.4:
+            parts.append(f"[if:[rand:0;1];{random_sentence(rng, depth + 1)}]")
+        else:
+            parts.append(rng.choice(atoms))
+    return "".join(parts)
+
+
+def outputs(interpreter: Interpreter, sentence: str) -> list:
+    tree = interpreter.parse(sentence)
+    results = []
+    for seed in range(5):
+        try:
+            with interpreter.seeded(seed):
+                results.append(interpreter.interpret_tree(tree))
+        except Exception as e:
+            results.append(type(e))
+    return results
+
+
+def assert_same_output(sentence: str):
+    unoptimized = TwaddleRunner(path, optimizations=no_passes).interpreter
+    optimized = TwaddleRunner(path).interpreter
+    assert outputs(optimized, sentence) == outputs(unoptimized, sentence), sentence
+
+
+@pytest.mark.parametrize("sentence", sentences)
+def test_optimized_output_matches(sentence: str):
+    assert_same_output(sentence)
+
+
+def test_optimized_output_matches_on_random_sentences():
+    rng = random.Random(9012)
+    for _ in range(300):
+        assert_same_output(random_sentence(rng))
+
+
+def test_single_choice_blocks_inlined():
+    tree = TreeOptimizer().optimize(parse_sentence("{hello} {{world}}"))
+    assert tree == RootNode([TextNode("hello world")])
+
+
+def test_blocks_with_attributes_not_inlined():
+    optimizer = TreeOptimizer()
+    tree = optimizer.optimize(parse_sentence("[rep:2]{a}{b}"))
+    assert isinstance(tree.contents[1], BlockNode)
+    assert tree.contents[2] == TextNode("b")
+    tree = optimizer.optimize(parse_sentence("{[hide]}{a}"))
+    assert isinstance(tree.contents[1], BlockNode)
+
+
+def test_blocks_in_arguments_not_inlined():
+    tree = TreeOptimizer().optimize(parse_sentence("[if:1;{a}]"))
+    function = tree.contents[0]
+    assert isinstance(function, FunctionNode)
+    assert isinstance(function.args[1].contents[0], BlockNode)
+
+
+def test_text_not_merged_into_one_word():
+    tree = TreeOptimizer().optimize(parse_sentence(r"\a {x}{y}"))
+    assert tree.contents[1:] == [TextNode(" x"), TextNode("y")]
+
+
+def test_text_not_merged_with_case():
+    tree = TreeOptimizer().optimize(parse_sentence("[case:sentence]a|b"))
+    assert len(tree.contents) == 4
+
+
+def test_nested_roots_flattened():
+    tree = RootNode([TextNode("a"), RootNode([TextNode("b"), RootNode([])])])
+    optimizer = TreeOptimizer(OptimizerPasses(inline_blocks=False, merge_text=False))
+    assert optimizer.optimize(tree) == RootNode([TextNode("a"), TextNode("b")])
+
+
+def test_passes_can_be_disabled():
+    tree = parse_sentence("{a}|{b}")
+    assert TreeOptimizer(no_passes).optimize(tree) is tree
+    optimizer = TreeOptimizer(OptimizerPasses(merge_text=False))
+    assert optimizer.optimize(tree) == RootNode(
+        [TextNode("a"), TextNode("|"), TextNode("b")]
+    )
+
+
+def test_report():
+    optimizer = TreeOptimizer()
+    tree = parse_sentence("{a}|{b}")
+    optimized = optimizer.optimize(tree)
+    report = optimizer.report()
+    assert report.trees == 1
+    assert report.nodes_before == count_nodes(tree) == 8
+    assert report.nodes_after == count_nodes(optimized) == 2
+    assert report.nodes_removed == 6
+    assert report.removed_by_pass == {
+        "inline_blocks": 4,
+        "flatten_roots": 0,
+        "fold_constants": 0,
+        "merge_text": 2,
+    }
+
+
+def test_runner_report():
+    twaddle_runner = TwaddleRunner(path)
+    assert twaddle_runner.run_sentence("{big <adj>}") == "big happy"
+    assert twaddle_runner.run_sentence("{big <adj>}") == "big happy"
+    report = twaddle_runner.optimization_report()
+    # the second run is served from the parse cache
+    assert report.trees == 1
+    assert report.removed_by_pass["inline_blocks"] == 2
+
+
+def test_plain_text_not_optimized():
+    twaddle_runner = TwaddleRunner(path)
+    for _ in range(3):
+        assert twaddle_runner.run_sentence("a/b; c") == "a/b; c"
+    assert twaddle_runner.interpreter.parse("a/b") == parse_sentence("a/b")
+    assert twaddle_runner.optimization_report().trees == 0
+
+
+def test_nothing_to_rewrite():
+    optimizer = TreeOptimizer()
+    tree = parse_sentence("{a|b} <adj> [rand:1;2]")
+    assert optimizer.optimize(tree) is tree
+    report = optimizer.report()
+    assert report.trees == 1
+    assert report.nodes_before == report.nodes_after == count_nodes(tree)
+
+
+def test_disk_cache_keeps_unoptimized_trees(tmp_path):
+    Interpreter(LookupManager(), parse_cache_dir=tmp_path).parse("{a}")
+    interpreter = Interpreter(
+        LookupManager(), parse_cache_dir=tmp_path, optimizations=no_passes
+    )
+    assert interpreter.parse("{a}") == parse_sentence("{a}")
+    assert interpreter.disk_cache.hits == 1
+
+
+def test_pure_calls_folded():
+    tree = TreeOptimizer().optimize(
+        parse_sentence("total: [and:1;[not:0]]; [eq:a;b] [not:0]")
+    )
+    assert tree == RootNode([TextNode("total: 1; 0 1")])
+
+
+def test_impure_calls_not_folded():
+    optimizer = TreeOptimizer()
+    for sentence in ["[rand:1;1]", "[sync:a;locked]", "[save:a]", "[add:1;2]"]:
+        tree = optimizer.optimize(parse_sentence(sentence))
+        assert isinstance(tree.contents[0], FunctionNode)
+
+
+def test_failing_calls_not_folded():
+    optimizer = TreeOptimizer()
+    for sentence in ["[div:1;0]", "[add:1]", "[add:a;b]"]:
+        tree = optimizer.optimize(parse_sentence(sentence))
+        assert isinstance(tree.contents[0], FunctionNode)
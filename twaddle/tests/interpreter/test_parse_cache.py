@@ -0,0 +1,80 @@
+import pytest
+
+from twaddle.exceptions import TwaddleInterpreterException
+from twaddle.interpreter.interpreter import Interpreter
+from twaddle.interpreter.parse_cache import ParseCache, ParseCacheInfo
+from twaddle.lookup.lookup_manager import LookupManager
+from twaddle.parser.nodes import RootNode, TextNode
+
+
+def test_cache_hit_and_miss_counters():
+    cache = ParseCache(2)
+    tree = RootNode([TextNode("a")])
+    assert cache.get("a") is None
+    cache.put("a", tree)
+    assert cache.get("a") is tree
+    info = cache.info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert info.currsize == 1
+    assert info.maxsize == 2
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ParseCache(2)
+    cache.put("a", RootNode([TextNode("a")]))
+    cache.put("b", RootNode([TextNode("b")]))
+    cache.get("a")
+    cache.put("c", RootNode([TextNode("c")]))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert len(cache) == 2
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ParseCache(0)
+    assert not cache.enabled
+    cache.put("a", RootNode([TextNode("a")]))
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_negative_cache_size_rejected():
+    with pytest.raises(ValueError):
+        ParseCache(-1)
+
+
+def test_clear_resets_counters():
+    cache = ParseCache(2)
+    cache.put("a", RootNode([TextNode("a")]))
+    cache.get("a")
+    cache.get("b")
+    cache.clear()
+    assert cache.info() == ParseCacheInfo(hits=0, misses=0, maxsize=2, currsize=0)
+
+
+def test_interpreter_reuses_parsed_tree():
+    interpreter = Interpreter(LookupManager())
+    assert interpreter.interpret_external("[rep:3]{a}") == "aaa"
+    assert interpreter.interpret_external("[rep:3]{a}") == "aaa"
+    info = interpreter.parse_cache.info()
+    assert info.hits == 1
+    assert info.misses == 1
+    assert interpreter.parse("[rep:3]{a}") is interpreter.parse("[rep:3]{a}")
+
+
+def test_interpreter_without_cache():
+    interpreter = Interpreter(LookupManager(), parse_cache_size=0)
+    assert interpreter.interpret_external("[rep:3]{a}") == "aaa"
+    assert interpreter.interpret_external("[rep:3]{a}") == "aaa"
+    assert interpreter.parse_cache.info().hits == 0
+    assert len(interpreter.parse_cache) == 0
+
+
+def test_parse_errors_are_not_cached():
+    interpreter = Interpreter(LookupManager())
+    for _ in range(2):
+        with pytest.raises(TwaddleInterpreterException):
+            interpreter.interpret_external("{a|b")
+    assert len(interpreter.parse_cache) == 0
@@ -0,0 +1,106 @@
+import os
+from collections import Counter
+from random import Random
+
+import pytest
+
+from twaddle.interpreter.random_source import BufferedRandom, spawn_rng
+from twaddle.runner import TwaddleRunner
+
+
+def relative_path_to_full_path(rel_path: str) -> str:
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(current_dir, rel_path)
+
+
+path = relative_path_to_full_path("../resources/valid_dicts")
+
+
+@pytest.mark.parametrize("bound", [1, 2, 3, 10, 255, 256, 257, 1000])
+def test_randrange_in_range_and_uniform(bound: int):
+    rng = BufferedRandom(1)
+    draws = 200 * bound
+    counts = Counter(rng.randrange(bound) for _ in range(draws))
+    assert set(counts) == set(range(bound))
+    # generous enough never to fail by chance, tight enough to catch the bias
+    # of using every byte modulo the bound
+    assert max(counts.values()) < 200 * 1.4
+    assert min(counts.values()) > 200 * 0.6
+
+
+def test_randrange_with_start_and_step():
+    rng = BufferedRandom(2)
+    assert {rng.randrange(5, 8) for _ in range(200)} == {5, 6, 7}
+    assert {rng.randrange(0, 10, 5) for _ in range(200)} == {0, 5}
+    with pytest.raises(ValueError):
+        rng.randrange(0)
+    with pytest.raises(ValueError):
+        rng.randrange(3, 3)
+
+
+def test_randint():
+    rng = BufferedRandom(3)
+    assert {rng.randint(0, 9) for _ in range(500)} == set(range(10))
+    assert {rng.randint(-2, 2) for _ in range(200)} == {-2, -1, 0, 1, 2}
+    assert rng.randint(4, 4) == 4
+    with pytest.raises(ValueError):
+        rng.randint(2, 1)
+
+
+def test_choice():
+    rng = BufferedRandom(4)
+    items = ["a", "b", "c"]
+    assert {rng.choice(items) for _ in range(100)} == set(items)
+    with pytest.raises(IndexError):
+        rng.choice([])
+
+
+def test_shuffle_is_permutation():
+    rng = BufferedRandom(5)
+    items = list(range(50))
+    orders = set()
+    for _ in range(10):
+        rng.shuffle(items)
+        orders.add(tuple(items))
+        assert sorted(items) == list(range(50))
+    assert len(orders) == 10
+
+
+def test_same_seed_same_draws():
+    def draws(rng: BufferedRandom) -> list[int]:
+        return [rng.randrange(n) for n in range(1, 300)] * 3
+
+    assert draws(BufferedRandom("x")) == draws(BufferedRandom("x"))
+    assert draws(BufferedRandom("x")) != draws(BufferedRandom("y"))
+    rng = BufferedRandom("x")
+    first = draws(rng)
+    rng.seed("x")
+    assert draws(rng) == first
+
+
+def test_state_includes_buffered_draws():
+    rng = BufferedRandom(6)
+    rng.randrange(10)
+    state = rng.getstate()
+    expected = [rng.randrange(10) for _ in range(100)]
+    rng.setstate(state)
+    assert [rng.randrange(10) for _ in range(100)] == expected
+
+
+def test_spawn_with_backend():
+    assert isinstance(spawn_rng(BufferedRandom(1)), BufferedRandom)
+    child = spawn_rng(BufferedRandom(1), Random)
+    assert type(child) is Random
+    assert child.random() == spawn_rng(BufferedRandom(1), Random).random()
+
+
+@pytest.mark.parametrize("backend", [Random, BufferedRandom])
+def test_runner_backends(backend):
+    sentence = "{a|b|c|d} \\d\\d <noun> [rand:1;1000] [rep:4]{[sync:d;deck]{1|2|3}}"
+    runner = TwaddleRunner(path, seed=9, rng_backend=backend)
+    assert isinstance(runner.interpreter.rng, backend)
+    results = runner.run_sentence_many(sentence, 20)
+    assert len(set(results)) > 1
+    again = TwaddleRunner(path, seed=9, rng_backend=backend)
+    assert again.run_sentence_many(sentence, 20) == results
+    assert runner.run_sentence(sentence, seed=1) == again.run_sentence(sentence, seed=1)
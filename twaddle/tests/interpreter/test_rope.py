@@ -0,0 +1,126 @@
+import os
+import random
+import re
+
+import pytest
+
+from twaddle.interpreter.formatter import Formatter
+from twaddle.interpreter.formatting_object import IndefiniteArticle
+from twaddle.interpreter.rope import Rope
+from twaddle.runner import TwaddleRunner
+
+
+def relative_path_to_full_path(rel_path: str) -> str:
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(current_dir, rel_path)
+
+
+path = relative_path_to_full_path("../resources/valid_dicts")
+
+
+def every_way(runner: TwaddleRunner, sentence: str) -> list[str]:
+    return [
+        runner.run_sentence(sentence),
+        "".join(runner.stream_sentence(sentence)),
+        runner.run_compiled(runner.compile(sentence)),
+    ]
+
+
+def test_rope_text():
+    rope = Rope(["ab", Rope(["cd", "", "ef"]), "g"])
+    assert str(rope) == "abcdefg"
+    assert len(rope) == 7
+    assert "".join(rope) == "abcdefg"
+
+
+def test_reversed_rope():
+    inner = Rope(["ab", "cd"])
+    rope = Rope(["x", inner.reversed(), "y"])
+    assert str(rope) == "xdcbay"
+    assert str(rope.reversed()) == "yabcdx"
+    assert str(rope.reversed().reversed()) == "xdcbay"
+    # the reversed rope shares the pieces of the first
+    assert rope.reversed().pieces[0] is rope
+
+
+def test_rope_slices():
+    rope = Rope(["abc", Rope(["def", "gh"]).reversed(), "ij"])
+    text = str(rope)
+    for start in range(-2, len(text) + 2):
+        for stop in range(-2, len(text) + 2):
+            assert str(rope[start:stop]) == text[start:stop]
+    with pytest.raises(ValueError):
+        rope[::2]
+
+
+def test_rope_sub_matches_re_sub():
+    rng = random.Random(1)
+    for _ in range(300):
+        pieces = ["".join(rng.choice("ab c") for _ in range(rng.randint(0, 5)))]
+        for _ in range(rng.randint(0, 4)):
+            piece = "".join(rng.choice("ab c") for _ in range(rng.randint(0, 5)))
+            pieces.append(Rope([piece]).reversed() if rng.random() < 0.5 else piece)
+        rope = Rope(pieces)
+        pattern = rng.choice(["a", "b+", "a|", r"\b", " c", "x"])
+        expected = re.sub(pattern, lambda m: f"<{m[0]}>", str(rope))
+        assert str(rope.sub(pattern, lambda m: f"<{m[0]}>")) == expected
+        assert str(rope.sub(pattern, lambda m: Rope([m[0]]).reversed())) == re.sub(
+            pattern, lambda m: m[0][::-1], str(rope)
+        )
+
+
+def test_rope_first_word_and_last_character():
+    rope = Rope([" ,", "ele", Rope(["tnahp"]).reversed(), "s eat ", "  "])
+    assert rope.first_word() == "elephants"
+    assert rope.last_character() == " "
+    assert rope.last_character(visible=True) == "t"
+    assert Rope([" ", "!"]).first_word() is None
+    assert Rope([" "]).last_character(visible=True) is None
+    # past the characters kept from either end of the rope
+    rope = Rope([" " * 50, Rope([" " * 50, "egg"]).reversed(), "x", " " * 100])
+    assert rope.first_word() == "gge"
+    assert rope.last_character(visible=True) == "x"
+    # long words only need their start
+    rope = Rope(["a" * 1000, " b"])
+    assert rope.first_word().startswith("aaaaaaaa")
+
+
+def test_formatter_from_rope():
+    formatter = Formatter()
+    formatter.append(IndefiniteArticle())
+    formatter.append(" ")
+    formatter += Formatter.from_rope(Rope(["elephant", " "]).reversed())
+    assert formatter.resolve() == "a  tnahpele"
+    formatter = Formatter()
+    formatter.append(IndefiniteArticle())
+    formatter.append(" ")
+    formatter += Formatter.from_rope(Rope([" ", "tnahpele"]).reversed())
+    assert formatter.resolve() == "an elephant "
+
+
+def test_reverse_in_templates():
+    runner = TwaddleRunner(path)
+    assert every_way(runner, "[reverse]{\\a <adj> thing}") == ["gniht yppah a"] * 3
+    assert every_way(runner, "[reverse]{ab[reverse]{cd}ef}") == ["fecdba"] * 3
+    assert (
+        every_way(runner, "[case:title][reverse]{olleh dlrow}") == ["World Hello"] * 3
+    )
+    assert every_way(runner, "\\a [reverse]{tnahpele}") == ["an elephant"] * 3
+
+
+def test_deeply_nested_reverse():
+    runner = TwaddleRunner(path)
+    depth = 5001
+    sentence = "[reverse]{ab" * depth + "c" + "}" * depth
+    # each level reverses everything inside it again
+    text = "c"
+    for _ in range(depth):
+        text = ("ab" + text)[::-1]
+    assert every_way(runner, sentence) == [text] * 3
+
+
+def test_regex_in_templates():
+    runner = TwaddleRunner(path)
+    assert every_way(runner, "[//a//:banana;[match][match]]") == ["baanaanaa"] * 3
+    assert every_way(runner, "[//e+//:[reverse]{eel feet};\\a]") == ["taf la"] * 3
+    assert every_way(runner, "\\a [//x//:xlephant;e]") == ["an elephant"] * 3
@@ -0,0 +1,146 @@
+import os
+import random
+
+import pytest
+
+from twaddle.exceptions import TwaddleException
+from twaddle.interpreter.formatter import Formatter
+from twaddle.interpreter.formatting_object import FormattingStrategy
+from twaddle.runner import TwaddleRunner
+
+
+def relative_path_to_full_path(rel_path: str) -> str:
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(current_dir, rel_path)
+
+
+path = relative_path_to_full_path("../resources/valid_dicts")
+
+sentences = [
+    "hello world",
+    r"\a <adj> \A <noun> {a|b|c} \d\d",
+    "[rep:4][sep:, ][first:(][last:)]{x|y|z}",
+    "[rep:3][sep:{a|b}]{[rep:2]{c|d}|e}",
+    r"[rep:3][sep:\a ]{apple|pear} \a [rep:3]{. }owl",
+    "[while:[lt:[rand:1;10];8];20]{w }",
+    "[x:s;deck]{1|2|3}[x:s]{1|2|3}[x:s]{1|2|3}",
+    "[save:p][hide]{q|w}[load:p] [load:missing;fallback]",
+    "[copy:a][rep:3]{<noun-vehicle>} [reverse][rep:2]{[paste:a]}",
+    "[abbr:lower][rep:2]{Portable Network Graphics }",
+    "[case:sentence]an apple. [rep:5]{i think|so. |\\a owl } [case:title]big {cat|dog}",
+    "[case:upper][rep:3]{a b }[case:lower]C D",
+    "[//[aeiou]//i:<noun>;[match][match]] [//x//:a;b]",
+    "{a|{b|{c|\\a <adj>}}} {\\A <noun-vehicle>|}",
+    "[rep:3]{[sync:z;locked]{a|b}[sync:z]{c|d}}",
+    "",
+]
+
+
+def random_sentence(rng: random.Random, depth: int = 0) -> str:
+    atoms = [
+        "a",
+        "i",
+        " ",
+        ". ",
+        "apple",
+        r"\a ",
+        "<adj>",
+        "[rep:3]",
+        "[sep:, ]",
+        "[sep:\\a ]",
+        "[hide]",
+        "[reverse]",
+        "[case:sentence]",
+        "[case:title]",
+    ]
+    parts = []
+    for _ in range(rng.randint(1, 6)):
+        if depth < 2 and rng.random() < 0.35:
+            choices = [
+                random_sentence(rng, depth + 1) for _ in range(rng.randint(1, 3))
+            ]
+            parts.append("{" + "|".join(choices) + "}")
+        else:
+            parts.append(rng.choice(atoms))
+    return "".join(parts)
+
+
+def outcome(run, sentence: str):
+    try:
+        return run(sentence)
+    except Exception as e:
+        return type(e)
+
+
+def assert_streams_like_run(runner: TwaddleRunner, sentence: str):
+    def run(s: str) -> str:
+        return runner.run_sentence(s, seed)
+
+    def stream(s: str) -> str:
+        return "".join(runner.stream_sentence(s, seed))
+
+    for seed in range(5):
+        expected = outcome(run, sentence)
+        assert outcome(stream, sentence) == expected, sentence
+
+
+@pytest.mark.parametrize("sentence", sentences)
+def test_stream_matches_run(sentence: str):
+    assert_streams_like_run(TwaddleRunner(path), sentence)
+
+
+def test_stream_matches_run_on_random_sentences():
+    runner = TwaddleRunner(path)
+    rng = random.Random(3456)
+    for _ in range(300):
+        assert_streams_like_run(runner, random_sentence(rng))
+
+
+def test_stream_yields_repetitions_as_they_run():
+    runner = TwaddleRunner(path)
+    assert list(runner.stream_sentence("a [rep:3][sep:, ]{b}")) == [
+        "a ",
+        "b, ",
+        "b",
+        ", b",
+    ]
+    first = next(runner.stream_sentence("[rep:1000000]{x}"))
+    assert first == "x"
+
+
+def test_stream_waits_for_articles():
+    runner = TwaddleRunner(path)
+    assert list(runner.stream_sentence(r"x \a [rep:3]{. }owl")) == [
+        "x ",
+        "an . . . owl",
+    ]
+
+
+def test_stream_raises_parse_errors_immediately():
+    runner = TwaddleRunner(path)
+    with pytest.raises(TwaddleException):
+        runner.stream_sentence("{a|b")
+
+
+def test_stream_raises_interpreter_errors_when_reached():
+    runner = TwaddleRunner(path)
+    stream = runner.stream_sentence("ok [nope]")
+    assert next(stream) == "ok "
+    with pytest.raises(TwaddleException):
+        next(stream)
+
+
+def test_resolve_settled():
+    formatter = Formatter()
+    formatter.append(FormattingStrategy.SENTENCE)
+    formatter.append("hello. i ")
+    formatter.add_indefinite_article()
+    formatter.append(" ")
+    assert formatter.resolve_settled() == "Hello. I "
+    formatter.append("owl")
+    assert formatter.resolve_settled() == "an owl"
+    formatter.append(". ")
+    formatter.add_indefinite_article()
+    assert formatter.resolve_settled() == ". "
+    assert formatter.resolve_settled(final=True) == "A"
+    assert formatter.resolve() == ""
@@ -1,11 +1,13 @@
 # pyright: reportPrivateUsage=false
 import os
+import random
 from pathlib import Path
 from typing import OrderedDict
 
 import pytest
 
 from twaddle.exceptions import TwaddleDictionaryException, TwaddleLookupException
+from twaddle.lookup import lookup_dictionary
 from twaddle.lookup.dictionary_file_parser import DictionaryFileParser
 from twaddle.lookup.lookup_dictionary import LookupDictionary
 from twaddle.lookup.lookup_entry import DictionaryEntry
@@ -72,6 +74,7 @@ def test_label_positive():
     dictionary = LookupDictionary("noun", ["singular", "plural"])
     dictionary.add(["thing", "things"], {"tag1"})
     dictionary.add(["hexagon", "hexagons"], {"tag2"})
+    labels: dict[str, DictionaryEntry] = {}
     assert (
         dictionary._get(
             LookupNode(
@@ -79,7 +82,8 @@ def test_label_positive():
                 form="singular",
                 positive_tags={"tag1"},
                 positive_label="tests",
-            )
+            ),
+            labels=labels,
         )
         == "thing"
     )
@@ -90,7 +94,8 @@ def test_label_positive():
                     dictionary="noun",
                     form="singular",
                     positive_label="tests",
-                )
+                ),
+                labels=labels,
             )
             == "thing"
         )
@@ -100,6 +105,7 @@ def test_labels_negative():
     dictionary = LookupDictionary("noun", ["singular", "plural"])
     dictionary.add(["thing", "things"], {"tag1"})
     dictionary.add(["hexagon", "hexagons"], {"tag2"})
+    labels: dict[str, DictionaryEntry] = {}
     assert (
         dictionary._get(
             LookupNode(
@@ -107,7 +113,8 @@ def test_labels_negative():
                 form="singular",
                 positive_tags={"tag1"},
                 positive_label="tests",
-            )
+            ),
+            labels=labels,
         )
         == "thing"
     )
@@ -116,22 +123,25 @@ def test_labels_negative():
             dictionary._get(
                 LookupNode(
                     dictionary="noun", form="singular", negative_labels={"tests"}
-                )
+                ),
+                labels=labels,
             )
             == "hexagon"
         )
         # just to check no problems with undefined labels
         assert dictionary._get(
-            LookupNode(dictionary="noun", form="singular", negative_labels={"hat"})
+            LookupNode(dictionary="noun", form="singular", negative_labels={"hat"}),
+            labels=labels,
         )
-    dictionary.clear_labels()
+    labels.clear()
     results_after_clearing = list[str]()
     for _ in range(0, 50):
         results_after_clearing.append(
             dictionary._get(
                 LookupNode(
                     dictionary="noun", form="singular", negative_labels={"tests"}
-                )
+                ),
+                labels=labels,
             )
         )
     assert "thing" in results_after_clearing
@@ -141,6 +151,7 @@ def test_label_overwrite():
     dictionary = LookupDictionary("noun", ["singular", "plural"])
     dictionary.add(["thing", "things"], {"tag1"})
     dictionary.add(["hexagon", "hexagons"], {"tag2"})
+    labels: dict[str, DictionaryEntry] = {}
     assert (
         dictionary._get(
             LookupNode(
@@ -148,7 +159,8 @@ def test_label_overwrite():
                 form="singular",
                 positive_tags={"tag1"},
                 positive_label="tests",
-            )
+            ),
+            labels=labels,
         )
         == "thing"
     )
@@ -159,7 +171,8 @@ def test_label_overwrite():
                 form="singular",
                 positive_tags={"tag1"},
                 positive_label="moretests",
-            )
+            ),
+            labels=labels,
         )
         == "thing"
     )
@@ -171,8 +184,8 @@ def test_label_overwrite():
         dictionary="noun", form="singular", positive_label="moretests"
     )
     for _ in range(0, 5):
-        assert dictionary._get(first_by_label) == "thing"
-        assert dictionary._get(second_by_label) == "thing"
+        assert dictionary._get(first_by_label, labels=labels) == "thing"
+        assert dictionary._get(second_by_label, labels=labels) == "thing"
     assert (
         dictionary._get(
             LookupNode(
@@ -180,13 +193,14 @@ def test_label_overwrite():
                 form="singular",
                 positive_tags={"tag2"},
                 redefine_labels={"tests", "moretests"},
-            )
+            ),
+            labels=labels,
         )
         == "hexagon"
     )
     for _ in range(0, 5):
-        assert dictionary._get(first_by_label) == "hexagon"
-        assert dictionary._get(second_by_label) == "hexagon"
+        assert dictionary._get(first_by_label, labels=labels) == "hexagon"
+        assert dictionary._get(second_by_label, labels=labels) == "hexagon"
 
 
 def test_dictionary_attributes_from_lines():
@@ -205,7 +219,7 @@ def test_dictionary_read_from_file_simple():
     dictionary = factory.read_from_path(path)
     assert isinstance(dictionary, LookupDictionary)
     assert dictionary.name == "adj"
-    assert dictionary.forms == ["adj", "ness"]
+    assert dictionary.forms == ("adj", "ness")
     assert dictionary._get(LookupNode("adj")) == "happy"
     assert dictionary._get(LookupNode("adj", form="ness")) == "happiness"
     assert dictionary._get(LookupNode("adj")) == "happy"
@@ -219,7 +233,7 @@ def test_dictionary_read_from_file_with_classes():
     dictionary = factory.read_from_path(path)
     assert dictionary is not None
     assert dictionary.name == "noun"
-    assert dictionary.forms == ["singular", "plural"]
+    assert dictionary.forms == ("singular", "plural")
     assert dictionary._get(LookupNode("noun", positive_tags={"shape"})) == "hexagon"
     assert dictionary._get(LookupNode("noun", positive_tags={"animal"})) == "dog"
     assert (
@@ -280,6 +294,20 @@ def test_lookup_from_object():
     assert lookup_manager[lookup.dictionary].get(lookup) == "happy"
 
 
+def test_lookup_without_random_source(monkeypatch):
+    path = relative_path_to_full_path("../resources/valid_dicts")
+    lookup_manager = LookupManager()
+    lookup_manager.add_dictionaries_from_folder(path)
+    dictionary = lookup_manager["noun"]
+    lookup = LookupNode("noun")
+    expected_rng = random.Random(3)
+    expected = [dictionary.get(lookup, rng=expected_rng) for _ in range(20)]
+    # every call without one draws from the same stream
+    monkeypatch.setattr(lookup_dictionary, "DEFAULT_RNG", random.Random(3))
+    assert [dictionary.get(lookup) for _ in range(20)] == expected
+    assert len(set(expected)) > 1
+
+
 def test_lookup_indefinite_article():
     path = relative_path_to_full_path("../resources/valid_dicts")
     lookup_manager = LookupManager()
@@ -333,16 +361,19 @@ def test_standard_compiler_prints_something_when_antimatch_exhausts_all_options(
     path = relative_path_to_full_path("../resources/valid_dicts")
     lookup_manager = LookupManager()
     lookup_manager.add_dictionaries_from_folder(path)
+    labels: dict[str, DictionaryEntry] = {}
     assert (
         lookup_manager[LookupNode("noun").dictionary].get(
-            LookupNode("noun", positive_tags={"shape"}, positive_label="a")
+            LookupNode("noun", positive_tags={"shape"}, positive_label="a"),
+            labels=labels,
         )
         == "hexagon"
     )
     # result is random and arbitrary, simply ensure no exception is raised
     # and that _something_ is returned
     value = lookup_manager["noun"].get(
-        LookupNode("noun", positive_tags={"shape"}, negative_labels={"a"})
+        LookupNode("noun", positive_tags={"shape"}, negative_labels={"a"}),
+        labels=labels,
     )
     assert value is not None
 
@@ -351,15 +382,18 @@ def test_strict_compiler_raises_when_antimatch_exhausts_all_options():
     path = relative_path_to_full_path("../resources/valid_dicts")
     lookup_manager = LookupManager()
     lookup_manager.add_dictionaries_from_folder(path)
+    labels: dict[str, DictionaryEntry] = {}
     assert (
         lookup_manager["noun"].get(
-            LookupNode("noun", positive_tags={"shape"}, positive_label="a"), strict=True
+            LookupNode("noun", positive_tags={"shape"}, positive_label="a"),
+            strict=True,
+            labels=labels,
         )
         == "hexagon"
     )
     strict_lookup = LookupNode("noun", positive_tags={"shape"}, negative_labels={"a"})
     with pytest.raises(TwaddleLookupException) as e_info:
-        lookup_manager["noun"].get(strict_lookup, strict=True)
+        lookup_manager["noun"].get(strict_lookup, strict=True, labels=labels)
     assert (
         str(e_info.value)
         == "[LookupDictionary._valid_choices_for_strictness_level] no valid choices for"
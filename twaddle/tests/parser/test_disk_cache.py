@@ -0,0 +1,63 @@
+import pytest
+
+from twaddle.interpreter.interpreter import Interpreter
+from twaddle.lookup.lookup_manager import LookupManager
+from twaddle.parser import disk_cache
+from twaddle.parser.disk_cache import DiskParseCache, decode_tree, encode_tree
+from twaddle.parser.parsing import parse_sentence
+
+sentences = [
+    "hello world",
+    r"\a {apple|\A pear} [rep:3][sep:, ]{x|y|\d}",
+    "<noun.plural-building-!small::=a> <noun::!=a> <noun::^=b>",
+    "[//[aeiou]//i:<noun>;[match][match]]",
+    "[if:[eq:1;1];yes;{no|never}] a|b;c/d",
+]
+
+
+@pytest.mark.parametrize("sentence", sentences)
+def test_round_trip_gives_identical_tree(sentence: str):
+    tree = parse_sentence(sentence)
+    assert decode_tree(encode_tree(tree)) == tree
+
+
+def test_warm_start_skips_parser(tmp_path):
+    sentence = "[rep:3]{a}"
+    cold = Interpreter(LookupManager(), parse_cache_dir=tmp_path)
+    assert cold.interpret_external(sentence) == "aaa"
+    assert cold.disk_cache is not None
+    assert cold.disk_cache.misses == 1
+
+    warm = Interpreter(LookupManager(), parse_cache_dir=tmp_path)
+    assert warm.interpret_external(sentence) == "aaa"
+    assert warm.disk_cache is not None
+    assert warm.disk_cache.hits == 1
+    assert warm.disk_cache.misses == 0
+
+
+def test_entries_for_other_grammar_are_invalidated(tmp_path, monkeypatch):
+    cache = DiskParseCache(tmp_path)
+    tree = parse_sentence("{a|b}")
+    cache.put("{a|b}", tree)
+    assert cache.get("{a|b}") == tree
+
+    monkeypatch.setattr(disk_cache, "grammar_version", lambda: "changed")
+    new_cache = DiskParseCache(tmp_path)
+    assert new_cache.get("{a|b}") is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = DiskParseCache(tmp_path)
+    cache.put("hello", parse_sentence("hello"))
+    (entry,) = tmp_path.iterdir()
+    entry.write_bytes(b"not marshal data")
+    assert cache.get("hello") is None
+    assert cache.misses == 1
+
+
+def test_clear(tmp_path):
+    cache = DiskParseCache(tmp_path)
+    cache.put("hello", parse_sentence("hello"))
+    cache.clear()
+    assert cache.get("hello") is None
@@ -0,0 +1,119 @@
+import random
+
+import pytest
+
+from twaddle.parser.lexer import TwaddleLexer
+from twaddle.parser.parsing import get_tree_parser, parse_sentence
+from twaddle.parser.twaddle_parser import UnexpectedInput
+
+sentences = [
+    "hello world",
+    "a|b;c/d",
+    r"\a {apple|\A pear} [rep:3][sep:, ]{x|y|\d}",
+    "<noun.plural-building-!small::=a> <noun::!=a> <noun::^=b>",
+    "[//[aeiou]//i:<noun>;[match][match]]",
+    "[//a;b|c d\\;e/f//:x;y]",
+    "[if:[eq:1;1];yes;{no|never}] a|b;c/d",
+    r"\\ \; \< \n {} {|} [x:] [x:;] [//a\;b//:c;d]",
+    "first line\nsecond {line\n|row}\n\nfourth <noun>",
+    "",
+]
+
+invalid_sentences = [
+    "{a|b",
+    "[rep:3",
+    "<noun",
+    "<noun tag>",
+    "a}b",
+    "[function name]",
+    "\\q",
+    "line\n<noun::=a label>",
+]
+
+
+def random_sentences(count: int) -> list[str]:
+    rng = random.Random(5678)
+    alphabet = list("ab {}[]<>|;:/\\.-=!^ \n") + [
+        "[rep:",
+        "<noun",
+        "\\a",
+        "[//",
+        "//i:",
+    ]
+    return [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+        for _ in range(count)
+    ]
+
+
+def token_stream(sentence: str, lark_lexer: bool) -> list:
+    """Every token the lexer produces as the sentence is parsed, with its
+    position, followed by the details of any error."""
+    interactive = get_tree_parser(lark_lexer).parse_interactive(sentence)
+    stream = []
+    try:
+        for token in interactive.iter_parse():
+            stream.append(
+                (
+                    token.type,
+                    token.value,
+                    token.start_pos,
+                    token.line,
+                    token.column,
+                    token.end_line,
+                    token.end_column,
+                    token.end_pos,
+                )
+            )
+    except UnexpectedInput as e:
+        stream.append(
+            (
+                type(e).__name__,
+                e.line,
+                e.column,
+                getattr(e, "token", None),
+                getattr(e, "expected", None),
+                getattr(e, "allowed", None),
+            )
+        )
+    return stream
+
+
+def test_parsers_use_expected_lexers():
+    assert isinstance(get_tree_parser().parser.lexer, TwaddleLexer)
+    assert not isinstance(get_tree_parser(lark_lexer=True).parser.lexer, TwaddleLexer)
+
+
+@pytest.mark.parametrize("sentence", sentences + invalid_sentences)
+def test_token_streams_match(sentence: str):
+    assert token_stream(sentence, False) == token_stream(sentence, True)
+
+
+def test_token_streams_match_on_random_sentences():
+    for sentence in random_sentences(1000):
+        assert token_stream(sentence, False) == token_stream(sentence, True), sentence
+
+
+def test_terminals_are_tried_in_lark_order():
+    lark_lexer = get_tree_parser(lark_lexer=True).parser.lexer
+    twaddle_lexer = get_tree_parser().parser.lexer
+    for state, lexer in lark_lexer.lexers.items():
+        match, retype = twaddle_lexer.scanner_for(state)
+        expected = [t.name for t in lexer.scanner.terminals]
+        assert list(match.__self__.groupindex) == expected
+        assert set(retype) == set(lexer.callback)
+
+
+@pytest.mark.parametrize("sentence", sentences)
+def test_trees_match(sentence: str):
+    assert parse_sentence(sentence) == parse_sentence(sentence, lark_lexer=True)
+
+
+@pytest.mark.parametrize("sentence", invalid_sentences)
+def test_errors_match(sentence: str):
+    errors = []
+    for lark_lexer in (False, True):
+        with pytest.raises(Exception) as e_info:
+            parse_sentence(sentence, lark_lexer=lark_lexer)
+        errors.append((type(e_info.value), str(e_info.value)))
+    assert errors[0] == errors[1]
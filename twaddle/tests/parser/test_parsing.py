@@ -0,0 +1,161 @@
+import random
+import subprocess
+import sys
+
+import pytest
+
+from twaddle.exceptions import TwaddleInterpreterException
+from twaddle.parser.nodes import RootNode, TextNode
+from twaddle.parser.parser_snapshot import load_snapshot, save_snapshot
+from twaddle.parser.parsing import (
+    build_parser,
+    get_parser,
+    get_transformer,
+    get_tree_parser,
+    markup_spans,
+    parse_sentence,
+    parse_with_lark,
+)
+
+sentences = [
+    "hello world",
+    r"\a {apple|\A pear} [rep:3][sep:, ]{x|y|\d}",
+    "<noun.plural-building-!small::=a> <noun::!=a> <noun::^=b>",
+    "[//[aeiou]//i:<noun>;[match][match]]",
+    "[if:[eq:1;1];yes;{no|never}] a|b;c/d",
+    r"\\ \; \< \n {} {|} [x:] [x:;] [//a\;b//:c;d]",
+    "",
+]
+
+
+def random_sentences(count: int) -> list[str]:
+    rng = random.Random(1234)
+    alphabet = list("ab {}[]<>|;:/\\.-=!^ ") + ["[rep:", "<noun", "\\a", "[//", "::="]
+    return [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        for _ in range(count)
+    ]
+
+
+def parse_or_error(sentence: str, fused: bool):
+    try:
+        return parse_sentence(sentence, fused=fused)
+    except TwaddleInterpreterException as e:
+        return str(e)
+
+
+def lark_parse_or_error(sentence: str):
+    try:
+        return parse_with_lark(sentence)
+    except Exception:
+        return "error"
+
+
+def mostly_literal_sentences(count: int) -> list[str]:
+    rng = random.Random(4321)
+    literal = ["lorem ", "ipsum", "; ", "|", "/", ", dolor "]
+    markup = ["{a|b}", "<noun>", "[rep:2]{x}", "\\a", "\\;", "{", "}", "]", "<"]
+    return [
+        "".join(
+            rng.choice(markup) if rng.random() < 0.1 else rng.choice(literal)
+            for _ in range(rng.randint(0, 60))
+        )
+        for _ in range(count)
+    ]
+
+
+def test_importing_runner_does_not_build_parser():
+    code = (
+        "import sys, twaddle.runner; "
+        "print('twaddle.parser.twaddle_parser' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_parser_is_built_once():
+    assert get_parser() is get_parser()
+    assert get_tree_parser() is get_tree_parser()
+    assert get_transformer() is get_transformer()
+
+
+@pytest.mark.parametrize("sentence", sentences)
+def test_fused_parse_matches_two_pass_parse(sentence: str):
+    assert parse_sentence(sentence, fused=True) == parse_sentence(sentence, fused=False)
+
+
+def test_fused_parse_matches_two_pass_parse_on_random_input():
+    for sentence in random_sentences(500):
+        assert parse_or_error(sentence, fused=True) == parse_or_error(
+            sentence, fused=False
+        ), sentence
+
+
+@pytest.mark.parametrize("sentence", sentences)
+def test_packaged_snapshot_matches_generated_parser(sentence: str):
+    snapshot = load_snapshot()
+    assert snapshot is not None
+    assert snapshot.parse(sentence) == build_parser().parse(sentence)
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = tmp_path / "parser.snapshot"
+    save_snapshot(build_parser(), path)
+    loaded = load_snapshot(path)
+    assert loaded is not None
+    assert loaded.parse("{a|b}") == parse_sentence("{a|b}", fused=False)
+
+
+def test_invalid_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "parser.snapshot"
+    path.write_bytes(b"rubbish")
+    assert load_snapshot(path) is None
+    assert load_snapshot(tmp_path / "missing.snapshot") is None
+
+
+def test_parse_error_message():
+    with pytest.raises(TwaddleInterpreterException) as e_info:
+        parse_sentence("{a|b")
+    assert str(e_info.value).startswith("Unclosed block - missing '}'")
+
+
+@pytest.mark.parametrize("sentence", sentences)
+def test_fast_path_matches_full_parse(sentence: str):
+    assert parse_sentence(sentence) == parse_with_lark(sentence)
+
+
+def test_fast_path_matches_full_parse_on_random_sentences():
+    for sentence in random_sentences(500) + mostly_literal_sentences(300):
+        tree = lark_parse_or_error(sentence)
+        if tree == "error":
+            with pytest.raises(TwaddleInterpreterException):
+                parse_sentence(sentence)
+        else:
+            assert parse_sentence(sentence) == tree, sentence
+
+
+def test_plain_text_is_split_like_the_lexer():
+    assert parse_sentence("") == RootNode([])
+    assert parse_sentence("a|b;c/d") == RootNode(
+        [TextNode(t) for t in ["a", "|", "b", ";", "c", "/", "d"]]
+    )
+
+
+def test_markup_spans():
+    assert markup_spans("plain") == []
+    assert markup_spans("a {b} c") == [(2, 5)]
+    assert markup_spans("{a}b<c>") == [(0, 7)]
+    literal = ";" * 10
+    assert markup_spans(f"{{a}}{literal}{{b}}") == [(0, 3), (13, 16)]
+    assert markup_spans(r"x \a") == [(2, 4)]
+    assert markup_spans("{a") is None
+    assert markup_spans("a}") is None
+
+
+def test_fast_path_reports_errors_against_whole_sentence():
+    literal = "lorem; ipsum; " * 10
+    with pytest.raises(TwaddleInterpreterException) as e_info:
+        parse_sentence(f"{literal}{{a}}{literal}{{a|b")
+    assert str(e_info.value).startswith("Unclosed block - missing '}'")
@@ -0,0 +1,172 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from twaddle.async_runner import AsyncTwaddleRunner
+from twaddle.exceptions import TwaddleException
+from twaddle.interpreter.context import TwaddleContext
+from twaddle.runner import TwaddleRunner
+
+
+def relative_path_to_full_path(rel_path: str) -> str:
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(current_dir, rel_path)
+
+
+path = relative_path_to_full_path("../resources/valid_dicts")
+
+
+def test_create_and_run():
+    async def main():
+        async with await AsyncTwaddleRunner.create(path) as runner:
+            assert await runner.run_sentence("<noun-building-large>") == "factory"
+            template = await runner.compile("[rep:2]{<adj>}")
+            assert await runner.run_compiled(template) == "happyhappy"
+
+    asyncio.run(main())
+
+
+def test_runner_options_passed_on():
+    async def main():
+        runner = await AsyncTwaddleRunner.create(path, persistent_labels=True)
+        assert runner.runner.interpreter.context.persistent_labels
+        runner.close()
+
+    asyncio.run(main())
+
+
+def test_errors_raised():
+    async def main():
+        async with AsyncTwaddleRunner(TwaddleRunner(path)) as runner:
+            with pytest.raises(TwaddleException):
+                await runner.run_sentence("{a|b")
+
+    asyncio.run(main())
+
+
+def test_add_dictionaries(tmp_path):
+    async def main():
+        async with await AsyncTwaddleRunner.create(tmp_path) as runner:
+            await runner.add_dictionaries_from_folder(path)
+            assert await runner.run_sentence("<noun-building-large>") == "factory"
+
+    asyncio.run(main())
+
+
+def test_event_loop_not_blocked():
+    async def main():
+        async with AsyncTwaddleRunner(TwaddleRunner(path)) as runner:
+            render = asyncio.create_task(runner.run_sentence("[rep:20000]{x}"))
+            ticks = 0
+            while not render.done():
+                ticks += 1
+                await asyncio.sleep(0.001)
+            assert len(await render) == 20000
+            assert ticks > 1
+
+    asyncio.run(main())
+
+
+def test_run_sentence_many():
+    async def main():
+        async with AsyncTwaddleRunner(TwaddleRunner(path)) as runner:
+            results = await runner.run_sentence_many("{a|b}", 50)
+            assert len(results) == 50
+            assert set(results) == {"a", "b"}
+            results = await runner.run_sentence_many(
+                "[sync:s;locked]{a|b|c}", 20, reset_between=False
+            )
+            assert len(set(results)) == 1
+
+    asyncio.run(main())
+
+
+def test_cancel_batch(monkeypatch):
+    rendered = []
+    # counts the sentences the batch actually generates
+    monkeypatch.setattr(
+        TwaddleContext, "clear_labels", lambda self: rendered.append(None)
+    )
+
+    async def main():
+        async with AsyncTwaddleRunner(TwaddleRunner(path)) as runner:
+            batch = asyncio.create_task(runner.run_sentence_many("[rep:50]{x}", 10**6))
+            while not rendered:
+                await asyncio.sleep(0.001)
+            batch.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await batch
+            # the runner is free again once the batch stops
+            assert await runner.run_sentence("done") == "done"
+
+    asyncio.run(main())
+    assert len(rendered) < 10**6
+
+
+def test_backpressure():
+    release = threading.Event()
+    started = []
+
+    def slow(sentence: str, seed=None) -> str:
+        started.append(sentence)
+        release.wait(5)
+        return sentence
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            runner = AsyncTwaddleRunner(TwaddleRunner(path), executor, max_pending=2)
+            runner.runner.run_sentence = slow
+            calls = [asyncio.create_task(runner.run_sentence(str(i))) for i in range(5)]
+            while runner.pending < 2:
+                await asyncio.sleep(0.001)
+            await asyncio.sleep(0.01)
+            assert runner.pending == 2
+            # the executor's threads use the runner at the same time
+            assert len(started) == 2
+            calls[4].cancel()
+            release.set()
+            results = await asyncio.gather(*calls, return_exceptions=True)
+        assert results[:4] == ["0", "1", "2", "3"]
+        assert isinstance(results[4], asyncio.CancelledError)
+        assert "4" not in started
+
+    asyncio.run(main())
+
+
+def test_cancelled_call_pending_until_finished():
+    release = threading.Event()
+    started = []
+
+    def slow(sentence: str, seed=None) -> str:
+        started.append(sentence)
+        release.wait(5)
+        return sentence
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            runner = AsyncTwaddleRunner(TwaddleRunner(path), executor, max_pending=1)
+            runner.runner.run_sentence = slow
+            running = asyncio.create_task(runner.run_sentence("0"))
+            while not started:
+                await asyncio.sleep(0.001)
+            running.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await running
+            # still running in the executor, so still holding its slot
+            assert runner.pending == 1
+            waiting = asyncio.create_task(runner.run_sentence("1"))
+            await asyncio.sleep(0.01)
+            assert started == ["0"]
+            release.set()
+            assert await waiting == "1"
+            assert runner.pending == 0
+
+    asyncio.run(main())
+
+
+def test_max_pending_must_be_positive():
+    with pytest.raises(ValueError):
+        AsyncTwaddleRunner(TwaddleRunner(path), max_pending=0)
@@ -0,0 +1,70 @@
+import os
+from types import GeneratorType
+
+import pytest
+
+from twaddle.exceptions import TwaddleException
+from twaddle.runner import TwaddleRunner
+
+
+def relative_path_to_full_path(rel_path: str) -> str:
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(current_dir, rel_path)
+
+
+path = relative_path_to_full_path("../resources/valid_dicts")
+
+
+def test_run_sentence_many_matches_run_sentence():
+    sentence = "\\a <adj> {cat|dog|owl} [rep:2][sep:, ]{x|y} <noun::=a> <noun::=a>"
+    runner = TwaddleRunner(path, seed=1)
+    expected = [runner.run_sentence(sentence) for _ in range(20)]
+    runner = TwaddleRunner(path, seed=1)
+    assert runner.run_sentence_many(sentence, 20) == expected
+
+
+def test_iter_sentence_many_is_lazy():
+    runner = TwaddleRunner(path)
+    results = runner.iter_sentence_many("{a|b}", 3)
+    assert isinstance(results, GeneratorType)
+    assert len(list(results)) == 3
+
+
+def test_parse_errors_raised_immediately():
+    runner = TwaddleRunner(path)
+    with pytest.raises(TwaddleException):
+        runner.iter_sentence_many("{a|b", 3)
+
+
+def test_negative_count_raises():
+    runner = TwaddleRunner(path)
+    with pytest.raises(ValueError):
+        runner.run_sentence_many("a", -1)
+    assert runner.run_sentence_many("a", 0) == []
+
+
+def test_labels_and_synchronizers_reset_between_items():
+    runner = TwaddleRunner(path, seed=0)
+    results = runner.run_sentence_many("<noun::=a>[sync:s;locked]{1|2|3}", 50)
+    assert len(set(results)) > 1
+
+
+def test_labels_and_synchronizers_kept_between_items():
+    runner = TwaddleRunner(path, seed=0)
+    results = runner.run_sentence_many(
+        "<noun::=a>[sync:s;locked]{1|2|3}", 50, reset_between=False
+    )
+    assert len(set(results)) == 1
+    # a later sentence starts afresh
+    results += runner.run_sentence_many(
+        "<noun::=a>[sync:s;locked]{1|2|3}", 50, reset_between=False
+    )
+    assert len(set(results)) > 1
+
+
+def test_other_state_reset_between_items():
+    runner = TwaddleRunner(path)
+    results = runner.run_sentence_many(
+        "[load:p;none] [save:p]{saved} [rep:2]", 3, reset_between=False
+    )
+    assert results == ["none saved "] * 3
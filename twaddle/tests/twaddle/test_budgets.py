@@ -0,0 +1,148 @@
+import os
+
+import pytest
+
+from twaddle.exceptions import TwaddleBudgetException, TwaddleException
+from twaddle.interpreter import budget
+from twaddle.interpreter.budget import CLOCK_CHECK_INTERVAL, ExecutionBudget
+from twaddle.parallel import ParallelTwaddleRunner
+from twaddle.runner import TwaddleRunner
+
+
+def relative_path_to_full_path(rel_path: str) -> str:
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(current_dir, rel_path)
+
+
+path = relative_path_to_full_path("../resources/valid_dicts")
+
+# calls a pattern which loads itself, so never finishes
+recursive = "[save:p][hide]{[load:p;x]}[load:p]"
+
+
+def every_way(runner: TwaddleRunner, sentence: str):
+    yield lambda: runner.run_sentence(sentence)
+    yield lambda: "".join(runner.stream_sentence(sentence))
+    yield lambda: runner.run_compiled(runner.compile(sentence))
+    yield lambda: runner.run_sentence_many(sentence, 2)[1]
+
+
+def test_budget_exception_is_twaddle_exception():
+    assert issubclass(TwaddleBudgetException, TwaddleException)
+
+
+def test_max_steps():
+    runner = TwaddleRunner(path, budget=ExecutionBudget(max_steps=1000))
+    for run in every_way(runner, "[rep:100000]{a|b}"):
+        with pytest.raises(TwaddleBudgetException):
+            run()
+    for run in every_way(runner, "[rep:100]{a|b}"):
+        assert len(run()) >= 100
+
+
+def test_steps_counted_per_sentence():
+    runner = TwaddleRunner(path, budget=ExecutionBudget(max_steps=500))
+    sentence = "[rep:100]{<adj>}"
+    for _ in range(10):
+        runner.run_sentence(sentence)
+    assert len(runner.run_sentence_many(sentence, 10)) == 10
+
+
+def test_while_loop_counted():
+    runner = TwaddleRunner(path, budget=ExecutionBudget(max_steps=1000))
+    with pytest.raises(TwaddleBudgetException):
+        runner.run_sentence("[while:1;1000000]{}")
+
+
+def test_max_output():
+    runner = TwaddleRunner(path, budget=ExecutionBudget(max_output=10000))
+    sentence = "[rep:100]{[rep:100]{[rep:100]{abc}}}"
+    for run in every_way(runner, sentence):
+        with pytest.raises(TwaddleBudgetException):
+            run()
+        # stopped long before building the whole three million characters,
+        # a million steps away
+        assert runner.interpreter.context.budget.steps < 2 * 10000
+    for run in every_way(runner, "[rep:100]{[rep:10]{abcdefghi}}"):
+        assert len(run()) == 9000
+
+
+def test_hidden_output_counted():
+    runner = TwaddleRunner(path, budget=ExecutionBudget(max_output=1000))
+    with pytest.raises(TwaddleBudgetException):
+        runner.run_sentence("[hide][rep:2000]{x}")
+
+
+def test_doubling_copies_counted():
+    runner = TwaddleRunner(path, budget=ExecutionBudget(max_output=1000000))
+    with pytest.raises(TwaddleBudgetException):
+        runner.run_sentence("[copy:a]{x}[rep:100]{[copy:a]{[paste:a][paste:a]}}")
+
+
+def test_max_depth():
+    runner = TwaddleRunner(path, budget=ExecutionBudget(max_depth=20))
+    for run in every_way(runner, recursive):
+        with pytest.raises(TwaddleBudgetException):
+            run()
+    nested = "[rep:1]{" * 20 + "a" + "}" * 20
+    assert runner.run_sentence(nested) == "a"
+    with pytest.raises(TwaddleBudgetException):
+        runner.run_sentence("[rep:1]{" + nested + "}")
+    # the count goes back down as blocks finish
+    assert runner.run_sentence(nested * 3) == "aaa"
+
+
+class FakeClock:
+    """Moves on by a second each time it is read."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.reads = 0
+
+    def __call__(self) -> float:
+        self.reads += 1
+        self.now += 1
+        return self.now
+
+
+def test_timeout(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(budget, "monotonic", clock)
+    runner = TwaddleRunner(path, budget=ExecutionBudget(timeout=49.5))
+    # the context is created before counting, as creating it reads the clock
+    context = runner.interpreter.context
+    for run in every_way(runner, "[rep:100000000]{<adj>}"):
+        clock.reads = 0
+        with pytest.raises(TwaddleBudgetException):
+            run()
+        # read as the sentence starts, then every CLOCK_CHECK_INTERVAL steps
+        # until the 50th check finds the time up
+        assert clock.reads == 51
+        assert context.budget.steps == 50 * CLOCK_CHECK_INTERVAL
+    assert runner.run_sentence("<adj>") == "happy"
+
+
+def test_state_usable_after_budget_exceeded():
+    runner = TwaddleRunner(path, budget=ExecutionBudget(max_depth=20, max_steps=2000))
+    with pytest.raises(TwaddleBudgetException):
+        runner.run_sentence(recursive)
+    nested = "[rep:1]{" * 20 + "a" + "}" * 20
+    assert runner.run_sentence(nested) == "a"
+    stream = runner.stream_sentence("[rep:100000]{a}")
+    assert next(stream) == "a"
+    stream.close()
+    assert runner.run_sentence(nested) == "a"
+
+
+def test_no_budget_by_default():
+    runner = TwaddleRunner(path)
+    assert len(runner.run_sentence("[rep:300]{[rep:300]{a}}")) == 90000
+
+
+def test_budget_in_worker_processes():
+    with ParallelTwaddleRunner(
+        path, workers=1, budget=ExecutionBudget(max_steps=1000)
+    ) as runner:
+        assert runner.run_sentence_many("[rep:10]{a}", 3, seed=1) == ["a" * 10] * 3
+        with pytest.raises(TwaddleBudgetException):
+            runner.run_sentence_many("[rep:100000]{a}", 3, seed=1)
@@ -0,0 +1,59 @@
+import os
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from twaddle.compiled_template import CompiledTemplate
+from twaddle.exceptions import TwaddleInterpreterException
+from twaddle.runner import TwaddleRunner
+
+
+def relative_path_to_full_path(rel_path: str) -> str:
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(current_dir, rel_path)
+
+
+path = relative_path_to_full_path("../resources/valid_dicts")
+
+
+def test_compile_and_render():
+    runner = TwaddleRunner(path)
+    template = runner.compile("hello <adj> [rep:2]{world}")
+    assert isinstance(template, CompiledTemplate)
+    assert template.sentence == "hello <adj> [rep:2]{world}"
+    assert runner.run_compiled(template) == "hello happy worldworld"
+    assert template.render(runner) == "hello happy worldworld"
+
+
+def test_compiled_template_is_immutable():
+    runner = TwaddleRunner(path)
+    template = runner.compile("hello")
+    with pytest.raises(FrozenInstanceError):
+        template.sentence = "goodbye"  # type: ignore[misc]
+
+
+def test_compiled_template_skips_parser():
+    runner = TwaddleRunner(path, parse_cache_size=0)
+    template = runner.compile("{a}")
+    misses = runner.parse_cache_info().misses
+    for _ in range(5):
+        assert template.render(runner) == "a"
+    assert runner.parse_cache_info().misses == misses
+
+
+def test_compiled_template_can_be_shared_between_runners():
+    template = TwaddleRunner(path).compile("<noun-building-large>")
+    assert template.render(TwaddleRunner(path)) == "factory"
+
+
+def test_parse_error_raised_on_compile():
+    runner = TwaddleRunner(path)
+    with pytest.raises(TwaddleInterpreterException):
+        runner.compile("{a|b")
+
+
+def test_compiled_template_resets_labels_between_renders():
+    runner = TwaddleRunner(path)
+    template = runner.compile("<noun-building-large::=a> <noun-building::!=a>")
+    for _ in range(3):
+        assert template.render(runner) == "factory shed"
@@ -0,0 +1,81 @@
+import os
+from collections import Counter
+
+import pytest
+
+from twaddle.exceptions import TwaddleException
+from twaddle.parallel import ParallelTwaddleRunner, WorkUnit, split_work
+from twaddle.runner import TwaddleRunner
+
+
+def relative_path_to_full_path(rel_path: str) -> str:
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(current_dir, rel_path)
+
+
+path = relative_path_to_full_path("../resources/valid_dicts")
+
+sentence = "\\a <adj> {cat|dog|owl} [rep:2][sep:, ]{x|y|z} <noun::=a> <noun::=a>"
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ParallelTwaddleRunner(path, workers=2, chunk_size=7) as runner:
+        yield runner
+
+
+def test_same_seed_same_results_for_any_number_of_workers(pool):
+    results = pool.run_sentence_many(sentence, 50, seed=12)
+    assert len(results) == 50
+    assert len(set(results)) > 1
+    with ParallelTwaddleRunner(path, workers=1, chunk_size=7) as single:
+        assert single.run_sentence_many(sentence, 50, seed=12) == results
+    assert pool.run_sentence_many(sentence, 50, seed=13) != results
+
+
+def test_units_match_runner():
+    (unit,) = split_work(sentence, 20, "s", chunk_size=20)
+    with ParallelTwaddleRunner(path, workers=1) as parallel:
+        ((_, results),) = parallel.run_units([unit])
+    runner = TwaddleRunner(path)
+    assert runner.run_sentence_many(sentence, 20, seed=unit.seed) == results
+
+
+def test_unordered_results(pool):
+    ordered = pool.run_sentence_many(sentence, 60, seed="x")
+    unordered = list(pool.iter_sentence_many(sentence, 60, seed="x", ordered=False))
+    assert Counter(unordered) == Counter(ordered)
+
+
+def test_run_units_with_several_sentences(pool):
+    units = [WorkUnit("{a|b}", 5, "1"), WorkUnit("<noun-building-large>", 3, "2")]
+    results = dict(pool.run_units(units, ordered=False))
+    assert set(results[units[0]]) <= {"a", "b"}
+    assert results[units[1]] == ["factory"] * 3
+
+
+def test_split_work():
+    units = split_work("a", 10, 5, chunk_size=4)
+    assert [unit.count for unit in units] == [4, 4, 2]
+    assert len({unit.seed for unit in units}) == 3
+    assert split_work("a", 0, 5) == []
+    with pytest.raises(ValueError):
+        split_work("a", -1, 5)
+
+
+def test_errors_raised(pool):
+    with pytest.raises(TwaddleException):
+        pool.iter_sentence_many("{a|b", 3)
+    with pytest.raises(TwaddleException):
+        pool.run_sentence_many("<nonexistent>", 3)
+
+
+def test_runner_options_passed_on():
+    with ParallelTwaddleRunner(
+        path, workers=1, chunk_size=5, persistent_labels=True
+    ) as runner:
+        results = runner.run_sentence_many("<noun::=a>", 40, seed=1)
+    # labels last through a unit, but not from one unit to the next
+    units = [results[start:][:5] for start in range(0, 40, 5)]
+    assert all(len(set(unit)) == 1 for unit in units)
+    assert len(set(results)) > 1
@@ -0,0 +1,149 @@
+import os
+import random
+import threading
+
+import pytest
+
+from twaddle.runner import TwaddleRunner
+
+
+def relative_path_to_full_path(rel_path: str) -> str:
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(current_dir, rel_path)
+
+
+path = relative_path_to_full_path("../resources/valid_dicts")
+
+# draws on every source of randomness: blocks, lookups, digits, [rand] and
+# each kind of synchronizer
+sentence = (
+    "{a|b|c} <noun> <adj> \\d\\d [rand:1;100] "
+    "[rep:3]{[sync:l;locked]{1|2|3}[sync:d;deck]{4|5|6}[sync:c;cdeck]{7|8|9}}"
+)
+
+
+def outputs(runner: TwaddleRunner, n: int = 20) -> list[str]:
+    return [runner.run_sentence(sentence) for _ in range(n)]
+
+
+def test_runner_seed_reproducible():
+    results = outputs(TwaddleRunner(path, seed=5))
+    assert len(set(results)) > 1
+    assert outputs(TwaddleRunner(path, seed=5)) == results
+    assert outputs(TwaddleRunner(path, seed=6)) != results
+
+
+def test_global_random_not_used():
+    random.seed(0)
+    state = random.getstate()
+    runner = TwaddleRunner(path, seed=1)
+    results = outputs(runner)
+    assert random.getstate() == state
+    random.seed(0)
+    assert outputs(TwaddleRunner(path, seed=1)) == results
+
+
+def test_call_seed_reproducible():
+    runner = TwaddleRunner(path)
+    expected = runner.run_sentence(sentence, seed="x")
+    assert runner.run_sentence(sentence, seed="x") == expected
+    assert "".join(runner.stream_sentence(sentence, seed="x")) == expected
+    assert runner.run_compiled(runner.compile(sentence), seed="x") == expected
+    assert runner.compile(sentence).render(runner, seed="x") == expected
+    assert runner.run_sentence_many(sentence, 3, seed="x")[0] == expected
+
+
+def test_call_seed_leaves_runner_stream_alone():
+    seeded = TwaddleRunner(path, seed=3)
+    first = seeded.run_sentence(sentence)
+    seeded.run_sentence(sentence, seed=10)
+    list(seeded.iter_sentence_many(sentence, 5, seed=11))
+    second = seeded.run_sentence(sentence)
+    assert outputs(TwaddleRunner(path, seed=3), 2) == [first, second]
+
+
+def test_seeded_iterators_mixed_with_other_calls():
+    runner = TwaddleRunner(path, seed=3)
+    expected = runner.run_sentence_many(sentence, 3, seed=4)
+    results = []
+    plain = []
+    for text in runner.iter_sentence_many(sentence, 3, seed=4):
+        results.append(text)
+        plain.append(runner.run_sentence(sentence))
+    assert results == expected
+    # left unfinished, and the calls after them still draw from the runner's
+    # own stream
+    abandoned = runner.iter_sentence_many(sentence, 3, seed=4)
+    next(abandoned)
+    plain.append(runner.run_sentence(sentence))
+    stream = runner.stream_sentence(sentence, seed=4)
+    next(stream)
+    plain.append(runner.run_sentence(sentence))
+    assert plain == outputs(TwaddleRunner(path, seed=3), 5)
+
+
+def test_injected_random_source():
+    class CountingRandom(random.Random):
+        calls = 0
+
+        def random(self):
+            CountingRandom.calls += 1
+            return super().random()
+
+        def getrandbits(self, k):
+            CountingRandom.calls += 1
+            return super().getrandbits(k)
+
+    rng = CountingRandom(4)
+    results = outputs(TwaddleRunner(path, rng=rng))
+    assert CountingRandom.calls > 0
+    assert outputs(TwaddleRunner(path, rng=CountingRandom(4))) == results
+
+
+def test_injected_random_source_not_drawn_from_when_created():
+    rng = random.Random(4)
+    expected = random.Random(4)
+    runner = TwaddleRunner(path, rng=rng)
+    assert rng.random() == expected.random()
+    runner.spawn_rng()
+    assert rng.random() == expected.random()
+
+
+def test_synchronizers_leave_seeded_stream():
+    runner = TwaddleRunner(path, persistent_synchronizers=True)
+    context = runner.interpreter.context
+    runner.run_sentence("[sync:d;deck]{a|b|c}", seed=1)
+    "".join(runner.stream_sentence("[sync:c;cdeck]{a|b|c}", seed=2))
+    list(runner.iter_sentence_many("[sync:l;locked]{a|b|c}", 2, seed=3))
+    assert len(context.synchronizers) == 3
+    assert all(sync.rng is context.rng for sync in context.synchronizers.values())
+
+
+def test_seed_and_random_source_not_both():
+    with pytest.raises(ValueError):
+        TwaddleRunner(path, seed=1, rng=random.Random(1))
+
+
+def test_spawned_streams():
+    runner = TwaddleRunner(path, seed=8)
+    children = [runner.spawn_rng() for _ in range(3)]
+    again = TwaddleRunner(path, seed=8)
+    assert [child.random() for child in children] == [
+        again.spawn_rng().random() for _ in range(3)
+    ]
+    assert len({child.random() for child in children}) == 3
+    child_results = outputs(TwaddleRunner(path, rng=runner.spawn_rng()))
+    assert child_results != outputs(runner)
+
+
+def test_threads_draw_from_their_own_streams():
+    runner = TwaddleRunner(path, seed=2)
+    expected = outputs(TwaddleRunner(path, seed=2))
+    in_thread = []
+    main_results = outputs(runner, 10)
+    thread = threading.Thread(target=lambda: in_thread.extend(outputs(runner, 10)))
+    thread.start()
+    thread.join()
+    # the other thread's choices don't disturb this thread's stream
+    assert main_results + outputs(runner, 10) == expected
+    assert in_thread != expected[:10]
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from twaddle.exceptions import TwaddleLookupException
+from twaddle.lookup.lookup_manager import LookupManager
+from twaddle.runner import TwaddleRunner
+
+
+def relative_path_to_full_path(rel_path: str) -> str:
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(current_dir, rel_path)
+
+
+path = relative_path_to_full_path("../resources/valid_dicts")
+
+
+def loaded_dictionaries() -> LookupManager:
+    lookup_manager = LookupManager()
+    lookup_manager.add_dictionaries_from_folder(path)
+    return lookup_manager
+
+
+def test_loaded_dictionaries_are_read_only():
+    dictionary = loaded_dictionaries()["noun"]
+    assert dictionary.frozen
+    with pytest.raises(TwaddleLookupException):
+        dictionary.add(["thing", "things"])
+    with pytest.raises(TwaddleLookupException):
+        dictionary.labels = {}
+    with pytest.raises(AttributeError):
+        dictionary.entries.append(dictionary.entries[0])
+    with pytest.raises(TypeError):
+        dictionary.entries[0].forms["singular"] = "thing"
+    with pytest.raises(AttributeError):
+        dictionary.entries[0].tags.add("tag")
+
+
+def test_runners_share_dictionaries():
+    lookup_manager = loaded_dictionaries()
+    runners = [TwaddleRunner(lookup_manager) for _ in range(100)]
+    assert all(runner.lookup_manager is lookup_manager for runner in runners)
+    assert runners[0].run_sentence("<noun-building-large>") == "factory"
+
+
+def test_labels_not_shared_between_runners():
+    lookup_manager = loaded_dictionaries()
+    labelled = TwaddleRunner(lookup_manager, persistent_labels=True, seed=0)
+    other = TwaddleRunner(lookup_manager, persistent_labels=True, seed=1)
+    first = labelled.run_sentence("<noun::=a>")
+    results = set()
+    for _ in range(30):
+        results.add(other.run_sentence("<noun::=a>"))
+        other.clear()
+        assert labelled.run_sentence("<noun::=a>") == first
+    assert len(results) > 1
+
+
+def test_shared_dictionaries_added_for_all_runners():
+    lookup_manager = LookupManager()
+    first = TwaddleRunner(lookup_manager)
+    second = TwaddleRunner(lookup_manager)
+    template = second.compile("<noun-building-large>")
+    first.add_dictionaries_from_folder(path)
+    assert second.run_compiled(template) == "factory"
@@ -0,0 +1,141 @@
+import gc
+import os
+import sys
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from twaddle.runner import TwaddleRunner
+
+
+def relative_path_to_full_path(rel_path: str) -> str:
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(current_dir, rel_path)
+
+
+path = relative_path_to_full_path("../resources/valid_dicts")
+
+THREADS = 8
+
+# each part repeats something chosen earlier in the same sentence, so any
+# state leaking between threads shows up as a mismatch
+sentence = (
+    "<noun::=a>,<noun::=a>;<noun::!=a>;"
+    "[sync:s;locked]{1|2|3|4|5}[sync:s]{1|2|3|4|5};"
+    "[copy:c]{a|b|c|d}[paste:c];"
+    "[save:p][hide]{<adj>}[load:p]"
+)
+
+
+def check(result: str):
+    label, other_label, synced, copied, saved = result.split(";")
+    first, second = label.split(",")
+    assert first == second
+    assert other_label != first
+    assert synced[0] == synced[1]
+    assert copied[0] == copied[1]
+    assert saved == "happy"
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches():
+    # switch threads as often as possible, to make clashes likely
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_in_threads(work) -> list:
+    start = threading.Barrier(THREADS)
+
+    def run(index: int):
+        start.wait()
+        return work(index)
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        return list(executor.map(run, range(THREADS)))
+
+
+def test_run_sentence_from_threads():
+    runner = TwaddleRunner(path)
+    for results in run_in_threads(
+        lambda _: [runner.run_sentence(sentence) for _ in range(100)]
+    ):
+        for result in results:
+            check(result)
+
+
+def test_compiled_template_from_threads():
+    runner = TwaddleRunner(path)
+    template = runner.compile(sentence)
+    for results in run_in_threads(
+        lambda _: [runner.run_compiled(template) for _ in range(100)]
+    ):
+        for result in results:
+            check(result)
+
+
+def test_contexts_of_finished_threads_released():
+    runner = TwaddleRunner(path)
+    template = runner.compile(sentence)
+    contexts = []
+
+    def run():
+        runner.run_compiled(template)
+        contexts.append(weakref.ref(runner.interpreter.context))
+
+    for _ in range(20):
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+    gc.collect()
+    assert len(contexts) == 20
+    assert all(context() is None for context in contexts)
+    for result in run_in_threads(lambda _: runner.run_compiled(template)):
+        check(result)
+
+
+def test_run_sentence_many_from_threads():
+    runner = TwaddleRunner(path)
+    for results in run_in_threads(lambda _: runner.run_sentence_many(sentence, 100)):
+        for result in results:
+            check(result)
+
+
+def test_stream_sentence_from_threads():
+    runner = TwaddleRunner(path)
+    for results in run_in_threads(
+        lambda _: ["".join(runner.stream_sentence(sentence)) for _ in range(100)]
+    ):
+        for result in results:
+            check(result)
+
+
+def test_persistent_state_kept_per_thread():
+    runner = TwaddleRunner(path, persistent=True)
+
+    def work(index: int) -> list[str]:
+        # each thread sets its own label and synchronizer once, then reuses them
+        return [
+            runner.run_sentence(
+                f"{index}:<noun::=a>[sync:s;locked]{{1|2|3|4|5|6|7|8|9}}"
+            )
+            for _ in range(100)
+        ]
+
+    for index, results in enumerate(run_in_threads(work)):
+        assert len(set(results)) == 1
+        assert results[0].startswith(f"{index}:")
+
+
+def test_clear_only_affects_calling_thread():
+    runner = TwaddleRunner(path, persistent=True)
+    first = runner.run_sentence("<noun::=a>[sync:s;locked]{1|2|3|4|5|6|7|8|9}")
+    run_in_threads(lambda _: runner.clear())
+    for _ in range(20):
+        assert (
+            runner.run_sentence("<noun::=a>[sync:s;locked]{1|2|3|4|5|6|7|8|9}") == first
+        )
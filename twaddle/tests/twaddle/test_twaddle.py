@@ -125,6 +125,20 @@ def test_repetition_with_article_in_args():
     )
 
 
+def test_repetition_args_skipped_by_waiting_articles():
+    # articles in a repetition wait for a word after the separator, first
+    # and last content rather than taking theirs
+    for sentence, expected in [
+        (r"[rep:2][sep: apple ]{b \a}", "b a apple b a"),
+        (r"x [rep:2][sep: apple ]{b \a} egg", "x b a apple b an egg"),
+        (r"[rep:3][first: egg ][last: apple ]{\a}", " egg anan apple a"),
+    ]:
+        assert standard_runner.run_sentence(sentence) == expected
+        assert "".join(standard_runner.stream_sentence(sentence)) == expected
+        compiled = standard_runner.compile(sentence)
+        assert standard_runner.run_compiled(compiled) == expected
+
+
 def test_indefinite_article():
     assert standard_runner.run_sentence("\\a bow and \\A arrow") == "a bow and An arrow"
     assert (